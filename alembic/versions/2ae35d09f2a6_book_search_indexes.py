@@ -0,0 +1,56 @@
+"""book search indexes
+
+Revision ID: 2ae35d09f2a6
+Revises: 8bdd129680f8
+Create Date: 2026-10-18 10:40:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2ae35d09f2a6'
+down_revision: Union[str, None] = '8bdd129680f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BOOK_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(author, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('books', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(BOOK_SEARCH_VECTOR, persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_books_search_vector', 'books', ['search_vector'], unique=False, postgresql_using='gin')
+
+    for column in ('title', 'author', 'category'):
+        op.create_index(
+            f'ix_books_{column}_trgm', 'books', [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ('category', 'author', 'title'):
+        op.drop_index(f'ix_books_{column}_trgm', table_name='books')
+
+    op.drop_index('ix_books_search_vector', table_name='books')
+    op.drop_column('books', 'search_vector')
@@ -0,0 +1,64 @@
+"""open loan unique index
+
+Revision ID: 48aaeefab1cc
+Revises: a4471b28f68d
+Create Date: 2026-10-18 11:24:09.187342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '48aaeefab1cc'
+down_revision: Union[str, None] = 'a4471b28f68d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Concurrent issues could open the same loan twice before this index existed. Keep the
+# first open loan of each (book, student), close the rest as returned on their issue
+# date, and give their copies back to the book.
+CLOSE_DUPLICATE_OPEN_LOANS = """
+    WITH duplicates AS (
+        SELECT id FROM (
+            SELECT id, row_number() OVER (PARTITION BY book_id, student_id ORDER BY issue_date, id) AS n
+            FROM issued_books
+            WHERE returned_date IS NULL
+        ) open_loans
+        WHERE n > 1
+    ),
+    closed AS (
+        UPDATE issued_books l
+        SET returned_date = l.issue_date
+        FROM duplicates d
+        WHERE l.id = d.id
+        RETURNING l.book_id
+    )
+    UPDATE books b
+    SET copies = coalesce(b.copies, 0) + c.loans
+    FROM (SELECT book_id, count(*) AS loans FROM closed GROUP BY book_id) c
+    WHERE b.id = c.book_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Block new loans until the index exists, so no duplicate slips in after the cleanup
+    op.execute('LOCK TABLE issued_books IN SHARE ROW EXCLUSIVE MODE')
+    op.execute(CLOSE_DUPLICATE_OPEN_LOANS)
+
+    op.create_index(
+        'uq_issued_books_open_loan',
+        'issued_books',
+        ['book_id', 'student_id'],
+        unique=True,
+        postgresql_where=sa.text('returned_date IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_issued_books_open_loan', table_name='issued_books')
@@ -0,0 +1,218 @@
+"""circulation stats
+
+Revision ID: 5f0d7c2e9b41
+Revises: c3e1f0b7a912
+Create Date: 2026-10-18 12:41:52.907316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0d7c2e9b41'
+down_revision: Union[str, None] = 'c3e1f0b7a912'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers: one aggregated counter update per statement, so
+# bulk imports and multi-book checkouts don't pay a counter update per row.
+# The transition table(s) available depend on TG_OP, hence the dynamic SQL.
+BOOKS_TRIGGER_FUNCTION = """
+CREATE FUNCTION category_stats_books_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT category, copies, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT category, copies, -1 AS sign FROM old_rows'
+        ELSE 'SELECT category, copies, 1 AS sign FROM new_rows
+              UNION ALL SELECT category, copies, -1 FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changed AS (%s),
+        delta AS (
+            SELECT category, sum(sign) AS books, sum(sign * coalesce(copies, 0)) AS copies
+            FROM changed
+            GROUP BY category
+        )
+        INSERT INTO category_stats AS s (category, books, copies_available, active_loans, total_loans)
+        SELECT category, books, copies, 0, 0
+        FROM delta
+        WHERE books <> 0 OR copies <> 0
+        ORDER BY category
+        ON CONFLICT (category) DO UPDATE SET
+            books = s.books + EXCLUDED.books,
+            copies_available = s.copies_available + EXCLUDED.copies_available
+    $sql$, changed);
+
+    -- Loans follow a book whose category changes
+    IF TG_OP = 'UPDATE' THEN
+        WITH moved AS (
+            SELECT
+                o.category AS old_category,
+                n.category AS new_category,
+                count(*) FILTER (WHERE l.returned_date IS NULL) AS active,
+                count(*) AS total
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            JOIN issued_books l ON l.book_id = n.id
+            WHERE o.category <> n.category
+            GROUP BY 1, 2
+        ),
+        delta AS (
+            SELECT new_category AS category, active, total FROM moved
+            UNION ALL
+            SELECT old_category, -active, -total FROM moved
+        )
+        INSERT INTO category_stats AS s (category, books, copies_available, active_loans, total_loans)
+        SELECT category, 0, 0, sum(active), sum(total)
+        FROM delta
+        GROUP BY category
+        ORDER BY category
+        ON CONFLICT (category) DO UPDATE SET
+            active_loans = s.active_loans + EXCLUDED.active_loans,
+            total_loans = s.total_loans + EXCLUDED.total_loans;
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+LOANS_TRIGGER_FUNCTION = """
+CREATE FUNCTION circulation_stats_loans_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT book_id, due_date, returned_date, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT book_id, due_date, returned_date, -1 AS sign FROM old_rows'
+        ELSE 'SELECT book_id, due_date, returned_date, 1 AS sign FROM new_rows
+              UNION ALL SELECT book_id, due_date, returned_date, -1 FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changed AS (%s),
+        category_delta AS (
+            SELECT
+                b.category,
+                coalesce(sum(c.sign) FILTER (WHERE c.returned_date IS NULL), 0) AS active,
+                sum(c.sign) AS total
+            FROM changed c
+            JOIN books b ON b.id = c.book_id
+            GROUP BY b.category
+        ),
+        categories AS (
+            INSERT INTO category_stats AS s (category, books, copies_available, active_loans, total_loans)
+            SELECT category, 0, 0, active, total
+            FROM category_delta
+            WHERE active <> 0 OR total <> 0
+            ORDER BY category
+            ON CONFLICT (category) DO UPDATE SET
+                active_loans = s.active_loans + EXCLUDED.active_loans,
+                total_loans = s.total_loans + EXCLUDED.total_loans
+        ),
+        due_delta AS (
+            SELECT due_date, sum(sign) AS active
+            FROM changed
+            WHERE returned_date IS NULL
+            GROUP BY due_date
+        )
+        INSERT INTO loan_due_stats AS s (due_date, active_loans)
+        SELECT due_date, active
+        FROM due_delta
+        WHERE active <> 0
+        ORDER BY due_date
+        ON CONFLICT (due_date) DO UPDATE SET
+            active_loans = s.active_loans + EXCLUDED.active_loans
+    $sql$, changed);
+
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = [
+    ("books", "category_stats_books_changed", "INSERT", "NEW TABLE AS new_rows"),
+    ("books", "category_stats_books_changed", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("books", "category_stats_books_changed", "DELETE", "OLD TABLE AS old_rows"),
+    ("issued_books", "circulation_stats_loans_changed", "INSERT", "NEW TABLE AS new_rows"),
+    ("issued_books", "circulation_stats_loans_changed", "UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+    ("issued_books", "circulation_stats_loans_changed", "DELETE", "OLD TABLE AS old_rows"),
+]
+
+
+def trigger_name(table: str, event: str) -> str:
+    return f"{table}_stats_{event.lower()}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'category_stats',
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('books', sa.Integer(), nullable=False),
+        sa.Column('copies_available', sa.Integer(), nullable=False),
+        sa.Column('active_loans', sa.Integer(), nullable=False),
+        sa.Column('total_loans', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('category')
+    )
+    op.create_table(
+        'loan_due_stats',
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('active_loans', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('due_date')
+    )
+
+    op.execute(BOOKS_TRIGGER_FUNCTION)
+    op.execute(LOANS_TRIGGER_FUNCTION)
+
+    for table, function, event, transition_tables in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {trigger_name(table, event)} AFTER {event} ON {table} "
+            f"REFERENCING {transition_tables} FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+
+    # Backfill from the current data (same queries as app.services.stats.reconcile_stats)
+    op.execute("DELETE FROM category_stats")
+    op.execute("DELETE FROM loan_due_stats")
+    op.execute("""
+        INSERT INTO category_stats (category, books, copies_available, active_loans, total_loans)
+        SELECT
+            b.category,
+            count(*),
+            coalesce(sum(b.copies), 0),
+            coalesce(sum(l.active), 0),
+            coalesce(sum(l.total), 0)
+        FROM books b
+        LEFT JOIN (
+            SELECT book_id, count(*) FILTER (WHERE returned_date IS NULL) AS active, count(*) AS total
+            FROM issued_books
+            GROUP BY book_id
+        ) l ON l.book_id = b.id
+        GROUP BY b.category
+    """)
+    op.execute("""
+        INSERT INTO loan_due_stats (due_date, active_loans)
+        SELECT due_date, count(*)
+        FROM issued_books
+        WHERE returned_date IS NULL
+        GROUP BY due_date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _, event, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER {trigger_name(table, event)} ON {table}")
+
+    op.execute("DROP FUNCTION circulation_stats_loans_changed()")
+    op.execute("DROP FUNCTION category_stats_books_changed()")
+
+    op.drop_table('loan_due_stats')
+    op.drop_table('category_stats')
@@ -0,0 +1,34 @@
+"""open loan due date index
+
+Revision ID: 9d2c8fd68db8
+Revises: 48aaeefab1cc
+Create Date: 2026-10-18 11:51:33.604271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2c8fd68db8'
+down_revision: Union[str, None] = '48aaeefab1cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_issued_books_open_due_date',
+        'issued_books',
+        ['due_date', 'id'],
+        unique=False,
+        postgresql_where=sa.text('returned_date IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_issued_books_open_due_date', table_name='issued_books')
@@ -0,0 +1,32 @@
+"""student identifier indexes
+
+Revision ID: a4471b28f68d
+Revises: 2ae35d09f2a6
+Create Date: 2026-10-18 11:02:47.540913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4471b28f68d'
+down_revision: Union[str, None] = '2ae35d09f2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_students_lower_roll_number', 'students', [sa.text('lower(roll_number)')], unique=False)
+    op.create_index('ix_students_lower_name', 'students', [sa.text('lower(name)')], unique=False)
+    op.create_index(op.f('ix_students_phone'), 'students', ['phone'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_students_phone'), table_name='students')
+    op.drop_index('ix_students_lower_name', table_name='students')
+    op.drop_index('ix_students_lower_roll_number', table_name='students')
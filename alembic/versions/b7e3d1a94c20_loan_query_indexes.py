@@ -0,0 +1,39 @@
+"""loan query indexes
+
+Revision ID: b7e3d1a94c20
+Revises: e4b9a27c6d15
+Create Date: 2026-10-18 16:40:12.884201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d1a94c20'
+down_revision: Union[str, None] = 'e4b9a27c6d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keyset orders of GET /issues, each ending in id so (date, id) cursors resume from the index
+LOAN_QUERY_INDEXES = {
+    'ix_issued_books_issue_date': ['issue_date', 'id'],
+    'ix_issued_books_due_date': ['due_date', 'id'],
+    'ix_issued_books_book_issue_date': ['book_id', 'issue_date', 'id'],
+    'ix_issued_books_student_issue_date': ['student_id', 'issue_date', 'id'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in LOAN_QUERY_INDEXES.items():
+        op.create_index(name, 'issued_books', columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in LOAN_QUERY_INDEXES:
+        op.drop_index(name, table_name='issued_books')
@@ -0,0 +1,33 @@
+"""student loans index
+
+Revision ID: c3e1f0b7a912
+Revises: 9d2c8fd68db8
+Create Date: 2026-10-18 12:14:06.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e1f0b7a912'
+down_revision: Union[str, None] = '9d2c8fd68db8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_issued_books_student_returned',
+        'issued_books',
+        ['student_id', 'returned_date'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_issued_books_student_returned', table_name='issued_books')
@@ -0,0 +1,313 @@
+"""stats delta tables
+
+Revision ID: d81f4c6a2e57
+Revises: b7e3d1a94c20
+Create Date: 2026-10-18 19:05:37.412958
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f4c6a2e57'
+down_revision: Union[str, None] = 'b7e3d1a94c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The triggers no longer upsert category_stats / loan_due_stats: every checkout in a
+# category (or on a due date) queued on the same summary row lock. They now append one
+# row per statement to insert-only delta tables; readers add the pending deltas to the
+# summaries and app.services.stats.fold_stats_deltas moves them in periodically.
+BOOKS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION category_stats_books_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT category, copies, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT category, copies, -1 AS sign FROM old_rows'
+        ELSE 'SELECT category, copies, 1 AS sign FROM new_rows
+              UNION ALL SELECT category, copies, -1 FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changed AS (%s),
+        delta AS (
+            SELECT category, sum(sign) AS books, sum(sign * coalesce(copies, 0)) AS copies
+            FROM changed
+            GROUP BY category
+        )
+        INSERT INTO category_stats_deltas (category, books, copies_available, active_loans, total_loans)
+        SELECT category, books, copies, 0, 0
+        FROM delta
+        WHERE books <> 0 OR copies <> 0
+    $sql$, changed);
+
+    -- Loans follow a book whose category changes
+    IF TG_OP = 'UPDATE' THEN
+        WITH moved AS (
+            SELECT
+                o.category AS old_category,
+                n.category AS new_category,
+                count(*) FILTER (WHERE l.returned_date IS NULL) AS active,
+                count(*) AS total
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            JOIN issued_books l ON l.book_id = n.id
+            WHERE o.category <> n.category
+            GROUP BY 1, 2
+        ),
+        delta AS (
+            SELECT new_category AS category, active, total FROM moved
+            UNION ALL
+            SELECT old_category, -active, -total FROM moved
+        )
+        INSERT INTO category_stats_deltas (category, books, copies_available, active_loans, total_loans)
+        SELECT category, 0, 0, sum(active), sum(total)
+        FROM delta
+        GROUP BY category;
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+LOANS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION circulation_stats_loans_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT book_id, due_date, returned_date, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT book_id, due_date, returned_date, -1 AS sign FROM old_rows'
+        ELSE 'SELECT book_id, due_date, returned_date, 1 AS sign FROM new_rows
+              UNION ALL SELECT book_id, due_date, returned_date, -1 FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changed AS (%s),
+        category_delta AS (
+            SELECT
+                b.category,
+                coalesce(sum(c.sign) FILTER (WHERE c.returned_date IS NULL), 0) AS active,
+                sum(c.sign) AS total
+            FROM changed c
+            JOIN books b ON b.id = c.book_id
+            GROUP BY b.category
+        ),
+        categories AS (
+            INSERT INTO category_stats_deltas (category, books, copies_available, active_loans, total_loans)
+            SELECT category, 0, 0, active, total
+            FROM category_delta
+            WHERE active <> 0 OR total <> 0
+        ),
+        due_delta AS (
+            SELECT due_date, sum(sign) AS active
+            FROM changed
+            WHERE returned_date IS NULL
+            GROUP BY due_date
+        )
+        INSERT INTO loan_due_stats_deltas (due_date, active_loans)
+        SELECT due_date, active
+        FROM due_delta
+        WHERE active <> 0
+    $sql$, changed);
+
+    RETURN NULL;
+END
+$$
+"""
+
+# Same statements as app.services.stats.fold_stats_deltas
+FOLD_DELTAS = [
+    """
+    WITH folded AS (
+        DELETE FROM category_stats_deltas
+        RETURNING category, books, copies_available, active_loans, total_loans
+    )
+    INSERT INTO category_stats AS s (category, books, copies_available, active_loans, total_loans)
+    SELECT category, sum(books), sum(copies_available), sum(active_loans), sum(total_loans)
+    FROM folded
+    GROUP BY category
+    ORDER BY category
+    ON CONFLICT (category) DO UPDATE SET
+        books = s.books + EXCLUDED.books,
+        copies_available = s.copies_available + EXCLUDED.copies_available,
+        active_loans = s.active_loans + EXCLUDED.active_loans,
+        total_loans = s.total_loans + EXCLUDED.total_loans
+    """,
+    """
+    WITH folded AS (
+        DELETE FROM loan_due_stats_deltas
+        RETURNING due_date, active_loans
+    )
+    INSERT INTO loan_due_stats AS s (due_date, active_loans)
+    SELECT due_date, sum(active_loans)
+    FROM folded
+    GROUP BY due_date
+    ORDER BY due_date
+    ON CONFLICT (due_date) DO UPDATE SET
+        active_loans = s.active_loans + EXCLUDED.active_loans
+    """,
+]
+
+# The upserting functions of 5f0d7c2e9b41, restored on downgrade
+PREVIOUS_BOOKS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION category_stats_books_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT category, copies, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT category, copies, -1 AS sign FROM old_rows'
+        ELSE 'SELECT category, copies, 1 AS sign FROM new_rows
+              UNION ALL SELECT category, copies, -1 FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changed AS (%s),
+        delta AS (
+            SELECT category, sum(sign) AS books, sum(sign * coalesce(copies, 0)) AS copies
+            FROM changed
+            GROUP BY category
+        )
+        INSERT INTO category_stats AS s (category, books, copies_available, active_loans, total_loans)
+        SELECT category, books, copies, 0, 0
+        FROM delta
+        WHERE books <> 0 OR copies <> 0
+        ORDER BY category
+        ON CONFLICT (category) DO UPDATE SET
+            books = s.books + EXCLUDED.books,
+            copies_available = s.copies_available + EXCLUDED.copies_available
+    $sql$, changed);
+
+    -- Loans follow a book whose category changes
+    IF TG_OP = 'UPDATE' THEN
+        WITH moved AS (
+            SELECT
+                o.category AS old_category,
+                n.category AS new_category,
+                count(*) FILTER (WHERE l.returned_date IS NULL) AS active,
+                count(*) AS total
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            JOIN issued_books l ON l.book_id = n.id
+            WHERE o.category <> n.category
+            GROUP BY 1, 2
+        ),
+        delta AS (
+            SELECT new_category AS category, active, total FROM moved
+            UNION ALL
+            SELECT old_category, -active, -total FROM moved
+        )
+        INSERT INTO category_stats AS s (category, books, copies_available, active_loans, total_loans)
+        SELECT category, 0, 0, sum(active), sum(total)
+        FROM delta
+        GROUP BY category
+        ORDER BY category
+        ON CONFLICT (category) DO UPDATE SET
+            active_loans = s.active_loans + EXCLUDED.active_loans,
+            total_loans = s.total_loans + EXCLUDED.total_loans;
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+PREVIOUS_LOANS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION circulation_stats_loans_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT book_id, due_date, returned_date, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN 'SELECT book_id, due_date, returned_date, -1 AS sign FROM old_rows'
+        ELSE 'SELECT book_id, due_date, returned_date, 1 AS sign FROM new_rows
+              UNION ALL SELECT book_id, due_date, returned_date, -1 FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        WITH changed AS (%s),
+        category_delta AS (
+            SELECT
+                b.category,
+                coalesce(sum(c.sign) FILTER (WHERE c.returned_date IS NULL), 0) AS active,
+                sum(c.sign) AS total
+            FROM changed c
+            JOIN books b ON b.id = c.book_id
+            GROUP BY b.category
+        ),
+        categories AS (
+            INSERT INTO category_stats AS s (category, books, copies_available, active_loans, total_loans)
+            SELECT category, 0, 0, active, total
+            FROM category_delta
+            WHERE active <> 0 OR total <> 0
+            ORDER BY category
+            ON CONFLICT (category) DO UPDATE SET
+                active_loans = s.active_loans + EXCLUDED.active_loans,
+                total_loans = s.total_loans + EXCLUDED.total_loans
+        ),
+        due_delta AS (
+            SELECT due_date, sum(sign) AS active
+            FROM changed
+            WHERE returned_date IS NULL
+            GROUP BY due_date
+        )
+        INSERT INTO loan_due_stats AS s (due_date, active_loans)
+        SELECT due_date, active
+        FROM due_delta
+        WHERE active <> 0
+        ORDER BY due_date
+        ON CONFLICT (due_date) DO UPDATE SET
+            active_loans = s.active_loans + EXCLUDED.active_loans
+    $sql$, changed);
+
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'category_stats_deltas',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('books', sa.Integer(), nullable=False),
+        sa.Column('copies_available', sa.Integer(), nullable=False),
+        sa.Column('active_loans', sa.Integer(), nullable=False),
+        sa.Column('total_loans', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'loan_due_stats_deltas',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('active_loans', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # The triggers keep their names and bind to the replaced function bodies
+    op.execute(BOOKS_TRIGGER_FUNCTION)
+    op.execute(LOANS_TRIGGER_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Block writers so no delta lands between the fold and the function swap
+    op.execute("LOCK TABLE books, issued_books IN SHARE MODE")
+    for statement in FOLD_DELTAS:
+        op.execute(statement)
+
+    op.execute(PREVIOUS_BOOKS_TRIGGER_FUNCTION)
+    op.execute(PREVIOUS_LOANS_TRIGGER_FUNCTION)
+
+    op.drop_table('loan_due_stats_deltas')
+    op.drop_table('category_stats_deltas')
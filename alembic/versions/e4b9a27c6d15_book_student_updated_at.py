@@ -0,0 +1,34 @@
+"""book student updated_at
+
+Revision ID: e4b9a27c6d15
+Revises: 5f0d7c2e9b41
+Create Date: 2026-10-18 15:02:41.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9a27c6d15'
+down_revision: Union[str, None] = '5f0d7c2e9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() is a constant default, so Postgres fills existing rows without rewriting the table
+    for table in ('books', 'students'):
+        op.add_column(
+            table,
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('books', 'students'):
+        op.drop_column(table, 'updated_at')
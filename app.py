@@ -1,2 +1,2 @@
 # app.py (in root)
-from app import app
+from app.server import app
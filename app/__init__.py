@@ -1 +1,7 @@
-from .server import app
\ No newline at end of file
+def __getattr__(name: str):
+    # The ASGI app is built on first access (`from app import app`), so Celery workers,
+    # the CLI and Alembic importing app.* don't load FastAPI and the routers
+    if name == "app":
+        from app.server import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1 +1 @@
-from .v1 import books, students
\ No newline at end of file
+from .v1 import books, exports, issues, stats, students
\ No newline at end of file
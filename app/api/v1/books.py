@@ -1,20 +1,29 @@
 # books.py
-from fastapi import APIRouter, status, Query, Path, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, status, Query, Path, Depends, Header, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.database import get_db
+from app.database import get_async_db
+from app.database.replicas import get_read_db
 from app.schemas import (
     Book,
+    BulkReturn,
+    Checkout,
+    CheckoutResponse,
     IssueBook,
     ErrorResponse,
     SuccessResponse,
     BookResponse,
     BookListResponse,
+    BookImportResponse,
     BookIssueRecordResponse,
+    BookIssueRecordListResponse,
 )
 import app.services.book as services
+from app.services.pagination import CountMode
 from app.utils import success_response
+from app.utils.http_cache import etag_matches, cache_headers, list_cache_headers, not_modified, row_etag
+from app.utils.redis_cache import list_etag
 
 
 router = APIRouter(prefix="/books", tags=["books"])
@@ -24,36 +33,55 @@ router = APIRouter(prefix="/books", tags=["books"])
     response_model=BookListResponse,
     responses={500: {"model": ErrorResponse}}
 )
-def read_books(
+async def read_books(
+    request  : Request,
     title    : Optional[str] = Query(None, description="Filter by book title"),
     author   : Optional[str] = Query(None, description="Filter by book author"),
     category : Optional[str] = Query(None, description="Filter by book category"),
+    q        : Optional[str] = Query(None, min_length=2, description="Full-text search over title, author and category, ranked by relevance"),
     page     : int           = Query(1, ge=1, description="Page number for pagination"),
     limit    : int           = Query(10, ge=1, le=50, description="Number of books per page"),
-    db       : Session       = Depends(get_db),
+    cursor   : Optional[str] = Query(None, description="Keyset cursor (meta.next_cursor of the previous page); overrides page"),
+    count    : CountMode     = Query("exact", description="Total count mode: exact, estimate or none"),
+    if_none_match : Optional[str] = Header(None),
+    db       : AsyncSession  = Depends(get_read_db),
 ):
-    books, meta = services.list_books(title, author, category, page, limit, db)
+    headers = list_cache_headers(await list_etag("books", request.query_params.multi_items()), "public")
+    if etag_matches(if_none_match, headers.get("ETag")):
+        return not_modified(headers)
+
+    books, meta = await services.list_books(title, author, category, page, limit, db, cursor, count, q)
 
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Books fetched successfully",
         data=books,
-        meta=meta
+        meta=meta,
+        headers=headers,
     )
 
 
 
 
-@router.get("/overdue-books", response_model=BookIssueRecordResponse)
-def get_overdue_books(db: Session = Depends(get_db)):
-    print("2")
-
-    overdue_books = services.get_overdue_books(db)
+@router.get(
+    "/overdue-books",
+    response_model=BookIssueRecordListResponse,
+    responses={400: {"model": ErrorResponse}}
+)
+async def get_overdue_books(
+    limit   : int           = Query(50, ge=1, le=200, description="Number of records per page"),
+    cursor  : Optional[str] = Query(None, description="Keyset cursor (meta.next_cursor of the previous page)"),
+    include : Optional[str] = Query(None, description="Join-load related rows: book, student or book,student"),
+    count   : CountMode     = Query("none", description="Total count mode: exact, estimate or none"),
+    db      : AsyncSession  = Depends(get_read_db),
+):
+    overdue_books, meta = await services.get_overdue_books(db, limit, cursor, include, count)
 
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Overdue Books fetched successfully",
-        data=overdue_books
+        data=overdue_books,
+        meta=meta
     )
 
 
@@ -63,25 +91,29 @@ def get_overdue_books(db: Session = Depends(get_db)):
     response_model=BookResponse,
     responses={404: {"model": ErrorResponse}}
 )
-def read_book(
+async def read_book(
     book_id: str = Path(...,  description="Book ID/ISBN as unique identifier of Book"),
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    print("1")
-    
-    book = services.get_single_book(book_id, db)
+    book = await services.get_single_book(book_id, db)
+
+    headers = cache_headers(row_etag("book", book.id, book.updated_at), "public")
+    if etag_matches(if_none_match, headers.get("ETag")):
+        return not_modified(headers)
 
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Book fetched successfully",
         data=[book],
+        headers=headers,
     )
 
 
 
 @router.post("", response_model=SuccessResponse )
-def create_book(book: Book, db: Session = Depends(get_db)):    
-    result = services.add_book(book, db)
+async def create_book(book: Book, db: AsyncSession = Depends(get_async_db)):    
+    result = await services.add_book(book, db)
 
     message = "Book added successfully"
     if result["updated"]:
@@ -95,18 +127,74 @@ def create_book(book: Book, db: Session = Depends(get_db)):
     )
 
 
+
+@router.post(
+    "/bulk",
+    response_model=BookImportResponse,
+    responses={400: {"model": ErrorResponse}, 415: {"model": ErrorResponse}}
+)
+async def bulk_import_books(
+    request : Request,
+    format  : Optional[services.ImportFormat] = Query(None, description="Body format: ndjson or csv (default: from Content-Type)"),
+    db      : AsyncSession = Depends(get_async_db),
+):
+    """Stream an NDJSON or CSV body of books; rows are merged like POST /books."""
+    import_format = services.resolve_import_format(request.headers.get("content-type"), format)
+
+    summary = await services.bulk_import_books(request.stream(), import_format, db)
+
+    return success_response(
+        status_code=status.HTTP_200_OK,
+        message="Books imported",
+        data=summary,
+    )
+
+
+@router.post(
+    "/checkout",
+    response_model=CheckoutResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}}
+)
+async def checkout_books(payload: Checkout, db: AsyncSession = Depends(get_async_db)):
+    items = await services.checkout_books(payload, db)
+    issued = sum(item.status == "issued" for item in items)
+
+    return success_response(
+        status_code=status.HTTP_201_CREATED if issued else status.HTTP_200_OK,
+        message=f"{issued} of {len(items)} books issued",
+        data=items,
+    )
+
+
+
+@router.post(
+    "/return",
+    response_model=CheckoutResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}}
+)
+async def return_books(payload: BulkReturn, db: AsyncSession = Depends(get_async_db)):
+    items = await services.return_books(payload, db)
+    returned = sum(item.status == "returned" for item in items)
+
+    return success_response(
+        status_code=status.HTTP_200_OK,
+        message=f"{returned} of {len(items)} books returned",
+        data=items,
+    )
+
+
     
 @router.put(
     "/{book_id}",
     response_model=BookResponse,
     responses={404: {"model": ErrorResponse}}
 )
-def update_book(
+async def update_book(
     updated: Book, 
     book_id: str = Path(..., description="Book ID/ISBN as unique identifier of Book"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    book = services.update_book(book_id, updated, db)
+    book = await services.update_book(book_id, updated, db)
 
     return success_response(
         status_code=status.HTTP_200_OK,
@@ -121,11 +209,11 @@ def update_book(
     response_model=SuccessResponse,
     responses={404: {"model": ErrorResponse}}
 )
-def delete_book(
+async def delete_book(
     book_id: str = Path(..., description="Book ID/ISBN as unique identifier of Book"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    if services.delete_book(book_id, db): 
+    if await services.delete_book(book_id, db): 
         return success_response(
             status_code=status.HTTP_200_OK,
             message="Book Deleted Successfully"
@@ -137,12 +225,12 @@ def delete_book(
     "/{book_id}",
     response_model=BookIssueRecordResponse,
 )
-def issue_book_to_student(
+async def issue_book_to_student(
     book_id: str = Path(..., description="Book ID/ISBN as unique identifier of Book"),
     payload: IssueBook = ...,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):    
-    issuance_record = services.issue_book(book_id, payload, db)
+    issuance_record = await services.issue_book(book_id, payload, db)
 
     return success_response(
         status_code=status.HTTP_201_CREATED,
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from datetime import date
+
+import app.services.export as services
+
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+def export_response(table: services.ExportTable, format: services.ExportFormat) -> StreamingResponse:
+    filename = f"{table}-{date.today().isoformat()}.{format}"
+
+    return StreamingResponse(
+        services.stream_export(table, format),
+        media_type=services.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+
+@router.get("/books")
+async def export_books(
+    format: services.ExportFormat = Query("ndjson", description="Output format: ndjson or csv"),
+):
+    return export_response("books", format)
+
+
+
+@router.get("/students")
+async def export_students(
+    format: services.ExportFormat = Query("ndjson", description="Output format: ndjson or csv"),
+):
+    return export_response("students", format)
+
+
+
+@router.get("/issued-books")
+async def export_issued_books(
+    format: services.ExportFormat = Query("ndjson", description="Output format: ndjson or csv"),
+):
+    return export_response("issued-books", format)
+
+
+# =====================================================================
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, status, Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Optional
+
+from app.database.replicas import get_read_db
+from app.schemas import ErrorResponse, BookIssueRecordListResponse
+import app.services.issue as services
+from app.services.issue import IssueSort
+from app.services.pagination import CountMode
+from app.services.student import LoanStatus
+from app.utils import success_response
+
+
+router = APIRouter(prefix="/issues", tags=["issues"])
+
+
+@router.get(
+    "",
+    response_model=BookIssueRecordListResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}}
+)
+async def read_issues(
+    book        : Optional[str]       = Query(None, description="Only loans of this book (ID/ISBN)"),
+    student     : Optional[str]       = Query(None, description="Only loans of this student (name, roll number or phone)"),
+    status_     : Optional[LoanStatus] = Query(None, alias="status", description="active, returned or overdue"),
+    issued_from : Optional[date]      = Query(None, description="Issued on or after (YYYY-MM-DD)"),
+    issued_to   : Optional[date]      = Query(None, description="Issued on or before (YYYY-MM-DD)"),
+    due_from    : Optional[date]      = Query(None, description="Due on or after (YYYY-MM-DD)"),
+    due_to      : Optional[date]      = Query(None, description="Due on or before (YYYY-MM-DD)"),
+    sort        : IssueSort           = Query("-issue_date", description="issue_date or due_date, prefixed with - for newest first"),
+    limit       : int                 = Query(50, ge=1, le=200, description="Number of records per page"),
+    cursor      : Optional[str]       = Query(None, description="Keyset cursor (meta.next_cursor of the previous page)"),
+    include     : Optional[str]       = Query(None, description="Join-load related rows: book, student or book,student"),
+    count       : CountMode           = Query("none", description="Total count mode: exact, estimate or none"),
+    db          : AsyncSession        = Depends(get_read_db),
+):
+    records, meta = await services.list_issues(
+        db, book, student, status_, issued_from, issued_to, due_from, due_to, sort, limit, cursor, include, count
+    )
+
+    return success_response(
+        status_code=status.HTTP_200_OK,
+        message="Loan records fetched successfully",
+        data=records,
+        meta=meta
+    )
+
+
+# =====================================================================
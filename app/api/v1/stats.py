@@ -0,0 +1,28 @@
+from fastapi import APIRouter, status, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.schemas import ErrorResponse, StatsResponse
+import app.services.stats as services
+from app.utils import success_response
+
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get(
+    "",
+    response_model=StatsResponse,
+    responses={500: {"model": ErrorResponse}}
+)
+async def read_stats(db: AsyncSession = Depends(get_async_db)):
+    stats = await services.get_stats(db)
+
+    return success_response(
+        status_code=status.HTTP_200_OK,
+        message="Stats fetched successfully",
+        data=stats,
+    )
+
+
+# =====================================================================
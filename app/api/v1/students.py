@@ -1,44 +1,62 @@
-from fastapi import APIRouter, status, Query, Path, Depends
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, status, Query, Path, Depends, Body, Header, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
 
 from app.schemas import (
     Student, 
     StudentResponse,
     StudentListResponse,
+    StudentEnrollResponse,
+    ErrorResponse,
     SuccessResponse,
-    BookIssueRecordResponse
+    BookIssueRecordResponse,
+    BookIssueRecordListResponse,
 )
 import app.services.student as services
-from app.database import get_db
+from app.services.pagination import CountMode
+from app.database import get_async_db
+from app.database.replicas import get_read_db
+from app.database.config import settings
 from app.utils import success_response
+from app.utils.http_cache import etag_matches, cache_headers, list_cache_headers, not_modified, row_etag
+from app.utils.redis_cache import list_etag
 
 router = APIRouter(prefix="/students", tags=["students"])
 
 
 @router.get("", response_model=StudentListResponse)
-def fetch_students(
+async def fetch_students(
+    request    : Request,
     department : Optional[str] = Query(None, description="Filter by department"),
     semester   : Optional[int] = Query(None, description="Filter by semester"),
     search     : Optional[str] = Query(None, description="Search by partial match in name, roll number, or phone"),
     page       : int           = Query(1, description="Page number for pagination", ge=1),
     limit      : int           = Query(10, description="Number of students per page", ge=1),
-    db         : Session       = Depends(get_db),
+    cursor     : Optional[str] = Query(None, description="Keyset cursor (meta.next_cursor of the previous page); overrides page"),
+    count      : CountMode     = Query("exact", description="Total count mode: exact, estimate or none"),
+    if_none_match : Optional[str] = Header(None),
+    db         : AsyncSession  = Depends(get_read_db),
 ):
-    students, meta = services.list_students(department, semester, search, page, limit, db)
+    # Student records hold contact details: browsers may cache them, shared caches may not
+    headers = list_cache_headers(await list_etag("students", request.query_params.multi_items()), "private")
+    if etag_matches(if_none_match, headers.get("ETag")):
+        return not_modified(headers)
+
+    students, meta = await services.list_students(department, semester, search, page, limit, db, cursor, count)
     
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Students fetched successfully",
         data=students,
-        meta=meta
+        meta=meta,
+        headers=headers,
     )
 
 
 
 @router.post("", response_model=SuccessResponse)
-def add_student(student: Student, db: Session = Depends(get_db)):
-    services.add_student(student, db)
+async def add_student(student: Student, db: AsyncSession = Depends(get_async_db)):
+    await services.add_student(student, db)
 
     return success_response(
         status_code=201,
@@ -49,27 +67,48 @@ def add_student(student: Student, db: Session = Depends(get_db)):
 
 
 
+@router.post("/bulk", response_model=StudentEnrollResponse, responses={500: {"model": ErrorResponse}})
+async def add_students_bulk(
+    students: List[Dict[str, Any]] = Body(..., max_length=settings.BULK_ENROLL_MAX_ROWS, description="Students to enroll; each is validated on its own"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    summary = await services.bulk_add_students(students, db)
+
+    return success_response(
+        status_code=status.HTTP_200_OK,
+        message="Students enrolled",
+        data=summary,
+    )
+
+
+
 @router.get("/{identifier}", response_model=StudentResponse)
-def get_student(
+async def get_student(
     identifier: str = Path(..., description="Student name, roll number, or phone"),
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    student = services.get_student_by_identifier(identifier, db)
+    student = await services.get_student_by_identifier(identifier, db)
+
+    headers = cache_headers(row_etag("student", student.roll_number, student.updated_at), "private")
+    if etag_matches(if_none_match, headers.get("ETag")):
+        return not_modified(headers)
 
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Student fetched successfully",
         data=[student],
+        headers=headers,
     )
 
 
 
 @router.get("/{identifier}/books", response_model=BookIssueRecordResponse)
-def get_books_issued_to_student(
+async def get_books_issued_to_student(
     identifier: str = Path(..., description="Student name, roll number, or phone"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    issued_books =  services.get_student_books(identifier, db)
+    issued_books = await services.get_student_books(identifier, db)
     
     return success_response(
         status_code=201,
@@ -80,13 +119,38 @@ def get_books_issued_to_student(
 
 
 
+@router.get(
+    "/{identifier}/history",
+    response_model=BookIssueRecordListResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}}
+)
+async def get_student_history(
+    identifier  : str                            = Path(..., description="Student name, roll number, or phone"),
+    loan_status : Optional[services.LoanStatus]  = Query(None, alias="status", description="Filter loans: active, returned or overdue"),
+    limit       : int                            = Query(20, ge=1, le=100, description="Number of loans per page"),
+    cursor      : Optional[str]                  = Query(None, description="Keyset cursor (meta.next_cursor of the previous page)"),
+    count       : CountMode                      = Query("none", description="Total count mode: exact, estimate or none"),
+    db          : AsyncSession                   = Depends(get_async_db),
+):
+    loans, meta = await services.get_student_history(identifier, db, loan_status, limit, cursor, count)
+
+    return success_response(
+        status_code=status.HTTP_200_OK,
+        message="Loan history fetched successfully",
+        data=loans,
+        meta=meta,
+    )
+
+
+
+
 @router.patch("/{identifier}/books/{issued_book_id}", response_model=BookIssueRecordResponse)
-def return_issued_book(
+async def return_issued_book(
     identifier: str,
     issued_book_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    book_to_return = services.return_issued_book(identifier, issued_book_id, db)
+    book_to_return = await services.return_issued_book(identifier, issued_book_id, db)
 
     return success_response(
         status_code=201,
@@ -1,12 +1,26 @@
 from celery import Celery
+from celery.schedules import crontab
 from app.database import settings
 
 celery_app = Celery(
     "libramind",
     broker=settings.REDIS_URL,
-    include=["app.tasks.remainder"]
+    include=["app.tasks.remainder", "app.tasks.stats"]
 )
 
 celery_app.conf.task_routes = {
-    "app.tasks.remainder.send_due_soon_reminder": {"queue": "emails"}
+    "app.tasks.remainder.send_due_soon_reminder": {"queue": "emails"},
+    "app.tasks.remainder.send_due_soon_reminders_batch": {"queue": "emails"},
+}
+
+# Run with `celery -A app.celery_worker beat`
+celery_app.conf.beat_schedule = {
+    "fold-stats-deltas": {
+        "task": "app.tasks.stats.fold_stats_deltas_task",
+        "schedule": settings.STATS_FOLD_SECONDS,
+    },
+    "reconcile-stats": {
+        "task": "app.tasks.stats.reconcile_stats_task",
+        "schedule": crontab(hour=3, minute=0),
+    },
 }
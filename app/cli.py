@@ -0,0 +1,101 @@
+"""
+Command line entry points.
+
+Usage:
+    python -m app.cli export books --format csv             # writes books.csv
+    python -m app.cli export issued-books --output - | gzip > issued-books.ndjson.gz
+    python -m app.cli reconcile-stats
+    python -m app.cli seed --books 200000 --students 100000 --loans 2000000
+"""
+from typing import Optional, get_args
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from app.database import get_sessionmaker
+from app.services.export import ExportFormat, ExportTable, stream_export
+from app.services.seed import seed_dataset
+from app.services.stats import reconcile_stats
+
+
+
+async def run_export(table: str, format: str, output: Optional[str]) -> None:
+    output = output or f"{table}.{format}"
+    rows = 0
+
+    def count(n: int) -> None:
+        nonlocal rows
+        rows += n
+
+    started = time.perf_counter()
+    out = open(output, "wb") if output != "-" else sys.stdout.buffer
+
+    try:
+        async for chunk in stream_export(table, format, on_rows=count):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed else 0.0
+    print(f"Exported {rows} {table} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+
+
+
+def run_reconcile_stats() -> None:
+    with get_sessionmaker()() as db:
+        result = reconcile_stats(db)
+
+    print(json.dumps(result, indent=2, default=str))
+
+
+
+def run_seed(args: argparse.Namespace) -> None:
+    try:
+        result = asyncio.run(seed_dataset(
+            args.books, args.students, args.loans, seed=args.seed, active_ratio=args.active_ratio, truncate=args.truncate
+        ))
+    except ValueError as e:
+        sys.exit(str(e))
+
+    print(json.dumps(result, indent=2))
+
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="LibraMind maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Stream a full table dump as NDJSON or CSV")
+    export.add_argument("table", choices=get_args(ExportTable))
+    export.add_argument("--format", choices=get_args(ExportFormat), default="ndjson")
+    export.add_argument("--output", "-o", help="Output file, or - for stdout (default: <table>.<format>)")
+
+    commands.add_parser("reconcile-stats", help="Rebuild the /stats summary tables and report drift")
+
+    seed = commands.add_parser("seed", help="Load a reproducible synthetic dataset (for benchmarks)")
+    seed.add_argument("--books", type=int, default=200_000)
+    seed.add_argument("--students", type=int, default=100_000)
+    seed.add_argument("--loans", type=int, default=2_000_000)
+    seed.add_argument("--seed", type=int, default=42, help="Random seed; the same seed produces the same rows")
+    seed.add_argument("--active-ratio", type=float, default=0.05, help="Share of loans still open")
+    seed.add_argument("--truncate", action="store_true", help="Replace existing books, students and loans")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        asyncio.run(run_export(args.table, args.format, args.output))
+    elif args.command == "reconcile-stats":
+        run_reconcile_stats()
+    elif args.command == "seed":
+        run_seed(args)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,8 @@
 from .database import *
-from .config import *
\ No newline at end of file
+from .config import *
+from . import database as _database
+
+
+def __getattr__(name: str):
+    # engine, async_engine, SessionLocal and AsyncSessionLocal are created on first access
+    return getattr(_database, name)
@@ -1,7 +1,10 @@
-from pydantic import Field
-from pydantic_settings import SettingsConfigDict, BaseSettings
-from typing import Optional
+from pydantic import Field, field_validator
+from pydantic_settings import NoDecode, SettingsConfigDict, BaseSettings
+from typing import Annotated, Dict, List, Literal, Optional
 from functools import lru_cache
+from sqlalchemy.engine import make_url
+
+import json
 
 
 
@@ -19,19 +22,90 @@ class Settings(BaseSettings):
     DB_PORT: Optional[int] = Field(None, env="DB_PORT")
     DB_NAME: Optional[str] = Field(None, env="DB_NAME")
 
+    # Connection pooling, per engine and per worker process.
+    # DB_POOL_MODE=null opens a connection per checkout (NullPool) and disables asyncpg's
+    # prepared statement caches, for running behind PgBouncer in transaction mode.
+    DB_POOL_MODE: Literal["queue", "null"] = "queue"
+    DB_POOL_SIZE: int = Field(5, ge=1)
+    DB_MAX_OVERFLOW: int = Field(10, ge=0)
+    DB_POOL_TIMEOUT: float = Field(30, gt=0, description="Seconds to wait for a free connection")
+    DB_POOL_RECYCLE: int = Field(1800, ge=-1, description="Seconds before a connection is replaced, -1 to never recycle")
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = Field(False, description="Log every SQL statement")
+
+    # Read replicas for GET routes (see app.database.replicas), comma-separated or a JSON list.
+    # A client that wrote within READ_YOUR_WRITES_SECONDS reads from the primary instead.
+    DB_REPLICA_URLS: Annotated[List[str], NoDecode] = Field(default_factory=list)
+    DB_REPLICA_RETRY_SECONDS: float = Field(30, gt=0, description="Seconds an unreachable replica is skipped")
+    DB_REPLICA_CONNECT_TIMEOUT: float = Field(2, gt=0, description="Seconds to wait for a replica connection")
+    READ_YOUR_WRITES_SECONDS: int = Field(5, ge=0, description="Primary pin after a write, 0 to disable")
+
+    # Per-request SQL statement budget (see app.utils.sql_budget). Over-budget requests are
+    # logged; when enforced (default: development/test) they fail with a 500.
+    SQL_BUDGET_DEFAULT: int = Field(25, ge=1)
+    SQL_BUDGETS: Dict[str, int] = Field(default_factory=dict, description='e.g. {"GET /books/{book_id}": 1}')
+    SQL_BUDGET_ENFORCE: Optional[bool] = None
+
 
     # SMTP settings
     # These are used for sending emails, e.g., for password resets or notifications. 
-    SMTP_SERVER: str
-    SMTP_PORT: int
-    SMTP_USERNAME: str
-    SMTP_PASSWORD: str
-    SMTP_FROM_EMAIL: str
-    REDIS_URL: str
+    # Only the reminder tasks need them, so API workers start without them (see require_smtp).
+    SMTP_SERVER: Optional[str] = None
+    SMTP_PORT: Optional[int] = None
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_FROM_EMAIL: Optional[str] = None
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT: float = Field(30, gt=0, description="Seconds to wait on the SMTP server before retrying the batch")
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Connections the API opens at startup: fails fast on a bad DB_URL and spares the
+    # first requests the connection setup (0 skips the check)
+    DB_WARMUP_CONNECTIONS: int = Field(1, ge=0)
+
+    # Number of reminder emails sent per Celery task / SMTP session
+    REMINDER_BATCH_SIZE: int = Field(200, ge=1)
+
+    # How often celery beat folds the trigger deltas into the /stats summary rows
+    STATS_FOLD_SECONDS: float = Field(60, gt=0)
+
+    # In-process lookup caches (per worker); size or TTL of 0 disables them
+    BOOK_CACHE_SIZE: int = Field(10_000, ge=0)
+    BOOK_CACHE_TTL: float = Field(30, ge=0, description="Seconds a cached book stays valid")
+    STUDENT_CACHE_SIZE: int = Field(10_000, ge=0)
+    STUDENT_CACHE_TTL: float = Field(300, ge=0, description="Seconds a cached student stays valid")
+
+    # Shared (Redis) cache of GET /books and GET /students pages
+    LIST_CACHE_ENABLED: bool = True
+    LIST_CACHE_TTL: int = Field(60, ge=1, description="Seconds a cached list page is kept")
+    LIST_CACHE_REDIS_TIMEOUT: float = Field(0.25, gt=0, description="Redis socket timeout in seconds")
+
+    # Cache-Control max-age of GET /books and GET /students pages (0: always revalidate the ETag)
+    HTTP_LIST_MAX_AGE: int = Field(30, ge=0)
+
+    # POST /books/bulk: rows sent per COPY batch; rejected rows listed in the import summary
+    BULK_IMPORT_BATCH_SIZE: int = Field(5_000, ge=1)
+    BULK_IMPORT_ERROR_LIMIT: int = Field(100, ge=0)
+
+    # POST /students/bulk: students per request and per INSERT statement (7 bind params each);
+    # rejected rows listed in the enrollment summary
+    BULK_ENROLL_MAX_ROWS: int = Field(50_000, ge=1)
+    BULK_ENROLL_BATCH_SIZE: int = Field(1_000, ge=1, le=4_000)
+    BULK_ENROLL_ERROR_LIMIT: int = Field(100, ge=0)
+
+    # Exports: rows fetched per server-side cursor round trip (and per streamed chunk)
+    EXPORT_CHUNK_SIZE: int = Field(2_000, ge=1)
 
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @field_validator("DB_REPLICA_URLS", mode="before")
+    @classmethod
+    def split_replica_urls(cls, value):
+        if isinstance(value, str):
+            value = json.loads(value) if value.lstrip().startswith("[") else value.split(",")
+        return [url.strip() for url in value if url.strip()]
+
     @property
     def DATABASE_URL(self) -> str:
         if self.DB_URL:
@@ -45,6 +119,27 @@ class Settings(BaseSettings):
 
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_SERVER}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return async_url(self.DATABASE_URL)
+
+    @property
+    def ASYNC_REPLICA_URLS(self) -> List[str]:
+        return [async_url(url) for url in self.DB_REPLICA_URLS]
+
+    def require_smtp(self) -> None:
+        missing = [
+            name for name in ("SMTP_SERVER", "SMTP_PORT", "SMTP_USERNAME", "SMTP_PASSWORD", "SMTP_FROM_EMAIL")
+            if getattr(self, name) in (None, "")
+        ]
+        if missing:
+            raise ValueError(f"Missing config(s): {', '.join(missing)}")
+
+
+def async_url(url: str) -> str:
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
 
 @lru_cache()
 def get_settings():
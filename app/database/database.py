@@ -1,28 +1,107 @@
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
+from uuid import uuid4
 
 from app.database.config import settings
+from app.database.pool import TimedAsyncAdaptedQueuePool, TimedNullPool, TimedQueuePool
+from app.utils.metrics import instrument_engine
+from app.utils.sql_budget import count_statements
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=True
-)
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
 
-Base = declarative_base()
+def engine_options(is_async: bool = False) -> dict:
+    """Pool, echo and driver options for create_engine / create_async_engine from Settings."""
+    options = {"echo": settings.DB_ECHO}
+
+    if settings.DB_POOL_MODE == "null":
+        options["poolclass"] = TimedNullPool
+        if is_async:
+            # PgBouncer (transaction mode) may hand each statement a different server
+            # connection, so asyncpg must not cache or reuse named prepared statements
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+
+@lru_cache()
+def get_engine() -> Engine:
+    """Sync engine (scheduler, Celery tasks, CLI); created on first use."""
+    engine = create_engine(settings.DATABASE_URL, **engine_options())
+    instrument_engine(engine, "sync")
+    count_statements(engine)
+    return engine
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Async engine used by the API request path (asyncpg driver); created on first use."""
+    async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, **engine_options(is_async=True))
+    instrument_engine(async_engine.sync_engine, "async")
+    count_statements(async_engine.sync_engine)
+    return async_engine
+
+
+@lru_cache()
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=get_engine()
+    )
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+# Engines and session factories are built on first access rather than at import, so a
+# process only loads the drivers it uses (Celery never touches asyncpg) and importing
+# app.database stays cheap. `from app.database import SessionLocal` still works.
+LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "async_engine": get_async_engine,
+    "SessionLocal": get_sessionmaker,
+    "AsyncSessionLocal": get_async_sessionmaker,
+}
+
+
+def __getattr__(name: str):
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+Base = declarative_base(cls=AsyncAttrs)
 
 
 
 def get_db():
-    db: Session = SessionLocal()
+    db: Session = get_sessionmaker()()
 
     try:
         yield db
@@ -34,4 +113,12 @@ def get_db():
         db.close()
 
 
-# =====================================================================
\ No newline at end of file
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        try:
+            yield db
+            await db.commit()
+        except SQLAlchemyError:
+            await db.rollback()
+            raise
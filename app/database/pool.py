@@ -0,0 +1,74 @@
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+import threading
+import time
+
+
+class PoolTimingMixin:
+    """Count checkouts and measure how long each one waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+
+class TimedQueuePool(PoolTimingMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(PoolTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(PoolTimingMixin, NullPool):
+    """NullPool connects on every checkout, so its wait time is the connect time."""
+
+
+
+def pool_stats(pool: Pool) -> dict:
+    """Live numbers for one engine's pool (per worker process)."""
+    if isinstance(pool, NullPool):
+        stats = {"mode": "null"}
+    else:
+        stats = {
+            "mode": "queue",
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            # Negative while the pool hasn't opened pool_size connections yet
+            "overflow": pool.overflow(),
+        }
+
+    if isinstance(pool, PoolTimingMixin):
+        with pool._stats_lock:
+            stats.update({
+                "checkouts": pool.checkouts,
+                "timeouts": pool.timeouts,
+                "wait_seconds_total": round(pool.wait_total, 6),
+                "wait_seconds_max": round(pool.wait_max, 6),
+                "wait_seconds_avg": round(pool.wait_total / pool.checkouts, 6) if pool.checkouts else None,
+            })
+
+    return stats
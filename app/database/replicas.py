@@ -0,0 +1,170 @@
+from functools import lru_cache
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import Request
+from typing import AsyncIterator, Optional
+
+import logging
+import time
+
+from app.database.config import settings
+from app.database.database import engine_options, get_async_sessionmaker
+from app.utils.cache import PINNED_SESSION, REPLICA_SESSION
+from app.utils.metrics import instrument_engine
+from app.utils.sql_budget import count_statements
+
+
+logger = logging.getLogger(__name__)
+
+# Set after a successful write; holds the epoch second until which reads go to the primary
+PRIMARY_PIN_COOKIE = "read_primary_until"
+
+
+class ReplicaSet:
+    """
+    Round-robin over read replicas, skipping any that recently failed to connect.
+
+    A replica that can't hand out a connection is marked down for
+    DB_REPLICA_RETRY_SECONDS; when every replica is down, reads fall back to the primary.
+    Each worker process keeps its own rotation and health view.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self.sessionmakers = [
+            async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+            for engine in engines
+        ]
+
+        self._next = 0
+        self._down_until = [0.0] * len(engines)
+
+    def candidates(self) -> list[int]:
+        """Healthy replica indexes, starting with the next one in the rotation."""
+        now = time.monotonic()
+        healthy = [index for index, down_until in enumerate(self._down_until) if down_until <= now]
+        if not healthy:
+            return []
+
+        # Rotate over the healthy ones only, so a dead replica's share is spread evenly
+        start = self._next % len(healthy)
+        self._next += 1
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, index: int, error: Exception) -> None:
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+        logger.warning(
+            "Read replica %d unavailable, skipping it for %ss: %s", index, self.retry_seconds, error
+        )
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {"replica": index, "healthy": self._down_until[index] <= now}
+            for index in range(len(self.engines))
+        ]
+
+
+
+@lru_cache()
+def get_replica_set() -> ReplicaSet:
+    """Replica engines from DB_REPLICA_URLS, created on first use (an empty set without replicas)."""
+    engines = []
+    for url in settings.ASYNC_REPLICA_URLS:
+        options = engine_options(is_async=True)
+        # Fail over quickly instead of waiting out asyncpg's 60s default on a dead host
+        options["connect_args"] = {**options.get("connect_args", {}), "timeout": settings.DB_REPLICA_CONNECT_TIMEOUT}
+
+        engine = create_async_engine(url, **options)
+        instrument_engine(engine.sync_engine, "replica")
+        count_statements(engine.sync_engine)
+        engines.append(engine)
+
+    return ReplicaSet(engines, settings.DB_REPLICA_RETRY_SECONDS)
+
+
+
+def pinned_to_primary(cookies: dict[str, str]) -> bool:
+    """Whether the client wrote recently enough that a lagging replica might not show it."""
+    until: Optional[str] = cookies.get(PRIMARY_PIN_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Session for read-only routes: the next healthy replica in the rotation, or the primary
+    when no replica is configured or reachable, or the client wrote within
+    READ_YOUR_WRITES_SECONDS (see ReadYourWritesMiddleware).
+
+    Replicas lag the primary, so replica sessions are flagged (REPLICA_SESSION) and never
+    fill the list page or lookup caches; pinned sessions (PINNED_SESSION) skip cache
+    lookups, since an entry stored before the write would hide it.
+    """
+    replicas = get_replica_set()
+    pinned = pinned_to_primary(request.cookies)
+
+    if not pinned:
+        for index in replicas.candidates():
+            db = replicas.sessionmakers[index]()
+            try:
+                # Check out a connection now, so an unreachable replica falls through to the next
+                await db.connection()
+            except (OSError, SQLAlchemyError) as e:
+                await db.close()
+                replicas.mark_down(index, e)
+                continue
+
+            db.info[REPLICA_SESSION] = True
+            try:
+                yield db
+            finally:
+                await db.close()
+            return
+
+    async with get_async_sessionmaker()() as db:
+        db.info[PINNED_SESSION] = pinned
+        yield db
+
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client to the primary for READ_YOUR_WRITES_SECONDS after a successful write.
+
+    Any non-GET/HEAD/OPTIONS request answered with a status below 400 sets the
+    PRIMARY_PIN_COOKIE; get_read_db honours it. Only active when replicas are configured.
+    """
+
+    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        window = settings.READ_YOUR_WRITES_SECONDS
+        if (
+            scope["type"] != "http"
+            or scope["method"] in self.SAFE_METHODS
+            or not window
+            or not settings.DB_REPLICA_URLS
+        ):
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{PRIMARY_PIN_COOKIE}={time.time() + window:.0f}; "
+                    f"Max-Age={window}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# =====================================================================
@@ -1,7 +1,16 @@
-from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import DDL, Column, Computed, DateTime, Index, Integer, String, event, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from app.database import Base
 
+# Weighted full-text document: title matches rank above author, author above category
+BOOK_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(author, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'C')"
+)
+
+
 class BookModel(Base):
     __tablename__ = "books"
 
@@ -12,8 +21,25 @@ class BookModel(Base):
     category = Column(String(100), nullable=False)
     copies = Column(Integer)
 
+    # Bumped on every UPDATE (ORM or Core); the row version behind the book's ETag
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    # Generated by Postgres, never loaded unless explicitly requested
+    search_vector = deferred(Column(TSVECTOR, Computed(BOOK_SEARCH_VECTOR, persisted=True)))
+
     # Relationship to issued books
     issued_records = relationship("IssuedBookModel", back_populates="book")
 
+    # Read server-generated updated_at back with RETURNING instead of expiring it
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram indexes serve both fuzzy search and the ILIKE '%term%' filters
+        Index("ix_books_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_books_author_trgm", "author", postgresql_using="gin", postgresql_ops={"author": "gin_trgm_ops"}),
+        Index("ix_books_category_trgm", "category", postgresql_using="gin", postgresql_ops={"category": "gin_trgm_ops"}),
+    )
+
 
-# =====================================================================
\ No newline at end of file
+event.listen(BookModel.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
@@ -1,7 +1,13 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey
+from datetime import date
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index, and_
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+# At most one open (not yet returned) loan of a book per student
+OPEN_LOAN_CONSTRAINT = "uq_issued_books_open_loan"
+
+
 class IssuedBookModel(Base):
     __tablename__ = "issued_books"
 
@@ -16,5 +22,38 @@ class IssuedBookModel(Base):
     student = relationship("StudentModel", back_populates="issued_books")
     book = relationship("BookModel", back_populates="issued_records")
 
+    @hybrid_property
+    def is_overdue(self) -> bool:
+        """Not returned and past its due date."""
+        return self.returned_date is None and self.due_date < date.today()
+
+    @is_overdue.inplace.expression
+    @classmethod
+    def _is_overdue_expression(cls):
+        # Same clock as issue/return dates (the app's date.today()), evaluated per query;
+        # returned_date IS NULL keeps it matching the open-loan partial indexes
+        return and_(cls.returned_date.is_(None), cls.due_date < date.today())
 
-# =====================================================================
\ No newline at end of file
+    __table_args__ = (
+        Index(
+            OPEN_LOAN_CONSTRAINT,
+            book_id,
+            student_id,
+            unique=True,
+            postgresql_where=returned_date.is_(None),
+        ),
+        # Overdue scans only ever look at open loans
+        Index(
+            "ix_issued_books_open_due_date",
+            due_date,
+            id,
+            postgresql_where=returned_date.is_(None),
+        ),
+        # A student's loans, active (returned_date IS NULL) or returned
+        Index("ix_issued_books_student_returned", student_id, returned_date),
+        # GET /issues: keyset order (sort date, id), optionally narrowed to one book or student
+        Index("ix_issued_books_issue_date", issue_date, id),
+        Index("ix_issued_books_due_date", due_date, id),
+        Index("ix_issued_books_book_issue_date", book_id, issue_date, id),
+        Index("ix_issued_books_student_issue_date", student_id, issue_date, id),
+    )
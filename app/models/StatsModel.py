@@ -0,0 +1,45 @@
+from sqlalchemy import BigInteger, Column, Date, Identity, Integer, String
+from app.database import Base
+
+# The summary tables hold folded totals; the triggers on books and issued_books only
+# append per-statement changes to the *_deltas tables (see the stats delta tables
+# migration). Totals are summary + pending deltas; app.services.stats.fold_stats_deltas
+# moves the deltas in and reconcile_stats rebuilds everything from the source tables.
+
+
+class CategoryStatsModel(Base):
+    __tablename__ = "category_stats"
+
+    category = Column(String(100), primary_key=True)
+    books = Column(Integer, nullable=False, default=0)
+    copies_available = Column(Integer, nullable=False, default=0)
+    active_loans = Column(Integer, nullable=False, default=0)
+    total_loans = Column(Integer, nullable=False, default=0)
+
+
+class LoanDueStatsModel(Base):
+    __tablename__ = "loan_due_stats"
+
+    # Open loans per due date: overdue = sum over due_date < today, a handful of rows
+    due_date = Column(Date, primary_key=True)
+    active_loans = Column(Integer, nullable=False, default=0)
+
+
+class CategoryStatsDeltaModel(Base):
+    __tablename__ = "category_stats_deltas"
+
+    # Insert-only: concurrent writers never wait on each other's summary row
+    id = Column(BigInteger, Identity(), primary_key=True)
+    category = Column(String(100), nullable=False)
+    books = Column(Integer, nullable=False)
+    copies_available = Column(Integer, nullable=False)
+    active_loans = Column(Integer, nullable=False)
+    total_loans = Column(Integer, nullable=False)
+
+
+class LoanDueStatsDeltaModel(Base):
+    __tablename__ = "loan_due_stats_deltas"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    due_date = Column(Date, nullable=False)
+    active_loans = Column(Integer, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -10,11 +10,19 @@ class StudentModel(Base):
     roll_number = Column(String(20), nullable=False, unique=True)
     department = Column(String(50), nullable=False)
     semester = Column(Integer, nullable=False)
-    phone = Column(String(15), nullable=False)
+    phone = Column(String(15), nullable=False, index=True)
     email = Column(String(100), nullable=False, unique=True)
 
+    # Bumped on every UPDATE; the row version behind the student's ETag
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
     # Relationship to issued books
     issued_books = relationship("IssuedBookModel", back_populates="student")
 
+    __mapper_args__ = {"eager_defaults": True}
 
-# =====================================================================
\ No newline at end of file
+    # Case-insensitive identifier lookups (see get_student_by_identifier)
+    __table_args__ = (
+        Index("ix_students_lower_roll_number", func.lower(roll_number)),
+        Index("ix_students_lower_name", func.lower(name)),
+    )
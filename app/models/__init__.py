@@ -1,3 +1,4 @@
 from .BookModel import *
 from .StudentModel import *
-from .IssuedBookModel import *
\ No newline at end of file
+from .IssuedBookModel import *
+from .StatsModel import *
\ No newline at end of file
@@ -1,27 +1,37 @@
 from datetime import date
-from app.database import get_db
-from app.tasks import send_due_soon_reminder
+from app.database import get_sessionmaker, settings
+from app.tasks import send_due_soon_reminders_batch
 from app.services.overdue import get_due_soon_books
 from app.templates import generate_remainder_email
 
 def send_daily_remainder():
-    db = get_db()
-    books = get_due_soon_books(db)
+    batch = []
 
-    for issued in books:
-        student = issued.student
-        book = issued.book
-        days_remaining = (issued.due_date - date.today()).days
+    with get_sessionmaker()() as db:
+        books = get_due_soon_books(db)
 
-        subject, body = generate_remainder_email(
-            student_name=student.name,
-            book_title=book.title,
-            due_date=str(issued.due_date),
-            days_remaining=days_remaining
-        )
+        for issued in books:
+            student = issued.student
+            book = issued.book
+            days_remaining = (issued.due_date - date.today()).days
 
-        send_due_soon_reminder.delay(
-            to_email=student.email,
-            subject=subject,
-            body=body
-        )
+            subject, body = generate_remainder_email(
+                student_name=student.name,
+                book_title=book.title,
+                due_date=str(issued.due_date),
+                days_remaining=days_remaining
+            )
+
+            batch.append({
+                "to_email": student.email,
+                "subject": subject,
+                "body": body
+            })
+
+            # One task (and one SMTP session) per chunk instead of per loan
+            if len(batch) >= settings.REMINDER_BATCH_SIZE:
+                send_due_soon_reminders_batch.delay(batch)
+                batch = []
+
+    if batch:
+        send_due_soon_reminders_batch.delay(batch)
@@ -1,4 +1,5 @@
 from .book import *
 from .student import *
 from .issue import *
+from .stats import *
 from .response_schema import *
\ No newline at end of file
@@ -1,4 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional
 
 
 class Book(BaseModel):
@@ -25,6 +27,8 @@ class Book(BaseModel):
 
 class BookOut(Book):
     id: int = Field(ge=1, description="Unique identifier for the book")
+    # Row version for the ETag; not part of the response body
+    updated_at: Optional[datetime] = Field(None, exclude=True)
 
     model_config = ConfigDict(
         from_attributes = True,
@@ -43,4 +47,21 @@ class BookOut(Book):
     )
 
 
+class BookImportError(BaseModel):
+    row   : int           = Field(description="Row number in the upload (NDJSON line / CSV data row)")
+    isbn  : Optional[str] = Field(None, description="ISBN of the row, when it could be read")
+    error : str           = Field(description="Why the row was not applied")
+
+
+class BookImportSummary(BaseModel):
+    rows_received    : int  = Field(description="Data rows read from the upload")
+    rows_applied     : int  = Field(description="Rows that created a book or added copies")
+    rows_invalid     : int  = Field(description="Rows rejected by validation")
+    rows_conflicting : int  = Field(description="Rows whose ISBN belongs to a book with different metadata")
+    books_created    : int  = Field(description="New books inserted")
+    books_updated    : int  = Field(description="Existing books whose copies were increased")
+    errors           : List[BookImportError] = Field(description="Rejected rows, ordered by row number (capped)")
+    errors_truncated : bool = Field(description="True if more rows were rejected than are listed")
+
+
 # =====================================================================
\ No newline at end of file
@@ -1,6 +1,16 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer
 from datetime import date
-from typing import Optional
+from typing import Annotated, List, Literal, Optional
+
+from app.schemas.book import BookOut
+from app.schemas.student import Student
+
+
+# Dates are rendered as DD-MM-YYYY in API responses (JSON mode only; model_dump() keeps date objects)
+DisplayDate = Annotated[
+    date,
+    PlainSerializer(lambda value: value.strftime("%d-%m-%Y"), return_type=str, when_used="json"),
+]
 
 
 class IssueBook(BaseModel):
@@ -24,9 +34,9 @@ class BookIssueRecord(BaseModel):
     id: int = Field(..., description="Unique ID of the issued book record", ge=1)
     book_id: int = Field(..., description="Details of the issued book", ge=1)
     student_id: int = Field(..., description="Id of the student to whom the book is issued")
-    issue_date: date = Field(..., description="Date when the book was issued")
-    due_date: date = Field(..., description="Expected return date for the book")
-    returned_date: Optional[date] = Field(None, description="Actual date when the book was returned")
+    issue_date: DisplayDate = Field(..., description="Date when the book was issued")
+    due_date: DisplayDate = Field(..., description="Expected return date for the book")
+    returned_date: Optional[DisplayDate] = Field(None, description="Actual date when the book was returned")
     is_overdue: bool = Field(..., description="Whether the book is overdue")
 
 
@@ -34,4 +44,54 @@ class BookIssueRecord(BaseModel):
         from_attributes = True
 
 
-# =====================================================================
\ No newline at end of file
+# =====================================================================
+
+
+class BookIssueRecordDetail(BookIssueRecord):
+    book: Optional[BookOut] = Field(None, description="Issued book, present when requested via include=book")
+    student: Optional[Student] = Field(None, description="Borrowing student, present when requested via include=student")
+
+
+class Checkout(BaseModel):
+    student_id: str = Field(..., description="Name, roll number or phone of the borrowing student")
+    book_ids: List[str] = Field(..., min_length=1, max_length=50, description="Book IDs/ISBNs to issue")
+    duration_days: int = Field(..., ge=1, description="No of days for which the books are issued")
+    atomic: bool = Field(True, description="Issue all books or none; false issues whatever is available")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "student_id": "101",
+                    "book_ids": ["9780132350884", "12"],
+                    "duration_days": 14,
+                    "atomic": True,
+                }
+            ]
+        }
+    )
+
+
+class BulkReturn(BaseModel):
+    student_id: str = Field(..., description="Name, roll number or phone of the student returning the books")
+    book_ids: List[str] = Field(..., min_length=1, max_length=50, description="Book IDs/ISBNs being returned")
+    atomic: bool = Field(True, description="Return all books or none; false returns whatever is on loan")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "student_id": "101",
+                    "book_ids": ["9780132350884", "12"],
+                    "atomic": True,
+                }
+            ]
+        }
+    )
+
+
+class CheckoutItem(BaseModel):
+    book_id: str = Field(..., description="Book ID/ISBN as sent in the request")
+    status: Literal["issued", "returned", "failed"] = Field(..., description="Outcome for this book")
+    record: Optional[BookIssueRecord] = Field(None, description="Issue record, unless the item failed")
+    error: Optional[str] = Field(None, description="Why the item failed")
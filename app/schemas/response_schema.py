@@ -1,7 +1,7 @@
 from typing import Any, List, Optional, Dict
 from pydantic import BaseModel, Field
 
-from app.schemas import BookOut, Student, BookIssueRecord
+from app.schemas import BookOut, BookImportSummary, Student, StudentEnrollSummary, BookIssueRecord, BookIssueRecordDetail, CheckoutItem, LibraryStats
 
 
 # ==============================
@@ -43,22 +43,47 @@ class BookResponse(SuccessResponse):
         title = "BookResponse"
 
 
+class BookImportResponse(SuccessResponse):
+    data: BookImportSummary = Field(..., description="Per-row outcome of a bulk import")
+    class Config:
+        title = "BookImportResponse"
+
+
 class StudentResponse(SuccessResponse):
     data: List[Student] = Field(..., description="List of students")
     class Config:
         title = "StudentResponse"
 
 
+class StudentEnrollResponse(SuccessResponse):
+    data: StudentEnrollSummary = Field(..., description="Per-row outcome of a bulk enrollment")
+    class Config:
+        title = "StudentEnrollResponse"
+
+
 class BookIssueRecordResponse(SuccessResponse):
     data: List[BookIssueRecord] = Field(..., description="List of book issue records")
     class Config:
         title = "BookIssueRecordResponse"
 
 
+class CheckoutResponse(SuccessResponse):
+    data: List[CheckoutItem] = Field(..., description="Outcome per requested book, in request order")
+    class Config:
+        title = "CheckoutResponse"
+
+
+class StatsResponse(SuccessResponse):
+    data: LibraryStats = Field(..., description="Inventory and circulation totals")
+    class Config:
+        title = "StatsResponse"
+
+
 # ==============================
 # ✅ 4. Success Response with Data and Meta
 # 1. BookListResponse
 # 2. StudentListResponse
+# 3. BookIssueRecordListResponse
 # ==============================
 
 
@@ -70,7 +95,9 @@ class BookListResponse(SuccessResponse):
             "page": 1,
             "limit": 10,
             "total_books": 30,
+            "total_is_estimate": False,
             "fetched_count": 10,
+            "next_cursor": "eyJpZCI6MTB9",
             "filters_applied": {}
         },
         description="Pagination and filter info"
@@ -88,8 +115,10 @@ class StudentListResponse(SuccessResponse):
         example={
             "page": 1,
             "limit": 10,
-            "total_records": 50,
+            "total_students": 50,
+            "total_is_estimate": False,
             "fetched_count": 10,
+            "next_cursor": "eyJpZCI6MTB9",
             "filters_applied": {}
         },
         description="Pagination and filter info"
@@ -100,4 +129,22 @@ class StudentListResponse(SuccessResponse):
         title = "StudentListResponse"
 
 
-# =====================================================================
\ No newline at end of file
+# =====================================================================
+
+class BookIssueRecordListResponse(SuccessResponse):
+    data: List[BookIssueRecordDetail] = Field(..., description="List of book issue records")
+    meta: Dict[str, Any] = Field(
+        ...,
+        example={
+            "limit": 50,
+            "total_records": None,
+            "total_is_estimate": False,
+            "fetched_count": 50,
+            "next_cursor": "eyJkdWVfZGF0ZSI6IjIwMjUtMDEtMjUiLCJpZCI6M30",
+            "include": ["book"]
+        },
+        description="Pagination info"
+    )
+
+    class Config:
+        title = "BookIssueRecordListResponse"
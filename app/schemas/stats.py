@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List
+
+
+class CategoryStats(BaseModel):
+    category         : str = Field(..., description="Book category")
+    books            : int = Field(..., description="Number of titles in the category")
+    copies_available : int = Field(..., description="Copies on the shelf (not on loan)")
+    active_loans     : int = Field(..., description="Loans not yet returned")
+    total_loans      : int = Field(..., description="All loans ever made, returned or not")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LibraryStats(BaseModel):
+    books            : int = Field(..., description="Number of titles")
+    copies_available : int = Field(..., description="Copies on the shelf (not on loan)")
+    active_loans     : int = Field(..., description="Loans not yet returned")
+    overdue_loans    : int = Field(..., description="Active loans past their due date")
+    total_loans      : int = Field(..., description="All loans ever made")
+    categories       : List[CategoryStats] = Field(..., description="Per-category breakdown")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "books": 50,
+                    "copies_available": 353,
+                    "active_loans": 24,
+                    "overdue_loans": 24,
+                    "total_loans": 1065,
+                    "categories": [
+                        {
+                            "category": "Classic",
+                            "books": 7,
+                            "copies_available": 44,
+                            "active_loans": 5,
+                            "total_loans": 188,
+                        }
+                    ],
+                }
+            ]
+        }
+    )
+
+
+# =====================================================================
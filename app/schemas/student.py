@@ -1,26 +1,52 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from datetime import datetime
+from pydantic import AfterValidator, BaseModel, EmailStr, Field, ConfigDict
+from typing import Annotated, List, Optional
+
+import re
+
+
+# Mirrors the CHECK constraints on students (app/database/sql/tables.sql), so a row the
+# database would reject fails validation instead (a per-row error in bulk enrollment)
+STUDENT_PHONE_PATTERN = r"^[0-9+]{10,15}$"
+STUDENT_EMAIL_PATTERN = re.compile(r"^[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}$", re.IGNORECASE)
+
+
+def check_student_email(email: str) -> str:
+    if not STUDENT_EMAIL_PATTERN.match(email):
+        raise ValueError("email may only use letters, digits and ._%+- (e.g. name@example.com)")
+    return email
+
+
+StudentEmail = Annotated[EmailStr, AfterValidator(check_student_email)]
+
 
 class Student(BaseModel):
     
     name: str = Field(
         ..., 
         min_length=3, 
+        max_length=100,
         description="Full name of the student"
     )
 
     roll_number: str = Field(
         ..., 
+        min_length=1,
+        max_length=20,
         description="Unique roll number identifier for the student (alphanumeric)"
     )
 
     department: str = Field(
         ..., 
         min_length=2, 
+        max_length=50,
         description="Department name"
     )
 
     semester: int = Field(
         ...,
+        ge=1,
+        le=8,
         description="Semester (1 to 8)"
     )
 
@@ -28,10 +54,14 @@ class Student(BaseModel):
         ...,
         min_length=10,
         max_length=15,
+        pattern=STUDENT_PHONE_PATTERN,
         description="Phone number (10-15 digits, optional country code)",
     )
     
-    email: EmailStr = Field(..., description="Valid email address")
+    email: StudentEmail = Field(..., max_length=100, description="Valid email address")
+
+    # Row version for the ETag, read from the database; never dumped or stored from input
+    updated_at: Optional[datetime] = Field(None, exclude=True)
 
 
     model_config = ConfigDict(
@@ -49,3 +79,19 @@ class Student(BaseModel):
             ]
         }
     )
+
+
+class StudentEnrollError(BaseModel):
+    row              : int           = Field(description="1-based position of the student in the request body")
+    roll_number      : Optional[str] = Field(None, description="Roll number of the row, when it could be read")
+    duplicate_fields : List[str]     = Field(default_factory=list, description="Unique fields that collided: roll_number, email")
+    error            : str           = Field(description="Why the row was not inserted")
+
+
+class StudentEnrollSummary(BaseModel):
+    rows_received  : int  = Field(description="Students in the request body")
+    rows_inserted  : int  = Field(description="Students enrolled")
+    rows_invalid   : int  = Field(description="Rows rejected by validation")
+    rows_duplicate : int  = Field(description="Rows whose roll number or email is already taken")
+    errors         : List[StudentEnrollError] = Field(description="Rejected rows, ordered by row number (capped)")
+    errors_truncated : bool = Field(description="True if more rows were rejected than are listed")
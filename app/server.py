@@ -1,36 +1,61 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import text, inspect
 from contextlib import asynccontextmanager
 
+import asyncio
 import logging
 import logging.config
 
-from app.database import Base, engine
+from app.database import get_async_engine, get_engine, settings
+from app.database.pool import pool_stats
+from app.database.replicas import ReadYourWritesMiddleware, get_replica_set
 from app.utils import error_response
-from app.api import books, students
+from app.utils.cache import book_cache, student_cache
+from app.utils.metrics import MetricsMiddleware, metrics_payload
+from app.utils.sql_budget import StatementBudgetMiddleware
+from app.api import books, exports, issues, stats, students
 # from app.logging_config import LOGGING_CONFIG
 
 
 # logging.config.dictConfig(LOGGING_CONFIG)
-# logger = logging.getLogger(__name__)
+logger = logging.getLogger(__name__)
+
+
+
+async def warm_up_database() -> None:
+    """
+    Open DB_WARMUP_CONNECTIONS pooled connections before serving (SELECT 1 on each).
+    They go back to the pool open, so the first requests skip connection setup.
+    """
+    async_engine = get_async_engine()
+    connections = min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE)
+
+    async def ping():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-            print("\n\n\n✅ Database connection established at startup.\n\n\n")
-            # logger.info("Database connection successful at startup.")
-    except Exception as e:
-        print(f"❌ Database connection failed at startup: {e}")
-        # logger.error("Database connection failed at startup.", exc_info=e)
-        raise RuntimeError(f"Startup DB connection failed: {e}")
-    
+    # The schema is managed by Alembic (`alembic upgrade head`), never created here
+    if settings.DB_WARMUP_CONNECTIONS:
+        try:
+            await warm_up_database()
+            logger.info("Database connection established at startup.")
+        except Exception as e:
+            logger.error("Database connection failed at startup.", exc_info=e)
+            raise RuntimeError(f"Startup DB connection failed: {e}")
+
     yield
 
+    await get_async_engine().dispose()
+
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -39,13 +64,18 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
-        # lifespan=lifespan,
+        lifespan=lifespan,
     )
 
-    Base.metadata.create_all(bind=engine)
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(StatementBudgetMiddleware)
+    app.add_middleware(MetricsMiddleware)
 
     app.include_router(books.router)
     app.include_router(students.router)
+    app.include_router(issues.router)
+    app.include_router(exports.router)
+    app.include_router(stats.router)
 
     return app
 
@@ -71,6 +101,8 @@ def root():
 
 @app.get("/db-check")
 def db_check():
+    engine = get_engine()
+
     try:
         with Session(engine) as session:
             # 1. Get DB version
@@ -99,6 +131,40 @@ def db_check():
             }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
+
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    payload, content_type = metrics_payload()
+    return Response(content=payload, media_type=content_type)
+
+
+
+@app.get("/db-pool")
+def db_pool():
+    # Per-worker numbers: each uvicorn worker has its own pools
+    return {
+        "status": "ok",
+        "pools": {
+            "async": pool_stats(get_async_engine().pool),
+            "sync": pool_stats(get_engine().pool),
+            "replicas": [
+                {**health, **pool_stats(engine.pool)}
+                for health, engine in zip(get_replica_set().stats(), get_replica_set().engines)
+            ],
+        },
+    }
+
+
+
+@app.get("/cache-stats")
+def cache_stats():
+    # Per-worker numbers: each uvicorn worker keeps its own lookup caches
+    return {
+        "status": "ok",
+        "caches": [book_cache.stats(), student_cache.stats()],
+    }
     
 
 
@@ -1,26 +1,136 @@
 # book.py
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, func, or_, select, text, tuple_, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from typing import Union
+from pydantic import ValidationError
+from typing import AsyncIterator, Literal, Optional, Union
 from datetime import date, timedelta
 
-from app.models import BookModel, IssuedBookModel
-from app.schemas import Book, BookOut, BookIssueRecord, IssueBook
-from app.services.student import book_issue_record_schema, get_student_by_identifier
-from app.utils.utils import check_is_isbn
+from app.database.config import settings
+from app.models import BookModel, IssuedBookModel, OPEN_LOAN_CONSTRAINT
+from app.schemas import (
+    Book,
+    BookOut,
+    BookImportError,
+    BookImportSummary,
+    BookIssueRecord,
+    BulkReturn,
+    Checkout,
+    CheckoutItem,
+    IssueBook,
+)
+from app.services.pagination import (
+    CountMode,
+    count_rows,
+    parse_id_cursor,
+    parse_include,
+    parse_keyset_cursor,
+    strict_int,
+)
+from app.services.student import book_issue_record_schema, resolve_student_id
+from app.utils.cache import MISSING, book_cache, invalidate_book, may_fill_cache, may_read_cache
+from app.utils.redis_cache import bump_generation, cached_list
+from app.utils.streaming import StreamFormatError, iter_csv_rows, iter_ndjson_rows
+from app.utils.utils import check_is_isbn, encode_cursor
+
+
+ISSUE_RECORD_INCLUDES = {"book", "student"}
+
+ImportFormat = Literal["ndjson", "csv"]
+
+IMPORT_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+IMPORT_COLUMNS = ["row_number", "title", "author", "isbn", "category", "copies"]
+
+
+def search_books_query(query: Select, q: str) -> tuple[Select, tuple]:
+    """
+    Restrict a book query to rows matching a free-text search term.
+    Args:
+        query (Select): Base book query (other filters already applied).
+        q (str): Search term in websearch syntax ("quoted phrase", -excluded, or).
+
+    Returns: tuple[Select, tuple]: The filtered query and the ORDER BY clauses ranking it.
+    Notes:
+        Full-text matches are served by the GIN index on books.search_vector and
+        typo-tolerant word matches on title/author by the pg_trgm GIN indexes.
+    """
+
+    ts_query = func.websearch_to_tsquery("english", q)
+
+    query = query.where(
+        or_(
+            BookModel.search_vector.op("@@")(ts_query),
+            BookModel.title.op("%>")(q),
+            BookModel.author.op("%>")(q),
+        )
+    )
+
+    relevance = (
+        func.ts_rank(BookModel.search_vector, ts_query).desc(),
+        func.greatest(
+            func.word_similarity(q, BookModel.title),
+            func.word_similarity(q, BookModel.author),
+        ).desc(),
+    )
+
+    return query, relevance
 
 
-def list_books(
+
+async def list_books(
     title: str, 
     author: str, 
     category: str, 
     page: int, 
     limit: int, 
-    db: Session
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    count: CountMode = "exact",
+    q: Optional[str] = None,
 ) -> tuple[list[BookOut], dict]:
+    """List books through the shared Redis page cache (see fetch_books_page for the query)."""
+    params = {
+        "title": title, "author": author, "category": category, "q": q,
+        "page": page, "limit": limit, "cursor": cursor, "count": count,
+    }
+
+    return await cached_list(
+        "books", params, BookOut,
+        lambda: fetch_books_page(title, author, category, page, limit, db, cursor, count, q),
+        db,
+    )
+
+
+
+async def fetch_books_page(
+    title: str, 
+    author: str, 
+    category: str, 
+    page: int, 
+    limit: int, 
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    count: CountMode = "exact",
+    q: Optional[str] = None,
+) -> tuple[list[BookOut], dict]:
+    if q and cursor:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor pagination is not supported for relevance-ranked search (q)"
+        )
+
+    # Keyset pagination: resume after the last id of the previous page instead of OFFSET
+    after_id = parse_id_cursor(cursor)
+
     try:
         query = select(BookModel)
 
@@ -28,21 +138,41 @@ def list_books(
         if author: query = query.filter(BookModel.author.ilike(f"%{author}%"))
         if category: query = query.filter(BookModel.category.ilike(f"%{category}%"))
 
-        total = db.scalar(select(func.count()).select_from(query.subquery()))
+        if q:
+            query, relevance = search_books_query(query, q)
+
+        total, is_estimate = await count_rows(query, BookModel.__tablename__, count, db)
+
+        if q:
+            # Ranked results are paged by offset; ties are broken by id for stable pages
+            page_query = query.order_by(*relevance, BookModel.id).offset((page - 1) * limit).limit(limit)
+        else:
+            page_query = query.order_by(BookModel.id).limit(limit)
+            if after_id is not None:
+                page_query = page_query.where(BookModel.id > after_id)
+            else:
+                page_query = page_query.offset((page - 1) * limit)
 
-        books = db.execute(query.offset((page - 1) * limit).limit(limit)).scalars().all()
+        books = (await db.execute(page_query)).scalars().all()
         books = [BookOut.model_validate(book) for book in books]
 
+        next_cursor = None
+        if not q and len(books) == limit:
+            next_cursor = encode_cursor({"id": books[-1].id})
+
         meta_info = {
-            "page": page,
+            "page": None if cursor else page,
             "limit": limit,
             "total_books": total,
+            "total_is_estimate": is_estimate,
             "fetched_count": len(books),
+            "next_cursor": next_cursor,
             "filters_applied": {
                 k: v for k, v in {
                     "title": title,
                     "author": author,
-                    "category": category
+                    "category": category,
+                    "q": q
                 }.items() if v
             }
         }
@@ -57,9 +187,19 @@ def list_books(
 
 
 
-def get_single_book(
+def book_lookup_predicate(book_id: str) -> tuple:
+    """Return the WHERE clause matching a book ID/ISBN and the key name it matched on."""
+    book_id = book_id.replace("-", "").strip()
+
+    if check_is_isbn(book_id):
+        return BookModel.isbn == book_id, "isbn"
+    return BookModel.id == int(book_id), "id"
+
+
+
+async def get_single_book(
     book_id: str,
-    db: Session,
+    db: AsyncSession,
     as_orm: bool = False
 ) -> Union[BookModel, BookOut]:
     """
@@ -67,7 +207,7 @@ def get_single_book(
     Args:
         book_id (str): The book identifier, either numeric ID or string ISBN.
         as_orm (bool): This decide the result type
-        db (Session): SQLAlchemy database session.
+        db (AsyncSession): SQLAlchemy database session.
 
     Returns: Union[BookModel, BookOut]: Book schema or Book Model.
     Raises:
@@ -78,16 +218,17 @@ def get_single_book(
     try:
 
         book_id = book_id.replace("-", "").strip()
-        
-        if check_is_isbn(book_id):
-            query = select(BookModel).where(BookModel.isbn == book_id)
-            key = "isbn"
-        else:
-            query = select(BookModel).where(BookModel.id == int(book_id))
-            key = "id"
+        predicate, key = book_lookup_predicate(book_id)
+
+        cache_key = (key, book_id if key == "isbn" else int(book_id))
+        if not as_orm and may_read_cache(db):
+            cached = book_cache.get(cache_key)
+            if cached is not MISSING:
+                return cached
 
+        query = select(BookModel).where(predicate)
 
-        book = db.execute(query).scalars().first()
+        book = (await db.execute(query)).scalars().first()
 
         if not book:
             raise HTTPException(
@@ -100,6 +241,10 @@ def get_single_book(
 
         # Convert ORM model to Pydantic schema (BookOut)
         book = BookOut.model_validate(book)
+
+        if may_fill_cache(db):
+            book_cache.set(("id", book.id), book)
+            book_cache.set(("isbn", book.isbn), book)
         return book
 
 
@@ -111,12 +256,12 @@ def get_single_book(
 
 
 
-def add_book(book: Book, db: Session) -> dict:
+async def add_book(book: Book, db: AsyncSession) -> dict:
     """
     Add a new book to the database or update copies if it already exists.
     Args:
         book (BookCreate): Book input schema.
-        db (Session): SQLAlchemy DB session.
+        db (AsyncSession): SQLAlchemy DB session.
 
     Returns: dict: Result indicating whether the book was updated or newly added.
     Raises: HTTPException: On ISBN conflict or DB errors.
@@ -125,7 +270,7 @@ def add_book(book: Book, db: Session) -> dict:
     try:
         # 1. Check if book already exists by ISBN
         query = select(BookModel).where((BookModel.isbn == book.isbn))
-        existing_book = db.execute(query).scalars().first()
+        existing_book = (await db.execute(query)).scalars().first()
 
         if existing_book:
             # 2. If title/author/category match → increase copies
@@ -135,8 +280,9 @@ def add_book(book: Book, db: Session) -> dict:
                 existing_book.category == book.category
             ):
                 existing_book.copies += book.copies
-                db.commit()
-                db.refresh(existing_book)
+                await db.commit()
+                invalidate_book(existing_book.id, existing_book.isbn)
+                await bump_generation("books")
 
                 return {
                     "updated": True,
@@ -152,8 +298,8 @@ def add_book(book: Book, db: Session) -> dict:
         # 4. Create new book entry
         new_book = BookModel(**book.model_dump())
         db.add(new_book)
-        db.commit()
-        db.refresh(new_book)
+        await db.commit()
+        await bump_generation("books")
 
         return {
             "updated": False,
@@ -168,24 +314,24 @@ def add_book(book: Book, db: Session) -> dict:
     
 
 
-def update_book(
+async def update_book(
     book_id: str, 
     book_to_update: Book, 
-    db: Session
+    db: AsyncSession
 ) -> BookOut:
     """
     Update a book by ID or ISBN with new data.
     Args:
         book_id (str): Book ID or ISBN.
         updated (Book): Updated book data.
-        db (Session): Database session.
+        db (AsyncSession): Database session.
 
     Returns: BookOut: Updated book data.
     Raises: HTTPException: If book not found or update fails.
     """
 
     # Get ORM instance for update
-    book_orm = get_single_book(book_id, db, as_orm=True)
+    book_orm = await get_single_book(book_id, db, as_orm=True)
     try:
 
         # Update fields on ORM model
@@ -196,8 +342,9 @@ def update_book(
 
             setattr(book_orm, field, value)
 
-        db.commit()
-        db.refresh(book_orm)
+        await db.commit()
+        invalidate_book(book_orm.id, book_orm.isbn)
+        await bump_generation("books")
 
         # Return Pydantic schema after update
         return BookOut.model_validate(book_orm)
@@ -210,22 +357,24 @@ def update_book(
 
 
 
-def delete_book(book_id: str, db: Session) -> bool:
+async def delete_book(book_id: str, db: AsyncSession) -> bool:
     """
     Delete a book by ID or ISBN.
     Args:
         book_id (str): Book ID or ISBN.
-        db (Session): Database session.
+        db (AsyncSession): Database session.
 
     Returns: bool: True if deleted.
     Raises: HTTPException: If book not found or deletion fails.
     """
     
-    book_orm = get_single_book(book_id, db, as_orm=True)
+    book_orm = await get_single_book(book_id, db, as_orm=True)
 
     try:
-        db.delete(book_orm)
-        db.commit()
+        await db.delete(book_orm)
+        await db.commit()
+        invalidate_book(book_orm.id, book_orm.isbn)
+        await bump_generation("books")
         return True
  
     except Exception as e:
@@ -236,10 +385,10 @@ def delete_book(book_id: str, db: Session) -> bool:
     
 
 
-def issue_book(
+async def issue_book(
     book_id: str,
     payload: IssueBook,
-    db: Session
+    db: AsyncSession
 ) -> BookIssueRecord:
     
     """
@@ -247,63 +396,68 @@ def issue_book(
     Args:
         book_id (str): ID or ISBN of the book to issue.
         payload (IssueBook): Student ID and issue duration.
-        db (Session): Active database session.
+        db (AsyncSession): Active database session.
 
     Returns: BookIssueRecord: Details of the issued book record.
     Raises: HTTPException: If book/student not found, already issued, or DB error occurs.
     """
 
-    print(f"""\n\n=========== [issue_book({book_id} {payload})] ===========\n""")
-
-    # Check if book exists
-    book = get_single_book(book_id, db, as_orm=True)
-    
-
-    # Check for available copies
-    if book.copies <= 0:
-        raise HTTPException(
-            status_code=400, 
-            detail="No available copies for this book."
-        )
-    
     # Check if student exists
-    student = get_student_by_identifier(payload.student_id, db, as_orm=True)
+    student_id = await resolve_student_id(payload.student_id, db)
 
     try:
-
-        # Check if already issued to the student
-        already_issued = db.query(IssuedBookModel).filter(
-            IssuedBookModel.book_id == book.id,
-            IssuedBookModel.student_id == student.id,
-            IssuedBookModel.returned_date.is_(None)
-        ).first()
-        
-        if already_issued:
+        predicate, _ = book_lookup_predicate(book_id)
+
+        # Take one copy in a single conditional UPDATE so concurrent checkouts can't oversell
+        reserved = (await db.execute(
+            update(BookModel)
+            .where(predicate, BookModel.copies > 0)
+            .values(copies=BookModel.copies - 1)
+            .returning(BookModel.id, BookModel.isbn)
+            .execution_options(synchronize_session=False)
+        )).first()
+
+        if reserved is None:
+            # Either the book doesn't exist (404 raised here) or it has no copies left
+            await get_single_book(book_id, db, as_orm=True)
             raise HTTPException(
                 status_code=400, 
-                detail="This book is already issued to the student"
+                detail="No available copies for this book."
             )
 
         issue_date = date.today()
         due_date = issue_date + timedelta(days=payload.duration_days)
 
         issued_book = IssuedBookModel(
-            book_id=book.id,
-            student_id=student.id,
+            book_id=reserved.id,
+            student_id=student_id,
             issue_date=issue_date,
             due_date=due_date,
             returned_date=None,
         )
 
+        # uq_issued_books_open_loan rejects a second open loan of the same book
         db.add(issued_book)
-        book.copies -= 1
-        db.commit()
-
-        db.refresh(issued_book)
+        await db.flush()
+        await db.commit()
+        invalidate_book(reserved.id, reserved.isbn)
+        await bump_generation("books")
 
         return book_issue_record_schema(issued_book)
 
-    
+    except IntegrityError as e:
+        await db.rollback()
+
+        if OPEN_LOAN_CONSTRAINT in str(e.orig):
+            raise HTTPException(
+                status_code=400, 
+                detail="This book is already issued to the student"
+            )
+
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while issuing the book"
+        )
 
     except HTTPException:
         raise
@@ -316,29 +470,334 @@ def issue_book(
 
 
 
-def get_overdue_books(db: Session) -> list[BookIssueRecord]:
+async def resolve_checkout_items(book_ids: list[str], db: AsyncSession) -> list[dict]:
+    """
+    Resolve the books of a multi-book request with a single query.
+    Args:
+        book_ids (list[str]): Book IDs/ISBNs as sent by the client.
+        db (AsyncSession): Active database session.
+
+    Returns: list[dict]: One item per requested book, in request order, with "book_id" (as sent),
+        "id" (resolved primary key or None) and "error" (None while the item is still valid).
+    """
+
+    items = []
+    ids, isbns = set(), set()
+
+    for book_id in book_ids:
+        key = book_id.replace("-", "").strip()
+        item = {"book_id": book_id, "id": None, "error": None}
+
+        if check_is_isbn(key):
+            item["isbn"] = key
+            isbns.add(key)
+        elif key.isdigit():
+            item["pk"] = int(key)
+            ids.add(int(key))
+        else:
+            item["error"] = "Invalid book ID/ISBN"
+
+        items.append(item)
+
+    rows = (await db.execute(
+        select(BookModel.id, BookModel.isbn)
+        .where(or_(BookModel.id.in_(ids), BookModel.isbn.in_(isbns)))
+    )).all()
+    found_ids = {row.id for row in rows}
+    by_isbn = {row.isbn: row.id for row in rows}
+
+    seen = set()
+    for item in items:
+        if item["error"]:
+            continue
+
+        if "isbn" in item:
+            item["id"] = by_isbn.get(item["isbn"])
+        elif item["pk"] in found_ids:
+            item["id"] = item["pk"]
+
+        if item["id"] is None:
+            item["error"] = "Book not found"
+        elif item["id"] in seen:
+            item["error"] = "Book is listed more than once"
+        else:
+            seen.add(item["id"])
+
+    return items
+
+
+
+def checkout_failure(action: str, items: list[dict]) -> HTTPException:
+    """The all-or-nothing error: every failed item with its reason."""
+    reasons = "; ".join(f"{item['book_id']}: {item['error']}" for item in items if item["error"])
+    return HTTPException(status_code=400, detail=f"{action} aborted, no books were changed. {reasons}")
+
+
+
+async def checkout_books(payload: Checkout, db: AsyncSession) -> list[CheckoutItem]:
+    """
+    Issue several books to one student in a single transaction.
+    Args:
+        payload (Checkout): Student, book IDs/ISBNs, duration and atomic flag.
+        db (AsyncSession): Active database session.
+
+    Returns: list[CheckoutItem]: Outcome per requested book, in request order.
+    Raises:
+        HTTPException 404 if the student doesn't exist.
+        HTTPException 400 if atomic and any book can't be issued (nothing is issued).
+        HTTPException 500 on database errors.
+    Notes:
+        One query resolves the books, one checks the student's open loans, one conditional
+        UPDATE takes a copy of every available book and one INSERT creates the loans.
+    """
+
+    student_id = await resolve_student_id(payload.student_id, db)
+
+    try:
+        items = await resolve_checkout_items(payload.book_ids, db)
+        candidates = {item["id"] for item in items if not item["error"]}
+
+        if candidates:
+            on_loan = set((await db.execute(
+                select(IssuedBookModel.book_id).where(
+                    IssuedBookModel.student_id == student_id,
+                    IssuedBookModel.returned_date.is_(None),
+                    IssuedBookModel.book_id.in_(candidates),
+                )
+            )).scalars())
+
+            for item in items:
+                if item["id"] in on_loan:
+                    item["error"] = "This book is already issued to the student"
+
+        if payload.atomic and any(item["error"] for item in items):
+            raise checkout_failure("Checkout", items)
+
+        candidates = {item["id"] for item in items if not item["error"]}
+        reserved = {}
+        if candidates:
+            # Same conditional decrement as issue_book, for all books at once
+            reserved = {
+                row.id: row.isbn
+                for row in await db.execute(
+                    update(BookModel)
+                    .where(BookModel.id.in_(candidates), BookModel.copies > 0)
+                    .values(copies=BookModel.copies - 1)
+                    .returning(BookModel.id, BookModel.isbn)
+                    .execution_options(synchronize_session=False)
+                )
+            }
+
+        for item in items:
+            if not item["error"] and item["id"] not in reserved:
+                item["error"] = "No available copies for this book."
+
+        if payload.atomic and any(item["error"] for item in items):
+            await db.rollback()
+            raise checkout_failure("Checkout", items)
+
+        issue_date = date.today()
+        due_date = issue_date + timedelta(days=payload.duration_days)
+
+        loans = {
+            book_id: IssuedBookModel(
+                book_id=book_id,
+                student_id=student_id,
+                issue_date=issue_date,
+                due_date=due_date,
+                returned_date=None,
+            )
+            for book_id in reserved
+        }
+
+        db.add_all(loans.values())
+        await db.flush()
+        await db.commit()
+
+    except IntegrityError as e:
+        await db.rollback()
+
+        if OPEN_LOAN_CONSTRAINT in str(e.orig):
+            raise HTTPException(
+                status_code=400,
+                detail="One of the books is already issued to the student"
+            )
+
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while issuing the books"
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while issuing the books"
+        )
+
+    if reserved:
+        for book_id, isbn in reserved.items():
+            invalidate_book(book_id, isbn)
+        await bump_generation("books")
+
+    return [
+        CheckoutItem(book_id=item["book_id"], status="failed", error=item["error"])
+        if item["error"] else
+        CheckoutItem(book_id=item["book_id"], status="issued", record=book_issue_record_schema(loans[item["id"]]))
+        for item in items
+    ]
+
+
+
+async def return_books(payload: BulkReturn, db: AsyncSession) -> list[CheckoutItem]:
     """
-    Fetch all books that are currently overdue (not returned and past due date).
+    Return several books of one student in a single transaction.
+    Args:
+        payload (BulkReturn): Student, book IDs/ISBNs and atomic flag.
+        db (AsyncSession): Active database session.
+
+    Returns: list[CheckoutItem]: Outcome per requested book, in request order.
+    Raises:
+        HTTPException 404 if the student doesn't exist.
+        HTTPException 400 if atomic and any book isn't on loan to the student (nothing is returned).
+        HTTPException 500 on database errors.
+    """
+
+    student_id = await resolve_student_id(payload.student_id, db)
+
+    try:
+        items = await resolve_checkout_items(payload.book_ids, db)
+        candidates = {item["id"] for item in items if not item["error"]}
+
+        closed = {}
+        if candidates:
+            # The open-loan unique index guarantees at most one row per book here
+            closed = {
+                loan.book_id: loan
+                for loan in (await db.execute(
+                    update(IssuedBookModel)
+                    .where(
+                        IssuedBookModel.student_id == student_id,
+                        IssuedBookModel.returned_date.is_(None),
+                        IssuedBookModel.book_id.in_(candidates),
+                    )
+                    .values(returned_date=date.today())
+                    .returning(IssuedBookModel)
+                    .execution_options(synchronize_session=False)
+                )).scalars()
+            }
+
+        for item in items:
+            if not item["error"] and item["id"] not in closed:
+                item["error"] = "Issued book not found"
+
+        if payload.atomic and any(item["error"] for item in items):
+            await db.rollback()
+            raise checkout_failure("Return", items)
+
+        restocked = {}
+        if closed:
+            restocked = {
+                row.id: row.isbn
+                for row in await db.execute(
+                    update(BookModel)
+                    .where(BookModel.id.in_(closed))
+                    .values(copies=BookModel.copies + 1)
+                    .returning(BookModel.id, BookModel.isbn)
+                    .execution_options(synchronize_session=False)
+                )
+            }
+
+        await db.commit()
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while returning the books"
+        )
+
+    if restocked:
+        for book_id, isbn in restocked.items():
+            invalidate_book(book_id, isbn)
+        await bump_generation("books")
+
+    return [
+        CheckoutItem(book_id=item["book_id"], status="failed", error=item["error"])
+        if item["error"] else
+        CheckoutItem(book_id=item["book_id"], status="returned", record=book_issue_record_schema(closed[item["id"]]))
+        for item in items
+    ]
+
+
+
+async def get_overdue_books(
+    db: AsyncSession,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    count: CountMode = "none",
+) -> tuple[list[BookIssueRecord], dict]:
+    """
+    Fetch a page of books that are currently overdue (not returned and past due date).
 
     Args:
-        db (Session): Active database session.
+        db (AsyncSession): Active database session.
+        limit (int): Page size.
+        cursor (Optional[str]): Keyset cursor (due_date, id) from the previous page.
+        include (Optional[str]): Comma separated related rows to join-load: "book", "student".
+        count (CountMode): How to compute the total, see count_rows.
 
     Returns:
-        List[BookIssueRecord]: List of overdue issued books with is_overdue = True
+        tuple[list[BookIssueRecord], dict]: Overdue records (oldest due date first) and pagination meta.
 
     Raises:
-        HTTPException: If any unexpected database error occurs.
+        HTTPException: 400 on a bad cursor/include, 500 on unexpected database errors.
     """
 
-    print(f"\n\n\n get_overdue_books() \n\n\n")
+    includes = parse_include(include, allowed=ISSUE_RECORD_INCLUDES)
+    after = parse_keyset_cursor(cursor, due_date=date.fromisoformat, id=strict_int)
+
     try:
-        overdue_books = db.query(IssuedBookModel).filter(
-            IssuedBookModel.returned_date.is_(None),
-            IssuedBookModel.due_date < date.today()
-        ).all()
+        # Served by the partial index ix_issued_books_open_due_date
+        query = select(IssuedBookModel).where(IssuedBookModel.is_overdue)
+
+        total, is_estimate = await count_rows(query, IssuedBookModel.__tablename__, count, db)
+
+        page_query = query.order_by(IssuedBookModel.due_date, IssuedBookModel.id).limit(limit)
+        if after:
+            page_query = page_query.where(
+                tuple_(IssuedBookModel.due_date, IssuedBookModel.id) > (after["due_date"], after["id"])
+            )
 
-        print(overdue_books)
-        return [book_issue_record_schema(book) for book in overdue_books]
+        if "book" in includes:
+            page_query = page_query.options(joinedload(IssuedBookModel.book))
+        if "student" in includes:
+            page_query = page_query.options(joinedload(IssuedBookModel.student))
+
+        overdue_books = (await db.execute(page_query)).scalars().all()
+
+        next_cursor = None
+        if len(overdue_books) == limit:
+            last = overdue_books[-1]
+            next_cursor = encode_cursor({"due_date": last.due_date.isoformat(), "id": last.id})
+
+        meta_info = {
+            "limit": limit,
+            "total_records": total,
+            "total_is_estimate": is_estimate,
+            "fetched_count": len(overdue_books),
+            "next_cursor": next_cursor,
+            "include": sorted(includes),
+        }
+
+        return [book_issue_record_schema(book, includes) for book in overdue_books], meta_info
 
     except Exception as e:
         raise HTTPException(
@@ -347,4 +806,207 @@ def get_overdue_books(db: Session) -> list[BookIssueRecord]:
         )
 
 
-# =====================================================================
\ No newline at end of file
+
+def resolve_import_format(content_type: Optional[str], format: Optional[ImportFormat]) -> ImportFormat:
+    """Pick the bulk import format from an explicit ?format= or the request Content-Type."""
+    if format:
+        return format
+
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in IMPORT_CONTENT_TYPES:
+        return IMPORT_CONTENT_TYPES[media_type]
+
+    raise HTTPException(
+        status_code=415,
+        detail="Send the body as application/x-ndjson or text/csv, or pass ?format=ndjson|csv"
+    )
+
+
+
+def validate_import_row(record: dict) -> Book:
+    """Validate one uploaded row against the Book schema and the books column sizes."""
+    book = Book.model_validate(record)
+
+    for field in ("title", "author", "isbn", "category"):
+        max_length = BookModel.__table__.c[field].type.length
+        if len(getattr(book, field)) > max_length:
+            raise ValueError(f"{field}: must be at most {max_length} characters")
+
+    return book
+
+
+
+async def bulk_import_books(
+    chunks: AsyncIterator[bytes],
+    format: ImportFormat,
+    db: AsyncSession
+) -> BookImportSummary:
+    """
+    Import books from a streamed NDJSON/CSV body with add_book's merge rules, applied set-wise.
+    Args:
+        chunks (AsyncIterator[bytes]): Request body stream.
+        format (ImportFormat): "ndjson" or "csv" (header row required).
+        db (AsyncSession): Active database session.
+
+    Returns: BookImportSummary: Row counts and the first rejected rows.
+    Raises:
+        HTTPException 400 if the body can't be parsed (nothing is imported).
+        HTTPException 500 on database errors.
+    Notes:
+        Valid rows are COPY'd in batches into a temporary staging table, so memory stays
+        bounded by BULK_IMPORT_BATCH_SIZE. A row conflicts when its ISBN belongs to a book
+        (already stored, or first seen earlier in the upload) with a different title, author
+        or category; every other row adds its copies, as repeated add_book calls would.
+        The whole import runs in one transaction.
+    """
+
+    parse_rows = iter_ndjson_rows if format == "ndjson" else iter_csv_rows
+    error_limit = settings.BULK_IMPORT_ERROR_LIMIT
+
+    rows_received = 0
+    rows_invalid = 0
+    errors: list[BookImportError] = []
+
+    try:
+        await db.execute(text("""
+            CREATE TEMPORARY TABLE book_import (
+                row_number integer NOT NULL,
+                title      text    NOT NULL,
+                author     text    NOT NULL,
+                isbn       text    NOT NULL,
+                category   text    NOT NULL,
+                copies     integer NOT NULL,
+                conflict   boolean NOT NULL DEFAULT false
+            ) ON COMMIT DROP
+        """))
+
+        # COPY goes through the asyncpg connection behind the session's transaction
+        connection = await (await db.connection()).get_raw_connection()
+        pg = connection.driver_connection
+
+        batch = []
+        async for row, record, error in parse_rows(chunks):
+            rows_received += 1
+
+            if error is None:
+                try:
+                    book = validate_import_row(record)
+                except ValidationError as e:
+                    first = e.errors()[0]
+                    error = f"{'.'.join(map(str, first['loc']))}: {first['msg']}"
+                except ValueError as e:
+                    error = str(e)
+
+            if error is not None:
+                rows_invalid += 1
+                if len(errors) < error_limit:
+                    isbn = record.get("isbn") if record else None
+                    errors.append(BookImportError(row=row, isbn=isbn if isinstance(isbn, str) else None, error=error))
+                continue
+
+            batch.append((row, book.title, book.author, book.isbn, book.category, book.copies))
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                await pg.copy_records_to_table("book_import", records=batch, columns=IMPORT_COLUMNS)
+                batch = []
+
+        if batch:
+            await pg.copy_records_to_table("book_import", records=batch, columns=IMPORT_COLUMNS)
+
+        await db.execute(text("CREATE INDEX ON book_import (isbn, row_number)"))
+        await db.execute(text("ANALYZE book_import"))
+
+        # The stored book, or else the first staged row, fixes each ISBN's metadata
+        await db.execute(text("""
+            WITH canonical AS (
+                SELECT DISTINCT ON (s.isbn)
+                    s.isbn,
+                    coalesce(b.title, s.title)       AS title,
+                    coalesce(b.author, s.author)     AS author,
+                    coalesce(b.category, s.category) AS category
+                FROM book_import s
+                LEFT JOIN books b ON b.isbn = s.isbn
+                ORDER BY s.isbn, s.row_number
+            )
+            UPDATE book_import s SET conflict = true
+            FROM canonical c
+            WHERE s.isbn = c.isbn
+              AND (s.title, s.author, s.category) IS DISTINCT FROM (c.title, c.author, c.category)
+        """))
+
+        # Upsert one row per ISBN; the WHERE guard turns a book inserted concurrently
+        # with different metadata into a conflict instead of merging into it
+        merged = (await db.execute(text("""
+            WITH merged AS (
+                INSERT INTO books (title, author, isbn, category, copies)
+                SELECT title, author, isbn, category, sum(copies)
+                FROM book_import
+                WHERE NOT conflict
+                GROUP BY isbn, title, author, category
+                ON CONFLICT (isbn) DO UPDATE
+                    SET copies = coalesce(books.copies, 0) + EXCLUDED.copies,
+                        updated_at = now()
+                    WHERE (books.title, books.author, books.category)
+                        = (EXCLUDED.title, EXCLUDED.author, EXCLUDED.category)
+                RETURNING books.isbn, (xmax = 0) AS inserted
+            ),
+            skipped AS (
+                UPDATE book_import s SET conflict = true
+                WHERE NOT s.conflict
+                  AND NOT EXISTS (SELECT 1 FROM merged m WHERE m.isbn = s.isbn)
+                RETURNING 1
+            )
+            -- The statement's snapshot still holds the metadata conflicts flagged above;
+            -- skipped holds the rows it flags itself
+            SELECT
+                count(*) FILTER (WHERE inserted)     AS books_created,
+                count(*) FILTER (WHERE NOT inserted) AS books_updated,
+                (SELECT count(*) FROM book_import WHERE conflict)
+                    + (SELECT count(*) FROM skipped) AS rows_conflicting
+            FROM merged
+        """))).one()
+
+        # Only samples for the error list; the total comes from the upsert above
+        conflicts = (await db.execute(text("""
+            SELECT row_number, isbn
+            FROM book_import
+            WHERE conflict
+            ORDER BY row_number
+            LIMIT :limit
+        """), {"limit": error_limit})).all()
+
+        await db.commit()
+
+    except StreamFormatError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Invalid {format} body: {e}")
+
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="An error occurred while importing books")
+
+    rows_conflicting = merged.rows_conflicting
+
+    if merged.books_created or merged.books_updated:
+        # Too many ISBNs to invalidate one by one; lookups refill from the database
+        book_cache.clear()
+        await bump_generation("books")
+
+    errors += [
+        BookImportError(row=c.row_number, isbn=c.isbn, error="ISBN already belongs to a different book")
+        for c in conflicts
+    ]
+    errors.sort(key=lambda e: e.row)
+
+    return BookImportSummary(
+        rows_received=rows_received,
+        rows_applied=rows_received - rows_invalid - rows_conflicting,
+        rows_invalid=rows_invalid,
+        rows_conflicting=rows_conflicting,
+        books_created=merged.books_created,
+        books_updated=merged.books_updated,
+        errors=errors[:error_limit],
+        errors_truncated=rows_invalid + rows_conflicting > error_limit,
+    )
+
+
+# =====================================================================
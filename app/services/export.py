@@ -0,0 +1,81 @@
+from sqlalchemy import select
+
+from typing import AsyncIterator, Callable, Literal, Optional
+import logging
+import time
+
+from app.database import get_async_sessionmaker
+from app.database.config import settings
+from app.models import BookModel, IssuedBookModel, StudentModel
+from app.utils.streaming import csv_chunk, ndjson_chunk
+
+
+logger = logging.getLogger(__name__)
+
+ExportTable = Literal["books", "students", "issued-books"]
+ExportFormat = Literal["ndjson", "csv"]
+
+# Plain table columns, in table order (the generated search_vector is not exported)
+EXPORT_COLUMNS = {
+    "books": [c for c in BookModel.__table__.c if c.name != "search_vector"],
+    "students": list(StudentModel.__table__.c),
+    "issued-books": list(IssuedBookModel.__table__.c),
+}
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+
+async def stream_export(
+    table: ExportTable,
+    format: ExportFormat,
+    on_rows: Optional[Callable[[int], None]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a whole table as NDJSON or CSV in id order, one chunk per EXPORT_CHUNK_SIZE rows.
+    Args:
+        table (ExportTable): "books", "students" or "issued-books".
+        format (ExportFormat): "ndjson" or "csv" (with a header row).
+        on_rows (Optional[Callable[[int], None]]): Called with the row count of every chunk.
+
+    Returns: AsyncIterator[bytes]: Encoded chunks.
+    Notes:
+        Rows come from a server-side cursor (stream + yield_per), so memory stays bounded by one
+        chunk whatever the table size. The generator opens its own session: a StreamingResponse
+        body outlives the request's yield dependencies, which would close get_async_db's session.
+    """
+
+    columns = EXPORT_COLUMNS[table]
+    query = (
+        select(*columns)
+        .order_by(columns[0])
+        .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+    )
+
+    started = time.perf_counter()
+    total = 0
+
+    async with get_async_sessionmaker()() as db:
+        result = await db.stream(query)
+
+        if format == "csv":
+            yield csv_chunk([[column.name for column in columns]])
+
+        async for rows in result.partitions():
+            if format == "csv":
+                yield csv_chunk(rows)
+            else:
+                yield ndjson_chunk(row._mapping for row in rows)
+
+            total += len(rows)
+            if on_rows:
+                on_rows(len(rows))
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Exported %d %s rows as %s in %.2fs (%.0f rows/sec)",
+        total, table, format, elapsed, total / elapsed if elapsed else 0.0
+    )
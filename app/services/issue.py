@@ -0,0 +1,169 @@
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import joinedload
+
+from typing import Literal, Optional
+from datetime import date
+
+from app.models import IssuedBookModel
+from app.schemas import BookIssueRecord
+from app.services.book import ISSUE_RECORD_INCLUDES, get_single_book
+from app.services.pagination import CountMode, count_rows, parse_include, parse_keyset_cursor, strict_int
+from app.services.student import LoanStatus, book_issue_record_schema, resolve_student_id
+from app.utils.utils import encode_cursor
+
+
+IssueSort = Literal["-issue_date", "issue_date", "-due_date", "due_date"]
+
+# Sort key -> (date column, descending); id breaks ties, see the ix_issued_books_*_date indexes
+ISSUE_SORTS = {
+    "-issue_date": (IssuedBookModel.issue_date, True),
+    "issue_date": (IssuedBookModel.issue_date, False),
+    "-due_date": (IssuedBookModel.due_date, True),
+    "due_date": (IssuedBookModel.due_date, False),
+}
+
+
+
+def date_range(column, start: Optional[date], end: Optional[date], name: str) -> list:
+    """Inclusive range conditions on a date column, raising 400 when start is after end."""
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail=f"{name}_from must not be after {name}_to")
+
+    conditions = []
+    if start: conditions.append(column >= start)
+    if end: conditions.append(column <= end)
+    return conditions
+
+
+
+async def list_issues(
+    db: AsyncSession,
+    book: Optional[str] = None,
+    student: Optional[str] = None,
+    status: Optional[LoanStatus] = None,
+    issued_from: Optional[date] = None,
+    issued_to: Optional[date] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    sort: IssueSort = "-issue_date",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    count: CountMode = "none",
+) -> tuple[list[BookIssueRecord], dict]:
+    """
+    Fetch a page of loan records matching the given filters, all evaluated in SQL.
+    Args:
+        db (AsyncSession): Active database session.
+        book (Optional[str]): Book ID/ISBN.
+        student (Optional[str]): Student name, roll number or phone.
+        status (Optional[LoanStatus]): "active", "returned" or "overdue" (IssuedBookModel.is_overdue); all if None.
+        issued_from, issued_to (Optional[date]): Inclusive issue date range.
+        due_from, due_to (Optional[date]): Inclusive due date range.
+        sort (IssueSort): Date to order by, "-" for newest first; ties are broken by id.
+        limit (int): Page size.
+        cursor (Optional[str]): Keyset cursor (sort, date, id) from the previous page.
+        include (Optional[str]): Comma separated related rows to join-load: "book", "student".
+        count (CountMode): How to compute the total, see count_rows.
+
+    Returns: tuple[list[BookIssueRecord], dict]: Loan records and pagination meta.
+    Raises:
+        HTTPException 404 if the book or student doesn't exist.
+        HTTPException 400 on a bad cursor/include or an inverted date range.
+        HTTPException 500 on database errors.
+    """
+
+    includes = parse_include(include, allowed=ISSUE_RECORD_INCLUDES)
+    after = parse_keyset_cursor(cursor, sort=str, date=date.fromisoformat, id=strict_int)
+    if after and after["sort"] != sort:
+        raise HTTPException(status_code=400, detail="Pagination cursor was issued for a different sort")
+
+    conditions = [
+        *date_range(IssuedBookModel.issue_date, issued_from, issued_to, "issued"),
+        *date_range(IssuedBookModel.due_date, due_from, due_to, "due"),
+    ]
+
+    filters = {}
+    if book:
+        filters["book_id"] = (await get_single_book(book, db)).id
+        conditions.append(IssuedBookModel.book_id == filters["book_id"])
+    if student:
+        filters["student_id"] = await resolve_student_id(student, db)
+        conditions.append(IssuedBookModel.student_id == filters["student_id"])
+
+    if status == "active":
+        conditions.append(IssuedBookModel.returned_date.is_(None))
+    elif status == "returned":
+        conditions.append(IssuedBookModel.returned_date.is_not(None))
+    elif status == "overdue":
+        conditions.append(IssuedBookModel.is_overdue)
+
+    try:
+        query = select(IssuedBookModel)
+        if conditions:
+            query = query.where(*conditions)
+
+        total, is_estimate = await count_rows(query, IssuedBookModel.__tablename__, count, db)
+
+        column, descending = ISSUE_SORTS[sort]
+        page_query = query.add_columns(IssuedBookModel.is_overdue.label("is_overdue")).limit(limit)
+
+        if descending:
+            page_query = page_query.order_by(column.desc(), IssuedBookModel.id.desc())
+        else:
+            page_query = page_query.order_by(column, IssuedBookModel.id)
+
+        if after:
+            position = tuple_(column, IssuedBookModel.id)
+            last = (after["date"], after["id"])
+            page_query = page_query.where(position < last if descending else position > last)
+
+        if "book" in includes:
+            page_query = page_query.options(joinedload(IssuedBookModel.book))
+        if "student" in includes:
+            page_query = page_query.options(joinedload(IssuedBookModel.student))
+
+        rows = (await db.execute(page_query)).all()
+
+        next_cursor = None
+        if len(rows) == limit:
+            last_loan = rows[-1][0]
+            next_cursor = encode_cursor({
+                "sort": sort,
+                "date": getattr(last_loan, column.key).isoformat(),
+                "id": last_loan.id,
+            })
+
+        filters.update({
+            k: v for k, v in {
+                "status": status,
+                "issued_from": issued_from,
+                "issued_to": issued_to,
+                "due_from": due_from,
+                "due_to": due_to,
+            }.items() if v is not None
+        })
+
+        meta_info = {
+            "limit": limit,
+            "sort": sort,
+            "total_records": total,
+            "total_is_estimate": is_estimate,
+            "fetched_count": len(rows),
+            "next_cursor": next_cursor,
+            "filters_applied": {k: v.isoformat() if isinstance(v, date) else v for k, v in filters.items()},
+            "include": sorted(includes),
+        }
+
+        return [book_issue_record_schema(loan, includes, is_overdue) for loan, is_overdue in rows], meta_info
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while fetching loan records"
+        )
+
+
+# =====================================================================
@@ -1,5 +1,5 @@
 from datetime import date, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.models import IssuedBookModel
 
 
@@ -7,8 +7,10 @@ def get_due_soon_books(db: Session):
     today = date.today()
     cutoff = today + timedelta(days=5)
 
+    # Load student and book with the loans; the reminder loop reads both for every row
     return (
         db.query(IssuedBookModel)
+        .options(joinedload(IssuedBookModel.student), joinedload(IssuedBookModel.book))
         .filter(
             IssuedBookModel.returned_date.is_(None), IssuedBookModel.due_date <= cutoff
         )
@@ -0,0 +1,99 @@
+from fastapi import HTTPException
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import Any, Callable, Literal, Optional
+
+from app.utils.utils import decode_cursor
+
+
+CountMode = Literal["exact", "estimate", "none"]
+
+
+async def count_rows(
+    query: Select,
+    table_name: str,
+    mode: CountMode,
+    db: AsyncSession
+) -> tuple[Optional[int], bool]:
+    """
+    Count the rows matched by a list query.
+    Args:
+        query (Select): The filtered (unpaginated) list query.
+        table_name (str): Table the query reads from, used for the estimate.
+        mode (CountMode): "exact" runs count(), "estimate" reads pg_class.reltuples
+            for unfiltered queries, "none" skips counting.
+        db (AsyncSession): Active database session.
+
+    Returns: tuple[Optional[int], bool]: The total (None when skipped) and whether it is an estimate.
+    """
+
+    if mode == "none":
+        return None, False
+
+    # reltuples only describes the whole table, so filtered queries still count exactly
+    if mode == "estimate" and query.whereclause is None:
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": table_name}
+        )
+
+        # reltuples is -1 until the table has been vacuumed/analyzed
+        if estimate is not None and estimate >= 0:
+            return estimate, True
+
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    return total, False
+
+
+
+def parse_keyset_cursor(cursor: Optional[str], **fields: Callable[[Any], Any]) -> Optional[dict]:
+    """
+    Decode a keyset cursor and convert each of its values.
+    Args:
+        cursor (Optional[str]): Cursor from a previous page's meta.next_cursor.
+        **fields: Expected cursor keys mapped to a converter, e.g. ``id=int``.
+
+    Returns: Optional[dict]: Converted cursor values, or None when no cursor was given.
+    Raises: HTTPException: 400 if the cursor is malformed.
+    """
+
+    if not cursor:
+        return None
+
+    try:
+        values = decode_cursor(cursor)
+        return {name: convert(values[name]) for name, convert in fields.items()}
+
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+
+def parse_id_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decode an ``{"id": ...}`` keyset cursor, raising 400 when it is malformed."""
+    values = parse_keyset_cursor(cursor, id=strict_int)
+    return values["id"] if values else None
+
+
+
+def strict_int(value: Any) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError("cursor value must be an integer")
+    return value
+
+
+
+def parse_include(include: Optional[str], allowed: set[str]) -> set[str]:
+    """Parse a comma separated ``include=`` value, raising 400 for unknown relations."""
+    if not include:
+        return set()
+
+    requested = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = requested - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include value(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(sorted(allowed))}"
+        )
+    return requested
@@ -0,0 +1,217 @@
+from datetime import date, timedelta
+from itertools import accumulate
+from sqlalchemy import text
+from typing import Iterator
+
+import logging
+import random
+import time
+
+from app.database import get_async_sessionmaker
+from app.services.stats import reconcile_stats
+
+
+logger = logging.getLogger(__name__)
+
+SEED_BATCH_SIZE = 50_000
+
+# Popularity follows a Zipf-like curve: weight(rank) = 1 / rank ** exponent
+BOOK_POPULARITY_EXPONENT = 1.1
+STUDENT_ACTIVITY_EXPONENT = 0.8
+
+LOAN_DAYS = 14
+HISTORY_DAYS = 730
+
+CATEGORIES = [
+    "Programming", "Mathematics", "Physics", "Chemistry", "Biology", "History", "Literature",
+    "Economics", "Philosophy", "Psychology", "Engineering", "Statistics", "Art", "Music",
+    "Law", "Medicine", "Geography", "Linguistics", "Sociology", "Astronomy",
+]
+DEPARTMENTS = ["CS", "ECE", "ME", "CE", "EE", "IT", "CHE", "BT", "MATH", "PHY"]
+TITLE_WORDS = [
+    "Advanced", "Applied", "Modern", "Practical", "Introduction", "Principles", "Foundations",
+    "Theory", "Systems", "Design", "Analysis", "Methods", "Essentials", "Handbook", "Patterns",
+    "Structures", "Algorithms", "Networks", "Dynamics", "Concepts", "Computing", "Data",
+]
+FIRST_NAMES = [
+    "Aarav", "Diya", "Ishaan", "Meera", "Kabir", "Ananya", "Rohan", "Saanvi", "Arjun", "Priya",
+    "Vikram", "Neha", "Aditya", "Kavya", "Rahul", "Sneha", "Karan", "Pooja", "Nikhil", "Riya",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Iyer", "Nair", "Gupta", "Reddy", "Patel", "Singh", "Khan", "Das",
+    "Mehta", "Rao", "Joshi", "Bose", "Kulkarni", "Pillai", "Chopra", "Malhotra", "Sen", "Ghosh",
+]
+
+SEEDED_TABLES = ("issued_books", "students", "books")
+
+
+def skewed_weights(n: int, exponent: float, rng: random.Random) -> list[float]:
+    """Cumulative Zipf weights over ids 1..n, with ranks shuffled so popular ids are scattered."""
+    ranks = list(range(1, n + 1))
+    rng.shuffle(ranks)
+    return list(accumulate(1 / rank ** exponent for rank in ranks))
+
+
+
+def book_rows(count: int, rng: random.Random) -> Iterator[tuple]:
+    # Category sizes are skewed too, so category filters see very different selectivities
+    category_weights = list(accumulate(1 / rank for rank in range(1, len(CATEGORIES) + 1)))
+
+    for book_id in range(1, count + 1):
+        title = " ".join(rng.sample(TITLE_WORDS, 3)) + f" {book_id}"
+        author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        category = rng.choices(CATEGORIES, cum_weights=category_weights)[0]
+        yield book_id, title, author, f"{9780000000000 + book_id}", category, rng.randint(0, 10)
+
+
+
+def student_rows(count: int, rng: random.Random) -> Iterator[tuple]:
+    for student_id in range(1, count + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        yield (
+            student_id,
+            name,
+            f"R{student_id:08d}",
+            rng.choice(DEPARTMENTS),
+            rng.randint(1, 8),
+            f"9{student_id:09d}",
+            f"student{student_id}@example.edu",
+        )
+
+
+
+def loan_rows(count: int, books: int, students: int, active_ratio: float, rng: random.Random) -> Iterator[list[tuple]]:
+    """
+    Loan batches with skewed book popularity and student activity.
+
+    Returned loans are spread over the last HISTORY_DAYS; open loans were issued within the
+    last 2 * LOAN_DAYS, so roughly half of them are overdue. A (book, student) pair has at
+    most one open loan, as the open-loan unique index requires.
+    """
+
+    today = date.today()
+    book_weights = skewed_weights(books, BOOK_POPULARITY_EXPONENT, rng)
+    student_weights = skewed_weights(students, STUDENT_ACTIVITY_EXPONENT, rng)
+    book_ids = range(1, books + 1)
+    student_ids = range(1, students + 1)
+    open_pairs = set()
+
+    loan_id = 0
+    while loan_id < count:
+        size = min(SEED_BATCH_SIZE, count - loan_id)
+        picked_books = rng.choices(book_ids, cum_weights=book_weights, k=size)
+        picked_students = rng.choices(student_ids, cum_weights=student_weights, k=size)
+        batch = []
+
+        for book_id, student_id in zip(picked_books, picked_students):
+            loan_id += 1
+
+            if rng.random() < active_ratio and (book_id, student_id) not in open_pairs:
+                open_pairs.add((book_id, student_id))
+                issue_date = today - timedelta(days=rng.randint(0, 2 * LOAN_DAYS))
+                returned_date = None
+            else:
+                issue_date = today - timedelta(days=rng.randint(LOAN_DAYS, HISTORY_DAYS))
+                returned_date = min(issue_date + timedelta(days=rng.randint(1, 2 * LOAN_DAYS)), today)
+
+            batch.append((loan_id, book_id, student_id, issue_date, issue_date + timedelta(days=LOAN_DAYS), returned_date))
+
+        yield batch
+
+
+
+def batched(rows: Iterator[tuple], size: int = SEED_BATCH_SIZE) -> Iterator[list[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+
+async def seed_dataset(
+    books: int,
+    students: int,
+    loans: int,
+    seed: int = 42,
+    active_ratio: float = 0.05,
+    truncate: bool = False,
+) -> dict:
+    """
+    Fill an empty database with a reproducible synthetic library for benchmarking.
+
+    Rows are generated from `seed` (same arguments, same data) and loaded with COPY.
+    Args:
+        books (int): Number of books.
+        students (int): Number of students.
+        loans (int): Number of issued_books rows, skewed towards popular books and active students.
+        seed (int): Random seed.
+        active_ratio (float): Share of loans that are still open.
+        truncate (bool): Empty books, students and issued_books first instead of refusing.
+
+    Returns: dict: Rows written per table and the elapsed seconds.
+    Raises: ValueError: If the tables already hold data and truncate is False.
+    """
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    async with get_async_sessionmaker()() as db:
+        if truncate:
+            await db.execute(text(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY CASCADE"))
+        else:
+            for table in SEEDED_TABLES:
+                if (await db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})"))).scalar():
+                    raise ValueError(f"Table {table} is not empty; pass truncate=True to replace its rows")
+
+        # COPY goes through the asyncpg connection behind the session's transaction
+        connection = await (await db.connection()).get_raw_connection()
+        pg = connection.driver_connection
+
+        for batch in batched(book_rows(books, rng)):
+            await pg.copy_records_to_table(
+                "books", records=batch, columns=("id", "title", "author", "isbn", "category", "copies")
+            )
+        logger.info("Seeded %d books", books)
+
+        for batch in batched(student_rows(students, rng)):
+            await pg.copy_records_to_table(
+                "students", records=batch, columns=("id", "name", "roll_number", "department", "semester", "phone", "email")
+            )
+        logger.info("Seeded %d students", students)
+
+        if loans and books and students:
+            for batch in loan_rows(loans, books, students, active_ratio, rng):
+                await pg.copy_records_to_table(
+                    "issued_books", records=batch,
+                    columns=("id", "book_id", "student_id", "issue_date", "due_date", "returned_date"),
+                )
+            logger.info("Seeded %d loans", loans)
+
+        # Ids were written explicitly; move the sequences past them
+        for table in SEEDED_TABLES:
+            await db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 0) + 1, false) FROM {table}"
+            ))
+
+        # TRUNCATE bypasses the summary-table triggers, so rebuild them from the new rows
+        await db.run_sync(reconcile_stats)
+        await db.commit()
+
+    async with get_async_sessionmaker()() as db:
+        for table in SEEDED_TABLES:
+            await db.execute(text(f"ANALYZE {table}"))
+        await db.commit()
+
+    return {
+        "books": books,
+        "students": students,
+        "issued_books": loans if books and students else 0,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+# =====================================================================
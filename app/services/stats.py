@@ -0,0 +1,241 @@
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import Select, func, or_, select, text, union_all
+
+from datetime import date
+import logging
+
+from app.models import CategoryStatsDeltaModel, CategoryStatsModel, LoanDueStatsDeltaModel, LoanDueStatsModel
+from app.schemas import CategoryStats, LibraryStats
+
+
+logger = logging.getLogger(__name__)
+
+# Rebuild queries; the circulation stats migration backfills with the same SQL
+REBUILD_CATEGORY_STATS = text("""
+    INSERT INTO category_stats (category, books, copies_available, active_loans, total_loans)
+    SELECT
+        b.category,
+        count(*),
+        coalesce(sum(b.copies), 0),
+        coalesce(sum(l.active), 0),
+        coalesce(sum(l.total), 0)
+    FROM books b
+    LEFT JOIN (
+        SELECT book_id, count(*) FILTER (WHERE returned_date IS NULL) AS active, count(*) AS total
+        FROM issued_books
+        GROUP BY book_id
+    ) l ON l.book_id = b.id
+    GROUP BY b.category
+""")
+
+REBUILD_LOAN_DUE_STATS = text("""
+    INSERT INTO loan_due_stats (due_date, active_loans)
+    SELECT due_date, count(*)
+    FROM issued_books
+    WHERE returned_date IS NULL
+    GROUP BY due_date
+""")
+
+# Move pending deltas into the summary rows; the stats delta tables migration folds with the
+# same SQL. DELETE ... RETURNING only takes deltas committed before it started, so
+# concurrent trigger inserts are left for the next run.
+FOLD_CATEGORY_DELTAS = text("""
+    WITH folded AS (
+        DELETE FROM category_stats_deltas
+        RETURNING category, books, copies_available, active_loans, total_loans
+    )
+    INSERT INTO category_stats AS s (category, books, copies_available, active_loans, total_loans)
+    SELECT category, sum(books), sum(copies_available), sum(active_loans), sum(total_loans)
+    FROM folded
+    GROUP BY category
+    ORDER BY category
+    ON CONFLICT (category) DO UPDATE SET
+        books = s.books + EXCLUDED.books,
+        copies_available = s.copies_available + EXCLUDED.copies_available,
+        active_loans = s.active_loans + EXCLUDED.active_loans,
+        total_loans = s.total_loans + EXCLUDED.total_loans
+""")
+
+FOLD_LOAN_DUE_DELTAS = text("""
+    WITH folded AS (
+        DELETE FROM loan_due_stats_deltas
+        RETURNING due_date, active_loans
+    )
+    INSERT INTO loan_due_stats AS s (due_date, active_loans)
+    SELECT due_date, sum(active_loans)
+    FROM folded
+    GROUP BY due_date
+    ORDER BY due_date
+    ON CONFLICT (due_date) DO UPDATE SET
+        active_loans = s.active_loans + EXCLUDED.active_loans
+""")
+
+STATS_COLUMNS = ("books", "copies_available", "active_loans", "total_loans")
+
+
+
+def category_totals() -> Select:
+    """Per-category totals: the folded summary row plus that category's pending deltas."""
+    rows = union_all(
+        select(CategoryStatsModel.category, *(getattr(CategoryStatsModel, c) for c in STATS_COLUMNS)),
+        select(CategoryStatsDeltaModel.category, *(getattr(CategoryStatsDeltaModel, c) for c in STATS_COLUMNS)),
+    ).subquery()
+
+    return (
+        select(rows.c.category, *(func.sum(rows.c[c]).label(c) for c in STATS_COLUMNS))
+        .group_by(rows.c.category)
+    )
+
+
+def due_date_totals() -> Select:
+    """Open loans per due date, summary plus pending deltas."""
+    rows = union_all(
+        select(LoanDueStatsModel.due_date, LoanDueStatsModel.active_loans),
+        select(LoanDueStatsDeltaModel.due_date, LoanDueStatsDeltaModel.active_loans),
+    ).subquery()
+
+    return (
+        select(rows.c.due_date, func.sum(rows.c.active_loans).label("active_loans"))
+        .group_by(rows.c.due_date)
+    )
+
+
+
+async def get_stats(db: AsyncSession) -> LibraryStats:
+    """
+    Read inventory and circulation totals from the summary tables plus their pending deltas.
+    Args:
+        db (AsyncSession): Active database session.
+
+    Returns: LibraryStats: Totals and the per-category breakdown.
+    Raises: HTTPException: 500 on database errors.
+    Notes:
+        Cost depends on the number of categories, of distinct open-loan due dates and of
+        deltas not yet folded (fold_stats_deltas keeps those few), not on the size of
+        books or issued_books.
+    """
+
+    try:
+        totals = category_totals()
+        categories = (await db.execute(
+            totals
+            .having(or_(totals.selected_columns.books > 0, totals.selected_columns.total_loans > 0))
+            .order_by(totals.selected_columns.category)
+        )).all()
+
+        due_dates = due_date_totals().subquery()
+        overdue_loans = (await db.execute(
+            select(func.coalesce(func.sum(due_dates.c.active_loans), 0))
+            .where(due_dates.c.due_date < date.today())
+        )).scalar_one()
+
+        categories = [CategoryStats.model_validate(category) for category in categories]
+
+        return LibraryStats(
+            books=sum(c.books for c in categories),
+            copies_available=sum(c.copies_available for c in categories),
+            active_loans=sum(c.active_loans for c in categories),
+            overdue_loans=overdue_loans,
+            total_loans=sum(c.total_loans for c in categories),
+            categories=categories,
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while fetching library stats"
+        )
+
+
+
+def fold_stats_deltas(db: Session) -> dict:
+    """
+    Add the pending trigger deltas into the summary rows and delete them.
+    Args:
+        db (Session): Sync database session (Celery worker / CLI).
+
+    Returns: dict: Number of category and due-date summary rows updated.
+    Notes:
+        Only this job and reconcile_stats write the summary rows, so checkouts never wait
+        on them. Readers see either the deltas or the folded totals, never both.
+    """
+
+    try:
+        categories = db.execute(FOLD_CATEGORY_DELTAS).rowcount
+        due_dates = db.execute(FOLD_LOAN_DUE_DELTAS).rowcount
+        # Due dates whose loans all came back
+        db.execute(text("DELETE FROM loan_due_stats WHERE active_loans = 0"))
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"categories": categories, "due_dates": due_dates}
+
+
+
+def reconcile_stats(db: Session) -> dict:
+    """
+    Rebuild the summary tables from books/issued_books, dropping the pending deltas,
+    and report any drift that was fixed.
+    Args:
+        db (Session): Sync database session (Celery worker / CLI).
+
+    Returns: dict: Number of category and due-date rows that differed, with the differences.
+    Notes:
+        Writers to books and issued_books are blocked (SHARE lock) for the duration of the
+        rebuild, so no trigger delta can interleave with it. Readers are not blocked.
+    """
+
+    try:
+        db.execute(text("LOCK TABLE books, issued_books IN SHARE MODE"))
+
+        due_totals = due_date_totals()
+        snapshot_due_dates = due_totals.having(due_totals.selected_columns.active_loans != 0)
+
+        before = {row[0]: tuple(row[1:]) for row in db.execute(category_totals())}
+        before_due = {row[0]: row[1] for row in db.execute(snapshot_due_dates)}
+
+        db.execute(text("DELETE FROM category_stats_deltas"))
+        db.execute(text("DELETE FROM category_stats"))
+        db.execute(REBUILD_CATEGORY_STATS)
+        db.execute(text("DELETE FROM loan_due_stats_deltas"))
+        db.execute(text("DELETE FROM loan_due_stats"))
+        db.execute(REBUILD_LOAN_DUE_STATS)
+
+        after = {row[0]: tuple(row[1:]) for row in db.execute(category_totals())}
+        after_due = {row[0]: row[1] for row in db.execute(snapshot_due_dates)}
+
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    zero = (0, 0, 0, 0)
+    drift = {
+        category: {"stored": before.get(category, zero), "actual": after.get(category, zero)}
+        for category in before.keys() | after.keys()
+        if before.get(category, zero) != after.get(category, zero)
+    }
+    due_drift = {
+        due_date.isoformat(): {"stored": before_due.get(due_date, 0), "actual": after_due.get(due_date, 0)}
+        for due_date in before_due.keys() | after_due.keys()
+        if before_due.get(due_date, 0) != after_due.get(due_date, 0)
+    }
+
+    if drift or due_drift:
+        logger.warning("Stats drift fixed: %d categories, %d due dates", len(drift), len(due_drift))
+
+    return {
+        "categories_fixed": len(drift),
+        "due_dates_fixed": len(due_drift),
+        "categories": drift,
+        "due_dates": due_drift,
+    }
+
+
+# =====================================================================
@@ -1,21 +1,38 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from pydantic import ValidationError
 
-from typing import List, Union
+from typing import Any, Collection, Dict, List, Literal, Optional, Union
 from datetime import date
 import json
 
+from app.database.config import settings
 from app.models import BookModel, IssuedBookModel, StudentModel
-from app.schemas import Student, BookIssueRecord
+from app.schemas import BookOut, Student, StudentEnrollError, StudentEnrollSummary, BookIssueRecord, BookIssueRecordDetail
+from app.services.pagination import CountMode, count_rows, parse_id_cursor
+from app.utils.cache import MISSING, invalidate_book, invalidate_student, may_fill_cache, may_read_cache, student_cache
+from app.utils.redis_cache import bump_generation, cached_list
+from app.utils.utils import classify_student_identifier, encode_cursor
+
+
+LoanStatus = Literal["active", "returned", "overdue"]
 
 
 # utility function
-def book_issue_record_schema(model: IssuedBookModel) -> BookIssueRecord:
-    today = date.today()
-    is_overdue = model.returned_date is None and today > model.due_date
-    return BookIssueRecord(
+def book_issue_record_schema(
+    model: IssuedBookModel,
+    include: Collection[str] = (),
+    is_overdue: Optional[bool] = None
+) -> BookIssueRecord:
+    # Queries that select IssuedBookModel.is_overdue pass the database's value through
+    if is_overdue is None:
+        is_overdue = model.is_overdue
+
+    record = dict(
         id=model.id,
         book_id=model.book_id,
         student_id=model.student_id,
@@ -25,15 +42,71 @@ def book_issue_record_schema(model: IssuedBookModel) -> BookIssueRecord:
         is_overdue=is_overdue
     )
 
+    if not include:
+        return BookIssueRecord(**record)
+
+    # Related rows must already be loaded (joinedload) when include is used
+    return BookIssueRecordDetail(
+        **record,
+        book=BookOut.model_validate(model.book) if "book" in include else None,
+        student=Student.model_validate(model.student) if "student" in include else None,
+    )
+
+
+# Columns tried (in order) for each identifier shape, see classify_student_identifier
+STUDENT_LOOKUP_ORDER = {
+    "phone": ("phone", "roll_number"),
+    "roll_number": ("roll_number", "name"),
+    "name": ("name", "roll_number"),
+}
+
 
-def list_students( 
+def student_lookup_predicate(column: str, identifier: str):
+    """Predicate matching the expression indexes on students (lower(name), lower(roll_number), phone)."""
+    if column == "phone":
+        return StudentModel.phone == identifier
+    if column == "roll_number":
+        return func.lower(StudentModel.roll_number) == identifier.lower()
+    return func.lower(StudentModel.name) == identifier.lower()
+
+
+async def list_students( 
     department: str, 
     semester: int, 
     search: str, 
     page: int, 
     limit: int,
-    db: Session
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    count: CountMode = "exact",
 ) -> tuple[list[Student], dict]:
+    """List students through the shared Redis page cache (see fetch_students_page for the query)."""
+    params = {
+        "department": department, "semester": semester, "search": search,
+        "page": page, "limit": limit, "cursor": cursor, "count": count,
+    }
+
+    return await cached_list(
+        "students", params, Student,
+        lambda: fetch_students_page(department, semester, search, page, limit, db, cursor, count),
+        db,
+    )
+
+
+
+async def fetch_students_page( 
+    department: str, 
+    semester: int, 
+    search: str, 
+    page: int, 
+    limit: int,
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    count: CountMode = "exact",
+) -> tuple[list[Student], dict]:
+    # Keyset pagination: resume after the last id of the previous page instead of OFFSET
+    after_id = parse_id_cursor(cursor)
+
     try:
         query = select(StudentModel)
 
@@ -47,14 +120,20 @@ def list_students(
                 StudentModel.phone.ilike(search)
             )
 
-        total = db.scalar(select(func.count()).select_from(query.subquery()))
+        total, is_estimate = await count_rows(query, StudentModel.__tablename__, count, db)
+
+        page_query = query.order_by(StudentModel.id).limit(limit)
+        if after_id is not None:
+            page_query = page_query.where(StudentModel.id > after_id)
+        else:
+            page_query = page_query.offset((page - 1) * limit)
 
-        students_orm = db.execute(
-            query.offset((page - 1) * limit).limit(limit)
-        ).scalars().all()
+        students_orm = (await db.execute(page_query)).scalars().all()
 
         students = [Student.model_validate(s) for s in students_orm]
 
+        next_cursor = encode_cursor({"id": students_orm[-1].id}) if len(students_orm) == limit else None
+
         filters = {
             k: v for k, v in {
                 "department": department,
@@ -65,10 +144,12 @@ def list_students(
 
 
         meta_info = {
-            "page": page,
+            "page": None if cursor else page,
             "limit": limit,
             "total_students": total,
+            "total_is_estimate": is_estimate,
             "fetched_count": len(students),
+            "next_cursor": next_cursor,
             "filters_applied": filters
         }
 
@@ -82,20 +163,26 @@ def list_students(
 
 
 
-def get_student_by_identifier(
+async def get_student_by_identifier(
     identifier: str, 
-    db: Session,
+    db: AsyncSession,
     as_orm: bool = False
 ) -> Union[StudentModel, Student]:
     try:
-        id_lower = identifier.lower()
-        
-        query = select(StudentModel).where(
-            (func.lower(StudentModel.name) == id_lower) |
-            (func.lower(StudentModel.roll_number) == id_lower) |
-            (StudentModel.phone == identifier)
-        )
-        student = db.execute(query).scalars().first()
+        student = None
+        identifier = identifier.strip()
+
+        if not as_orm and may_read_cache(db):
+            cached = student_cache.get(identifier.lower())
+            if cached is not MISSING:
+                return cached[1]
+
+        # One indexed lookup for the likely column; the fallback only runs on a miss
+        for column in STUDENT_LOOKUP_ORDER[classify_student_identifier(identifier)]:
+            query = select(StudentModel).where(student_lookup_predicate(column, identifier))
+            student = (await db.execute(query)).scalars().first()
+            if student:
+                break
 
         if not student:
             raise HTTPException(
@@ -103,12 +190,15 @@ def get_student_by_identifier(
                 detail=f"Student not found for identifier = {identifier}"
                 )
 
+        # Convert ORM model to Pydantic schema (Student)
+        student_out = Student.model_validate(student)
+        if may_fill_cache(db):
+            student_cache.set(identifier.lower(), (student.id, student_out))
+
         if as_orm:
             return student
 
-        # Convert ORM model to Pydantic schema (Student)
-        student = Student.model_validate(student)
-        return student
+        return student_out
 
 
     except HTTPException:
@@ -122,13 +212,25 @@ def get_student_by_identifier(
     
 
 
-def add_student(student: Student, db: Session) -> bool:
+async def resolve_student_id(identifier: str, db: AsyncSession) -> int:
+    """Resolve a student identifier to its primary key, served from the lookup cache when possible."""
+    if may_read_cache(db):
+        cached = student_cache.get(identifier.strip().lower())
+        if cached is not MISSING:
+            return cached[0]
+
+    student = await get_student_by_identifier(identifier, db, as_orm=True)
+    return student.id
+
+
+
+async def add_student(student: Student, db: AsyncSession) -> bool:
     """
     Add a student to the database after checking for duplicates
     by roll number, name, or phone number.
     Args:
         student (Student): The student data to add.
-        db (Session): SQLAlchemy session for DB access.
+        db (AsyncSession): SQLAlchemy session for DB access.
 
     Returns: bool: True if student added successfully.
     Raises: HTTPException: 400 for duplicates, 500 for server error.
@@ -138,11 +240,14 @@ def add_student(student: Student, db: Session) -> bool:
 
     try:
         db.add(new_student)
-        db.commit()
+        await db.commit()
+        # A new student can change what their name/roll number/phone resolves to
+        invalidate_student(student.name, student.roll_number, student.phone)
+        await bump_generation("students")
         return True
 
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         error_msg = str(e.orig).lower()
 
         # Collect all fields that caused the uniqueness constraint violation
@@ -168,7 +273,7 @@ def add_student(student: Student, db: Session) -> bool:
         )
 
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail="An unexpected error occurred while adding the student."
@@ -176,13 +281,145 @@ def add_student(student: Student, db: Session) -> bool:
 
 
 
-def get_student_books(identifier: str, db: Session) -> List[BookIssueRecord]:
+async def bulk_add_students(rows: List[Dict[str, Any]], db: AsyncSession) -> StudentEnrollSummary:
+    """
+    Enroll many students at once, reporting duplicates per row instead of failing the request.
+    Args:
+        rows (List[Dict[str, Any]]): Raw student objects, validated one by one against Student.
+        db (AsyncSession): SQLAlchemy session for DB access.
+
+    Returns: StudentEnrollSummary: Row counts and the first rejected rows.
+    Raises: HTTPException: 500 for server error (nothing is enrolled).
+    Notes:
+        Rows are inserted in batches with INSERT ... ON CONFLICT DO NOTHING RETURNING roll_number.
+        Rows repeating a roll number/email of an earlier row are rejected before the insert, so
+        within a batch "not returned" means "collided with a stored student"; one lookup per batch
+        then tells which of roll_number/email was taken. No IntegrityError, no per-row rollback.
+    """
+
+    errors: list[StudentEnrollError] = []
+    rows_invalid = rows_duplicate = rows_inserted = 0
+
+    def reject(row: int, roll_number: Optional[str], error: str, fields: List[str] = ()) -> None:
+        errors.append(StudentEnrollError(
+            row=row, roll_number=roll_number, duplicate_fields=list(fields), error=error
+        ))
+
+    # 1. Validate and drop repeats within the request (first occurrence wins)
+    first_row = {"roll_number": {}, "email": {}}
+    batch: list[tuple[int, Student]] = []
+    batches = [batch]
+
+    for row, raw in enumerate(rows, start=1):
+        try:
+            student = Student.model_validate(raw)
+        except ValidationError as e:
+            rows_invalid += 1
+            first = e.errors()[0]
+            roll_number = raw.get("roll_number") if isinstance(raw, dict) else None
+            reject(
+                row, roll_number if isinstance(roll_number, str) else None,
+                f"{'.'.join(map(str, first['loc'])) or 'row'}: {first['msg']}"
+            )
+            continue
+
+        repeated = [field for field in first_row if getattr(student, field) in first_row[field]]
+        if repeated:
+            rows_duplicate += 1
+            earlier = min(first_row[field][getattr(student, field)] for field in repeated)
+            reject(row, student.roll_number, f"Duplicate of row {earlier} in this request", repeated)
+            continue
+
+        first_row["roll_number"][student.roll_number] = row
+        first_row["email"][student.email] = row
+
+        if len(batch) >= settings.BULK_ENROLL_BATCH_SIZE:
+            batch = []
+            batches.append(batch)
+        batch.append((row, student))
+
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+
+            # 2. Insert what doesn't collide with any unique constraint
+            inserted = set((await db.execute(
+                insert(StudentModel)
+                .on_conflict_do_nothing()
+                .returning(StudentModel.roll_number),
+                [student.model_dump() for _, student in batch]
+            )).scalars())
+            rows_inserted += len(inserted)
+
+            skipped = [(row, student) for row, student in batch if student.roll_number not in inserted]
+            if not skipped:
+                continue
+
+            # 3. Set differences: which of the skipped values are already taken
+            taken_rolls = set((await db.execute(
+                select(StudentModel.roll_number)
+                .where(StudentModel.roll_number.in_([student.roll_number for _, student in skipped]))
+            )).scalars())
+            taken_emails = set((await db.execute(
+                select(StudentModel.email)
+                .where(StudentModel.email.in_([student.email for _, student in skipped]))
+            )).scalars())
+
+            for row, student in skipped:
+                rows_duplicate += 1
+                fields = [
+                    field for field, taken in (("roll_number", taken_rolls), ("email", taken_emails))
+                    if getattr(student, field) in taken
+                ]
+                details = ", ".join(f"{field.replace('_', ' ')}: {getattr(student, field)}" for field in fields)
+                reject(
+                    row, student.roll_number,
+                    f"Student with the following duplicate fields already exists: {details}."
+                    if fields else "Student with given data already exists.",
+                    fields
+                )
+
+        await db.commit()
+
+    except Exception:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred while enrolling students."
+        )
+
+    if rows_inserted:
+        # New students can change what names/roll numbers/phones resolve to
+        student_cache.clear()
+        await bump_generation("students")
+
+    errors.sort(key=lambda e: e.row)
+    error_limit = settings.BULK_ENROLL_ERROR_LIMIT
+
+    return StudentEnrollSummary(
+        rows_received=len(rows),
+        rows_inserted=rows_inserted,
+        rows_invalid=rows_invalid,
+        rows_duplicate=rows_duplicate,
+        errors=errors[:error_limit],
+        errors_truncated=len(errors) > error_limit,
+    )
+
+
+
+async def get_student_books(identifier: str, db: AsyncSession) -> List[BookIssueRecord]:
 
-    student = get_student_by_identifier(identifier, db, as_orm=True)
+    student_id = await resolve_student_id(identifier, db)
 
     try:
-        all_issued_books = student.issued_books
-        issued_books = [book for book in all_issued_books if book.returned_date is None]
+        # Active loans only, served by ix_issued_books_student_returned
+        issued_books = (await db.execute(
+            select(IssuedBookModel)
+            .where(IssuedBookModel.student_id == student_id, IssuedBookModel.returned_date.is_(None))
+            .order_by(IssuedBookModel.id)
+        )).scalars().all()
+
         return [book_issue_record_schema(book) for book in issued_books]
 
 
@@ -194,36 +431,144 @@ def get_student_books(identifier: str, db: Session) -> List[BookIssueRecord]:
 
 
 
-def return_issued_book(
+async def get_student_history(
     identifier: str,
-    issued_book_id: int,
-    db: Session
-) -> BookIssueRecord:
-    
-    student = get_student_by_identifier(identifier, db, as_orm=True)
+    db: AsyncSession,
+    status: Optional[LoanStatus] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    count: CountMode = "none",
+) -> tuple[List[BookIssueRecord], dict]:
+    """
+    Fetch a page of a student's loans, newest first.
+    Args:
+        identifier (str): Student name, roll number or phone.
+        db (AsyncSession): Active database session.
+        status (Optional[LoanStatus]): "active", "returned" or "overdue" (not returned, past due); all if None.
+        limit (int): Page size.
+        cursor (Optional[str]): Keyset cursor (id) from the previous page.
+        count (CountMode): How to compute the total, see count_rows.
+
+    Returns: tuple[List[BookIssueRecord], dict]: Loans and pagination meta.
+    Raises:
+        HTTPException 404 if the student doesn't exist, 400 on a bad cursor, 500 on database errors.
+    """
+
+    student_id = await resolve_student_id(identifier, db)
+    before_id = parse_id_cursor(cursor)
+
+    try:
+        query = select(IssuedBookModel).where(IssuedBookModel.student_id == student_id)
+
+        if status == "active":
+            query = query.where(IssuedBookModel.returned_date.is_(None))
+        elif status == "returned":
+            query = query.where(IssuedBookModel.returned_date.is_not(None))
+        elif status == "overdue":
+            query = query.where(IssuedBookModel.is_overdue)
+
+        total, is_estimate = await count_rows(query, IssuedBookModel.__tablename__, count, db)
+
+        page_query = query.order_by(IssuedBookModel.id.desc()).limit(limit)
+        if before_id is not None:
+            page_query = page_query.where(IssuedBookModel.id < before_id)
 
-    # Find the specific issued book by ID from the student's issued books
-    issued_book = next((book for book in student.issued_books if book.book_id == issued_book_id), None)
+        loans = (await db.execute(page_query)).scalars().all()
 
-    if not issued_book:
-        raise HTTPException(status_code=404, detail="Issued book not found")
+        next_cursor = None
+        if len(loans) == limit:
+            next_cursor = encode_cursor({"id": loans[-1].id})
 
-    if issued_book.returned_date:
-        raise HTTPException(status_code=400, detail="Book has already been returned")
+        meta_info = {
+            "limit": limit,
+            "total_records": total,
+            "total_is_estimate": is_estimate,
+            "fetched_count": len(loans),
+            "next_cursor": next_cursor,
+            "filters_applied": {"status": status} if status else {},
+        }
+
+        return [book_issue_record_schema(loan) for loan in loans], meta_info
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred while fetching the loan history"
+        )
+
+
+
+async def return_issued_book(
+    identifier: str,
+    issued_book_id: int,
+    db: AsyncSession
+) -> BookIssueRecord:
+    """
+    Return a student's open loan of a book.
+    Args:
+        identifier (str): Student name, roll number or phone.
+        issued_book_id (int): ID of the book being returned.
+        db (AsyncSession): Active database session.
+
+    Returns: BookIssueRecord: The closed loan.
+    Raises:
+        HTTPException 404 if the student or an open loan of the book doesn't exist.
+        HTTPException 400 if the student only has returned loans of the book.
+        HTTPException 500 on database errors.
+    """
+
+    student_id = await resolve_student_id(identifier, db)
 
     try:
-        # Update the returned date to today
-        issued_book.returned_date = date.today()
+        # 1. The open loan, via uq_issued_books_open_loan; the row lock makes a concurrent
+        #    return of the same loan wait and then find nothing open
+        issued_book = (await db.execute(
+            select(IssuedBookModel)
+            .where(
+                IssuedBookModel.student_id == student_id,
+                IssuedBookModel.book_id == issued_book_id,
+                IssuedBookModel.returned_date.is_(None),
+            )
+            .with_for_update()
+        )).scalars().first()
+
+        if not issued_book:
+            returned_before = (await db.execute(
+                select(IssuedBookModel.id).where(
+                    IssuedBookModel.student_id == student_id,
+                    IssuedBookModel.book_id == issued_book_id,
+                ).limit(1)
+            )).first()
+
+            if returned_before:
+                raise HTTPException(status_code=400, detail="Book has already been returned")
+            raise HTTPException(status_code=404, detail="Issued book not found")
+
+        # 2. Close the loan and put the copy back in one statement
+        returned_date = date.today()
+        closed = (
+            update(IssuedBookModel)
+            .where(IssuedBookModel.id == issued_book.id)
+            .values(returned_date=returned_date)
+            .returning(IssuedBookModel.book_id)
+            .cte("closed")
+        )
+        book = (await db.execute(
+            update(BookModel)
+            .where(BookModel.id == closed.c.book_id)
+            .values(copies=BookModel.copies + 1)
+            .returning(BookModel.id, BookModel.isbn)
+            .execution_options(synchronize_session=False)
+        )).first()
 
-        # Increase the book's available copies
-        book = db.query(BookModel).filter(BookModel.id == issued_book.book_id).first()
-        # book = get_single_book(str(issued_book.book_id), db, as_orm=True)
+        await db.commit()
 
-        if book:
-            book.copies += 1
+        # Reflect the UPDATE on the loaded loan without marking it dirty
+        set_committed_value(issued_book, "returned_date", returned_date)
 
-        db.commit()
-        db.refresh(issued_book)
+        if book:
+            invalidate_book(book.id, book.isbn)
+            await bump_generation("books")
 
         return book_issue_record_schema(issued_book)
        
@@ -232,7 +577,7 @@ def return_issued_book(
         raise
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail="An error occurred while returning the book"
@@ -1 +1,2 @@
-from .remainder import send_due_soon_reminder
\ No newline at end of file
+from .remainder import send_due_soon_reminder, send_due_soon_reminders_batch
+from .stats import reconcile_stats_task
\ No newline at end of file
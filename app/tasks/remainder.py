@@ -1,21 +1,131 @@
+import logging
 import smtplib
+from contextlib import contextmanager
 from celery import shared_task
 from email.mime.text import MIMEText
 
 from app.database import settings
+from app.utils.metrics import REMINDER_BATCHES, REMINDER_EMAILS
+
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_ATTEMPTS = 3
+
+# Connect/STARTTLS/login failures say nothing about the messages, so they are retried
+# (with exponential backoff, up to RETRY_MAX_COUNTDOWN) without spending message attempts
+MAX_SESSION_RETRIES = 10
+RETRY_COUNTDOWN = 60
+RETRY_MAX_COUNTDOWN = 3600
+
+
+def build_reminder_message(to_email: str, subject: str, body: str) -> MIMEText:
+    msg = MIMEText(body, "html")
+    msg["Subject"] = subject
+    msg["From"] = settings.SMTP_FROM_EMAIL
+    msg["To"] = to_email
+    return msg
+
+
+@contextmanager
+def smtp_session():
+    """Open one authenticated SMTP session (STARTTLS + login) to reuse for many messages."""
+    # A clear error instead of a connection attempt to None when SMTP settings are missing
+    settings.require_smtp()
+
+    # A stalled server raises a (retried) timeout instead of hanging the worker
+    with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT) as server:
+        if settings.SMTP_STARTTLS:
+            server.starttls()
+        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        yield server
+
+
+def is_permanent_failure(exc: Exception) -> bool:
+    """5xx SMTP replies (unknown mailbox, rejected sender, ...) won't succeed on retry."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code >= 500
+    return False
 
 
 @shared_task(bind=True, max_retries=3)
 def send_due_soon_reminder(self, to_email: str, subject: str, body: str):
     try:
-        msg = MIMEText(body, "html")
-        msg["Subject"] = subject
-        msg["From"] = settings.SMTP_FROM_EMAIL
-        msg["To"] = to_email
+        msg = build_reminder_message(to_email, subject, body)
 
-        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        with smtp_session() as server:
             server.sendmail(settings.SMTP_FROM_EMAIL, [to_email], msg.as_string())
+        REMINDER_EMAILS.labels("sent").inc()
     except Exception as e:
+        REMINDER_EMAILS.labels("retried").inc()
         raise self.retry(exc=e, countdown=60)
+
+
+def retry_countdown(retries: int) -> int:
+    return min(RETRY_COUNTDOWN * 2 ** retries, RETRY_MAX_COUNTDOWN)
+
+
+@shared_task(bind=True, max_retries=MAX_SESSION_RETRIES)
+def send_due_soon_reminders_batch(self, messages: list[dict]):
+    """
+    Send a chunk of reminder emails over a single SMTP session.
+    Args:
+        messages (list[dict]): Items with to_email, subject, body and an optional
+            attempts counter carried across retries.
+
+    Returns: dict: Counts of sent and dropped messages (failed ones are re-queued via retry).
+    Notes:
+        Only messages that failed are retried, so one bad address never re-sends
+        the rest of the batch. A message the server rejects is dropped after a
+        permanent (5xx) rejection or MAX_MESSAGE_ATTEMPTS temporary ones. Session
+        failures (connect, STARTTLS, login, dropped connection) are always retried,
+        whatever their reply code.
+    """
+
+    sent = 0
+    rejected: list[tuple[dict, Exception]] = []
+    unsent: list[dict] = []
+    session_error = None
+
+    try:
+        with smtp_session() as server:
+            for message in messages:
+                msg = build_reminder_message(message["to_email"], message["subject"], message["body"])
+
+                try:
+                    server.sendmail(settings.SMTP_FROM_EMAIL, [message["to_email"]], msg.as_string())
+                    sent += 1
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                    # Rejected by the server: only this message failed, the session is still usable
+                    rejected.append((message, e))
+
+    except (smtplib.SMTPException, OSError) as e:
+        # Connect/STARTTLS/login failed (even with a 5xx such as a 535) or the session
+        # dropped: everything not yet handled is retried with its attempts unchanged
+        session_error = e
+        unsent = messages[sent + len(rejected):]
+
+    REMINDER_BATCHES.inc()
+    REMINDER_EMAILS.labels("sent").inc(sent)
+
+    retry, dropped = list(unsent), 0
+    for message, exc in rejected:
+        attempts = message.get("attempts", 0) + 1
+
+        if is_permanent_failure(exc) or attempts >= MAX_MESSAGE_ATTEMPTS:
+            dropped += 1
+            logger.warning("Dropping reminder to %s after %d attempt(s): %s", message["to_email"], attempts, exc)
+            continue
+
+        retry.append({**message, "attempts": attempts})
+
+    REMINDER_EMAILS.labels("dropped").inc(dropped)
+
+    if retry:
+        REMINDER_EMAILS.labels("retried").inc(len(retry))
+        exc = session_error or rejected[-1][1]
+        raise self.retry(args=[retry], countdown=retry_countdown(self.request.retries), exc=exc)
+
+    return {"sent": sent, "dropped": dropped}
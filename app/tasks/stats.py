@@ -0,0 +1,24 @@
+from celery import shared_task
+
+from app.database import get_sessionmaker
+
+
+@shared_task
+def fold_stats_deltas_task() -> dict:
+    """Fold the trigger deltas into the /stats summary rows; scheduled every STATS_FOLD_SECONDS."""
+    from app.services.stats import fold_stats_deltas
+
+    with get_sessionmaker()() as db:
+        return fold_stats_deltas(db)
+
+
+@shared_task
+def reconcile_stats_task() -> dict:
+    """Rebuild the /stats summary tables; scheduled nightly by celery beat."""
+    # Imported per run: the services package pulls in FastAPI, which the worker doesn't otherwise need
+    from app.services.stats import reconcile_stats
+
+    with get_sessionmaker()() as db:
+        result = reconcile_stats(db)
+
+    return {"categories_fixed": result["categories_fixed"], "due_dates_fixed": result["due_dates_fixed"]}
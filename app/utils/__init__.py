@@ -1,2 +1,14 @@
-from .response_template import *
-from .utils import *
\ No newline at end of file
+from importlib import import_module
+
+from .utils import *
+
+
+def __getattr__(name: str):
+    # The response helpers import FastAPI; load them on first use so importing another
+    # app.utils module (metrics from the database layer, Celery tasks) doesn't pay for it
+    response_template = import_module(f"{__name__}.response_template")
+
+    try:
+        return getattr(response_template, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.database.config import settings
+
+
+MISSING = object()
+
+# Session.info flags set by app.database.replicas.get_read_db
+REPLICA_SESSION = "replica"
+PINNED_SESSION = "pinned_to_primary"
+
+
+def may_read_cache(db) -> bool:
+    """False for reads pinned to the primary after a write: a cached entry may predate it."""
+    return not db.info.get(PINNED_SESSION, False)
+
+
+def may_fill_cache(db) -> bool:
+    """False for replica sessions: a lagging replica's rows must not outlive the request."""
+    return not db.info.get(REPLICA_SESSION, False)
+
+
+class TTLCache:
+    """
+    Bounded in-process cache with per-entry TTL and LRU eviction.
+
+    Each worker process has its own instance, so entries can be up to ``ttl``
+    seconds stale with respect to writes made by other workers. A ``maxsize``
+    or ``ttl`` of 0 disables the cache.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or MISSING."""
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return MISSING
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# Keyed by ("id", int) and ("isbn", str); values are BookOut
+book_cache = TTLCache("books", settings.BOOK_CACHE_SIZE, settings.BOOK_CACHE_TTL)
+
+# Keyed by the lower-cased identifier; values are (student_id, Student)
+student_cache = TTLCache("students", settings.STUDENT_CACHE_SIZE, settings.STUDENT_CACHE_TTL)
+
+
+
+def invalidate_book(book_id: int, isbn: str) -> None:
+    """Drop a book from the lookup cache under both of its keys."""
+    book_cache.delete(("id", book_id), ("isbn", isbn))
+
+
+def invalidate_student(*identifiers: str) -> None:
+    """Drop cached resolutions of the given identifiers (name, roll number, phone)."""
+    student_cache.delete(*(identifier.strip().lower() for identifier in identifiers))
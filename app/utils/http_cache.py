@@ -0,0 +1,62 @@
+from datetime import datetime
+from fastapi import Response, status
+from typing import Any, Literal, Optional
+
+import hashlib
+
+from app.database.config import settings
+
+
+CacheScope = Literal["public", "private"]
+
+
+
+def weak_etag(*parts: Any) -> str:
+    """Weak validator over the given version parts (ids, timestamps, generations, query strings)."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+
+def row_etag(kind: str, row_key: Any, updated_at: Optional[datetime]) -> Optional[str]:
+    """ETag of one row, or None when its version wasn't loaded."""
+    if updated_at is None:
+        return None
+    return weak_etag(kind, row_key, updated_at.isoformat())
+
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """If-None-Match uses weak comparison: W/"x" and "x" match, as does *."""
+    if not if_none_match or not etag:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in candidates)
+
+
+
+def cache_headers(etag: Optional[str], scope: CacheScope, max_age: int = 0) -> dict[str, str]:
+    """
+    ETag and Cache-Control headers for a GET response.
+    max_age 0 means clients (and, for public responses, CDNs) may store the response
+    but must revalidate it with If-None-Match before reuse.
+    """
+    headers = {"Cache-Control": f"{scope}, max-age={max_age}" if max_age else f"{scope}, no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    return headers
+
+
+
+def list_cache_headers(etag: Optional[str], scope: CacheScope) -> dict[str, str]:
+    return cache_headers(etag, scope, settings.HTTP_LIST_MAX_AGE)
+
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """304 with the validators the full response would have carried, and no body."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+# =====================================================================
@@ -0,0 +1,113 @@
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import REGISTRY, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import os
+import time
+
+
+# Latency buckets (seconds): sub-millisecond SQL up to multi-second exports
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_LATENCY = Histogram(
+    "libramind_http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+SQL_LATENCY = Histogram(
+    "libramind_db_statement_duration_seconds",
+    "SQL statement execution time (the _count series is the statement count)",
+    ["engine", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+REMINDER_EMAILS = Counter(
+    "libramind_reminder_emails_total",
+    "Due-soon reminder emails by outcome: sent, retried or dropped",
+    ["outcome"],
+)
+
+REMINDER_BATCHES = Counter(
+    "libramind_reminder_batches_total",
+    "Reminder batch task runs",
+)
+
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+
+class MetricsMiddleware:
+    """
+    Time every HTTP request into REQUEST_LATENCY.
+
+    A plain ASGI middleware (no BaseHTTPMiddleware task/queue overhead). The route label is
+    the matched route template (e.g. /books/{book_id}), so path parameters don't create series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status_code),
+            ).observe(time.perf_counter() - started)
+
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Record execution time of every statement run through a (sync) engine into SQL_LATENCY."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+        operation = statement.lstrip().split(None, 1)[0].upper()
+        SQL_LATENCY.labels(name, operation if operation in SQL_OPERATIONS else "OTHER").observe(elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # after_cursor_execute doesn't fire for a failed statement
+        started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+        if started:
+            started.pop()
+
+
+
+def metrics_payload() -> tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+    With PROMETHEUS_MULTIPROC_DIR set (several uvicorn workers, Celery workers on the same host),
+    the values written by every process are aggregated.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
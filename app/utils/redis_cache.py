@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from pydantic import BaseModel
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.config import settings
+from app.utils.cache import may_fill_cache, may_read_cache
+from app.utils.http_cache import weak_etag
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "libramind"
+
+_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Shared asyncio Redis client, created on first use."""
+    global _client
+    if _client is None:
+        _client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=settings.LIST_CACHE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.LIST_CACHE_REDIS_TIMEOUT,
+        )
+    return _client
+
+
+def set_redis(client: Optional[aioredis.Redis]) -> None:
+    """Swap the Redis client (e.g. for a fakeredis instance in tests)."""
+    global _client
+    _client = client
+
+
+def generation_key(namespace: str) -> str:
+    return f"{KEY_PREFIX}:gen:{namespace}"
+
+
+def list_cache_key(namespace: str, generation: int, params: dict) -> str:
+    """Key for one list page; filters are normalized so equivalent requests share an entry."""
+    normalized = {
+        k: v.strip() if isinstance(v, str) else v
+        for k, v in params.items()
+        if v not in (None, "")
+    }
+    digest = hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{KEY_PREFIX}:list:{namespace}:{generation}:{digest}"
+
+
+async def get_generation(namespace: str) -> int:
+    return int(await get_redis().get(generation_key(namespace)) or 0)
+
+
+async def bump_generation(*namespaces: str) -> None:
+    """
+    Invalidate every cached list page of the given namespaces.
+    Pages are keyed by generation, so bumping it orphans all existing entries
+    (they expire through their TTL). Call after the mutating transaction commits.
+    """
+    if not settings.LIST_CACHE_ENABLED:
+        return
+
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.incr(generation_key(namespace))
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Could not bump list cache generation for %s: %s", namespaces, e)
+
+
+async def list_etag(namespace: str, query: Iterable[tuple[str, str]]) -> Optional[str]:
+    """
+    Weak ETag of a list page: changes whenever the namespace's generation is bumped.
+
+    Read it before loading the page: a write landing in between then only costs the
+    client one extra full response. The ETag also rotates every LIST_CACHE_TTL, so a
+    lost bump_generation can't pin clients to a stale page for longer than the page
+    cache itself would. None (no ETag) when Redis is unavailable.
+    """
+    if not settings.LIST_CACHE_ENABLED:
+        return None
+
+    try:
+        generation = await get_generation(namespace)
+    except RedisError as e:
+        logger.warning("List ETag unavailable: %s", e)
+        return None
+
+    return weak_etag(namespace, generation, int(time.time() // settings.LIST_CACHE_TTL), sorted(query))
+
+
+
+async def cached_list(
+    namespace: str,
+    params: dict,
+    schema: type[BaseModel],
+    loader: Callable[[], Awaitable[tuple[list[BaseModel], dict]]],
+    db: AsyncSession,
+) -> tuple[list[BaseModel], dict]:
+    """
+    Return a (items, meta) list page from Redis, or compute it with loader and cache it.
+    Any Redis failure falls back to the loader, so the cache never breaks reads.
+
+    Reads pinned to the primary skip the lookup, and pages loaded from a replica are
+    never stored (see may_read_cache / may_fill_cache).
+    """
+    if not settings.LIST_CACHE_ENABLED or not may_read_cache(db):
+        return await loader()
+
+    redis = get_redis()
+
+    try:
+        generation = await get_generation(namespace)
+        key = list_cache_key(namespace, generation, params)
+        raw = await redis.get(key)
+    except RedisError as e:
+        logger.warning("List cache unavailable, querying the database: %s", e)
+        return await loader()
+
+    if raw is not None:
+        cached = json.loads(raw)
+        return [schema.model_validate(item) for item in cached["items"]], cached["meta"]
+
+    items, meta = await loader()
+    if not may_fill_cache(db):
+        return items, meta
+
+    payload = json.dumps({
+        "items": [item.model_dump(mode="json") for item in items],
+        "meta": meta,
+    }, default=str)
+
+    try:
+        await redis.set(key, payload, ex=settings.LIST_CACHE_TTL)
+    except RedisError as e:
+        logger.warning("Could not store list page in cache: %s", e)
+
+    return items, meta
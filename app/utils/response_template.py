@@ -1,5 +1,7 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi import status
+from pydantic import BaseModel
+from pydantic_core import to_json
 from typing import Any, Optional, Dict
 
 from app.utils.utils import serialize
@@ -9,8 +11,9 @@ def success_response(
     status_code: int = status.HTTP_200_OK,
     data: Optional[Any] = None,
     message: str = "Success",
-    meta: Optional[Dict[str, Any]] = None
-) -> JSONResponse:
+    meta: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
 
     content = {
         "status_code": status_code,
@@ -18,16 +21,30 @@ def success_response(
         "message": message,
     }
 
+    # Pydantic models are left as-is and encoded straight to bytes by pydantic-core below
+    # (dates get their DD-MM-YYYY format from the schema); anything else goes through serialize()
     if data is not None:
         if isinstance(data, list):
-            content["data"] = [serialize(d) for d in data]
+            content["data"] = [encodable(d) for d in data]
         else:
-            content["data"] = serialize(data)
+            content["data"] = encodable(data)
 
     if meta:
         content["meta"] = meta
 
-    return JSONResponse(status_code=status_code, content=content)
+    return Response(
+        content=to_json(content),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+
+def encodable(item: Any) -> Any:
+    if isinstance(item, BaseModel):
+        return item
+    return serialize(item)
 
 
 
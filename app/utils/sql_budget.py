@@ -0,0 +1,175 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Iterator, Optional
+
+import json
+import logging
+
+from app.database.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Statements a route may run per request ("METHOD /route/template"); SQL_BUDGETS overrides
+# entries and SQL_BUDGET_DEFAULT covers routes not listed. Cached lookups can run fewer.
+# None exempts a route whose statement count grows with its input (bulk endpoints batch).
+ROUTE_BUDGETS: dict[str, Optional[int]] = {
+    "GET /books": 2,
+    "GET /books/{book_id}": 1,
+    "GET /books/overdue-books": 2,
+    "POST /books": 2,
+    "PUT /books/{book_id}": 2,
+    "DELETE /books/{book_id}": 3,
+    "POST /books/{book_id}": 4,
+    "POST /books/checkout": 6,
+    "POST /books/return": 5,
+    "GET /students": 2,
+    "GET /students/{identifier}": 2,
+    "GET /students/{identifier}/books": 3,
+    "GET /students/{identifier}/history": 4,
+    "PATCH /students/{identifier}/books/{issued_book_id}": 4,
+    "GET /issues": 5,
+    "GET /stats": 2,
+    "POST /books/bulk": None,
+    "POST /students/bulk": None,
+}
+
+# The same statement text this many times in one request is reported as a likely N+1
+REPEATED_STATEMENT_THRESHOLD = 3
+
+
+class StatementStats:
+    """Statements executed within one request (or any track_statements block)."""
+
+    def __init__(self):
+        self.count = 0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        # Parameters are bound separately, so the SQL text is the statement's shape
+        self.shapes[statement] += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= REPEATED_STATEMENT_THRESHOLD]
+
+
+current_statements: ContextVar[Optional[StatementStats]] = ContextVar("current_statements", default=None)
+
+
+@contextmanager
+def track_statements() -> Iterator[StatementStats]:
+    """Count statements run by this task/context (and greenlets it awaits) until the block exits."""
+    stats = StatementStats()
+    token = current_statements.set(stats)
+    try:
+        yield stats
+    finally:
+        current_statements.reset(token)
+
+
+
+def count_statements(engine: Engine) -> None:
+    """Attribute every statement run through an engine to the current track_statements block."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = current_statements.get()
+        if stats is not None:
+            stats.record(statement)
+
+
+
+def budget_enforced() -> bool:
+    if settings.SQL_BUDGET_ENFORCE is not None:
+        return settings.SQL_BUDGET_ENFORCE
+    return settings.ENVIRONMENT in ("development", "test")
+
+
+
+def route_budget(route_key: str) -> Optional[int]:
+    budgets = {**ROUTE_BUDGETS, **settings.SQL_BUDGETS}
+    return budgets.get(route_key, settings.SQL_BUDGET_DEFAULT)
+
+
+
+class StatementBudgetMiddleware:
+    """
+    Count SQL statements per request and report them in the X-SQL-Statements header.
+
+    Repeated statement shapes (likely N+1 queries) are logged and counted in
+    X-SQL-Repeated-Statements. A request over its route budget is logged; when the budget is
+    enforced (development/test by default) its response is replaced by a 500 naming the
+    budget and the repeated statements, so regressions fail loudly before production.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with track_statements() as stats:
+            swallow = False
+
+            async def send_wrapper(message):
+                nonlocal swallow
+
+                if message["type"] == "http.response.start":
+                    route = scope.get("route")
+                    route_key = f"{scope['method']} {route.path}" if route is not None else None
+                    repeated = stats.repeated()
+
+                    for shape, n in repeated:
+                        logger.warning("Statement repeated %d times in %s: %s", n, route_key, shape)
+
+                    budget = route_budget(route_key) if route_key else None
+                    if budget is not None and stats.count > budget:
+                        logger.warning("%s ran %d SQL statements (budget %d)", route_key, stats.count, budget)
+
+                        if budget_enforced():
+                            swallow = True
+                            await self.send_budget_error(send, route_key, stats, budget, repeated)
+                            return
+
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-sql-statements", str(stats.count).encode()))
+                    if repeated:
+                        headers.append((b"x-sql-repeated-statements", str(len(repeated)).encode()))
+                    message = {**message, "headers": headers}
+
+                elif swallow:
+                    return
+
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    async def send_budget_error(send, route_key, stats, budget, repeated):
+        body = json.dumps({
+            "status_code": 500,
+            "status": "error",
+            "detail": {
+                "message": f"SQL statement budget exceeded for {route_key}: {stats.count} > {budget}",
+                "repeated_statements": [{"count": n, "statement": shape} for shape, n in repeated],
+            },
+        }).encode()
+
+        await send({
+            "type": "http.response.start",
+            "status": 500,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-sql-statements", str(stats.count).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# =====================================================================
@@ -0,0 +1,144 @@
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, Mapping, Optional, Sequence
+
+from pydantic_core import to_json
+
+
+# A single NDJSON line / CSV record larger than this is rejected instead of buffered
+MAX_RECORD_BYTES = 64 * 1024
+
+# (row number, parsed record or None, error message or None)
+ParsedRow = tuple[int, Optional[dict], Optional[str]]
+
+
+class StreamFormatError(ValueError):
+    """The body can't be parsed any further (bad encoding, oversized record, missing CSV header)."""
+
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of byte chunks into decoded text lines without buffering the whole body.
+    Args:
+        chunks (AsyncIterator[bytes]): Request body chunks, e.g. Request.stream().
+
+    Returns: AsyncIterator[str]: Lines without their trailing newline.
+    Raises: StreamFormatError: On invalid UTF-8 or a line longer than MAX_RECORD_BYTES.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+
+            for line in lines:
+                yield line.rstrip("\r")
+
+            if len(pending) > MAX_RECORD_BYTES:
+                raise StreamFormatError(f"Line exceeds {MAX_RECORD_BYTES} bytes")
+
+        pending += decoder.decode(b"", final=True)
+
+    except UnicodeDecodeError as e:
+        raise StreamFormatError("Body is not valid UTF-8") from e
+
+    if pending:
+        yield pending.rstrip("\r")
+
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Parse an NDJSON body one object per line. Blank lines are skipped.
+    Row numbers are physical line numbers; a malformed line yields an error instead of aborting.
+    """
+
+    row = 0
+    async for line in iter_lines(chunks):
+        row += 1
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row, None, "Malformed JSON"
+            continue
+
+        if not isinstance(record, dict):
+            yield row, None, "Expected a JSON object"
+            continue
+
+        yield row, record, None
+
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """
+    Parse a CSV body whose first record is the header. Quoted fields may span lines.
+    Row numbers count data records (the header is not counted).
+    """
+
+    header = None
+    row = 0
+    record_lines: list[str] = []
+    quotes = 0
+
+    async for line in iter_lines(chunks):
+        record_lines.append(line)
+        quotes += line.count('"')
+
+        # An odd number of quotes means a quoted field continues on the next line
+        if quotes % 2:
+            if sum(map(len, record_lines)) > MAX_RECORD_BYTES:
+                raise StreamFormatError(f"CSV record exceeds {MAX_RECORD_BYTES} bytes")
+            continue
+
+        try:
+            values = next(csv.reader(record_lines), [])
+        except csv.Error:
+            values = None
+        record_lines, quotes = [], 0
+
+        if header is None:
+            if not values:
+                raise StreamFormatError("CSV body must start with a header row")
+            header = [name.strip() for name in values]
+            continue
+
+        if values == []:
+            continue
+
+        row += 1
+        if values is None:
+            yield row, None, "Malformed CSV record"
+        elif len(values) != len(header):
+            yield row, None, f"Expected {len(header)} fields, got {len(values)}"
+        else:
+            yield row, dict(zip(header, values)), None
+
+    if record_lines:
+        yield row + 1, None, "Unterminated quoted field"
+
+
+
+def ndjson_chunk(rows: Iterable[Mapping]) -> bytes:
+    """Encode rows as NDJSON, one object per line (dates as ISO 8601)."""
+    return b"".join(to_json(dict(row)) + b"\n" for row in rows)
+
+
+
+def csv_chunk(rows: Iterable[Sequence]) -> bytes:
+    """Encode rows (or a header) as CSV lines; None becomes an empty field."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode()
+
+
+# =====================================================================
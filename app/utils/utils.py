@@ -1,4 +1,7 @@
 from datetime import date
+import base64
+import json
+import re
 
 
 def format_dates_in_dict(data: dict) -> dict:
@@ -34,4 +37,37 @@ def check_is_isbn(input_str: str) -> bool:
     return True
 
 
-# =====================================================================
\ No newline at end of file
+# =====================================================================
+
+PHONE_PATTERN = re.compile(r"^\+?[0-9]{10,15}$")
+ROLL_NUMBER_PATTERN = re.compile(r"^(?=.*[0-9])[A-Za-z0-9/_-]{1,20}$")
+
+
+def classify_student_identifier(identifier: str) -> str:
+    """Guess which student column an identifier refers to: "phone", "roll_number" or "name"."""
+    identifier = identifier.strip()
+
+    if PHONE_PATTERN.match(identifier):
+        return "phone"
+    if ROLL_NUMBER_PATTERN.match(identifier):
+        return "roll_number"
+    return "name"
+
+
+def encode_cursor(values: dict) -> str:
+    """Encode keyset pagination values into an opaque, URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(values, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
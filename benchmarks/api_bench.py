@@ -0,0 +1,198 @@
+"""
+API benchmark: drive the real FastAPI app in-process and report latency percentiles.
+
+Requests go through httpx's ASGI transport, so the numbers cover routing, validation,
+services, SQL and serialization but no network or server process. Load a dataset first:
+
+    python -m app.cli seed --books 200000 --students 100000 --loans 2000000 --truncate
+
+Usage:
+    python -m benchmarks.api_bench [--requests 500] [--concurrency 8] [--output run.json]
+
+issue_book borrows books and return_issued_book returns exactly those loans, so a run
+leaves the dataset as it found it (apart from the loan history rows it adds).
+
+The shared Redis list cache is switched off so list_books/list_students time the query
+path; --list-cache measures with it on (starting cold for each endpoint) instead.
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import text
+
+from app.database import AsyncSessionLocal
+from app.database.config import settings
+from app.server import app
+from app.utils.cache import book_cache, student_cache
+from app.utils.redis_cache import bump_generation
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+
+def summarize(latencies: list[float], statuses: dict[int, int], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    errors = sum(n for status, n in statuses.items() if status >= 400)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status_codes": {str(status): n for status, n in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+
+async def run_endpoint(client: httpx.AsyncClient, requests: list[tuple], concurrency: int, on_response=None) -> dict:
+    """Send (method, url, json) requests with `concurrency` workers; return their summary."""
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    queue = iter(requests)
+
+    async def worker():
+        for method, url, body in queue:
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if on_response is not None:
+                on_response(response)
+
+    # In-process caches would turn repeated lookups into dictionary hits
+    book_cache.clear()
+    student_cache.clear()
+    # Pages cached by a previous endpoint or run would turn list requests into Redis hits
+    await bump_generation("books", "students")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+
+async def roll_numbers(student_ids: list[int]) -> dict[int, str]:
+    """Students are addressed by roll number (or name/phone), not by id."""
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            text("SELECT id, roll_number FROM students WHERE id = ANY(:ids)"), {"ids": list(set(student_ids))}
+        )
+        return dict(rows.all())
+
+
+
+async def dataset_shape() -> dict:
+    async with AsyncSessionLocal() as db:
+        shape = {}
+        for table in ("books", "students", "issued_books"):
+            shape[table] = (await db.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}"))).scalar()
+        shape["categories"] = (await db.execute(text("SELECT category FROM category_stats ORDER BY books DESC LIMIT 5"))).scalars().all()
+    return shape
+
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+
+async def run(args: argparse.Namespace) -> dict:
+    settings.LIST_CACHE_ENABLED = args.list_cache
+    rng = random.Random(args.seed)
+    shape = await dataset_shape()
+    max_book, max_student = shape["books"], shape["students"]
+
+    if not max_book or not max_student:
+        sys.exit("No books or students found; run `python -m app.cli seed` first")
+
+    n = args.requests
+    book_ids = [rng.randint(1, max_book) for _ in range(n)]
+    student_ids = [rng.randint(1, max_student) for _ in range(n)]
+    rolls = await roll_numbers(student_ids)
+    categories = shape["categories"] or [None]
+
+    plans = {
+        "list_books": [
+            ("GET", f"/books?limit=20&page={rng.randint(1, 50)}", None) for _ in range(n // 2)
+        ] + [
+            ("GET", f"/books?limit=20&category={rng.choice(categories)}", None) for _ in range(n - n // 2)
+        ],
+        "get_single_book": [("GET", f"/books/{book_id}", None) for book_id in book_ids],
+        "issue_book": [
+            ("POST", f"/books/{book_id}", {"student_id": rolls[student_id], "duration_days": 14})
+            for book_id, student_id in zip(book_ids, student_ids) if student_id in rolls
+        ],
+        "get_overdue_books": [("GET", "/books/overdue-books?limit=50", None) for _ in range(n)],
+        "list_students": [("GET", f"/students?limit=20&page={rng.randint(1, 50)}", None) for _ in range(n)],
+    }
+
+    issued = []
+
+    def collect_loan(response: httpx.Response) -> None:
+        if response.status_code == 201:
+            record = response.json()["data"]
+            issued.append((record["student_id"], record["book_id"]))
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name in ("list_books", "get_single_book", "issue_book"):
+            results[name] = await run_endpoint(
+                client, plans[name], args.concurrency, collect_loan if name == "issue_book" else None
+            )
+
+        returns = [("PATCH", f"/students/{rolls[student_id]}/books/{book_id}", None) for student_id, book_id in issued]
+        results["return_issued_book"] = await run_endpoint(client, returns, args.concurrency)
+
+        for name in ("get_overdue_books", "list_students"):
+            results[name] = await run_endpoint(client, plans[name], args.concurrency)
+
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "config": {"requests": n, "concurrency": args.concurrency, "seed": args.seed, "list_cache": args.list_cache},
+        "dataset": {"books": max_book, "students": max_student, "issued_books": shape["issued_books"]},
+        "endpoints": results,
+    }
+
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent in-flight requests")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the request mix")
+    parser.add_argument("--list-cache", action="store_true", help="Keep the Redis list cache on (off by default)")
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
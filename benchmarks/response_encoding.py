@@ -0,0 +1,86 @@
+"""
+Microbenchmark: success_response fast path vs. the previous encoding chain.
+
+The previous path dumped every model to a dict, formatted dates by mutating
+that dict and let JSONResponse re-encode it with the stdlib json module. The
+fast path hands the models to pydantic-core, which writes bytes directly.
+
+Usage:
+    python -m benchmarks.response_encoding [--rows 50] [--number 2000]
+"""
+import argparse
+import timeit
+from datetime import date, timedelta
+
+from fastapi.responses import JSONResponse
+
+from app.schemas import BookIssueRecord, BookOut
+from app.utils.response_template import success_response
+from app.utils.utils import serialize
+
+
+def previous_success_response(status_code=200, data=None, message="Success", meta=None):
+    content = {"status_code": status_code, "status": "success", "message": message}
+    if data is not None:
+        content["data"] = [serialize(d) for d in data]
+    if meta:
+        content["meta"] = meta
+    return JSONResponse(status_code=status_code, content=content)
+
+
+def make_books(rows: int) -> list[BookOut]:
+    return [
+        BookOut(
+            id=i + 1,
+            title=f"Sample Title {i}",
+            author=f"Sample Author {i % 97}",
+            isbn=f"{9780000000000 + i}",
+            category="Programming",
+            copies=i % 7,
+        )
+        for i in range(rows)
+    ]
+
+
+def make_records(rows: int) -> list[BookIssueRecord]:
+    today = date.today()
+    return [
+        BookIssueRecord(
+            id=i + 1,
+            book_id=i % 500 + 1,
+            student_id=i % 300 + 1,
+            issue_date=today - timedelta(days=i % 30),
+            due_date=today + timedelta(days=14 - i % 30),
+            returned_date=None,
+            is_overdue=i % 30 > 14,
+        )
+        for i in range(rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50, help="Rows per response (default: 50)")
+    parser.add_argument("--number", type=int, default=2000, help="Responses encoded per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements, best one is reported")
+    args = parser.parse_args()
+
+    meta = {"page": 1, "limit": args.rows, "total_books": 10_000, "fetched_count": args.rows, "filters_applied": {}}
+
+    for name, data in (("books", make_books(args.rows)), ("issue records", make_records(args.rows))):
+        assert previous_success_response(data=data, meta=meta).body == success_response(data=data, meta=meta).body
+
+        timings = {}
+        for label, fn in (("previous", previous_success_response), ("fast path", success_response)):
+            best = min(timeit.repeat(lambda: fn(data=data, meta=meta), number=args.number, repeat=args.repeat))
+            timings[label] = best / args.number * 1e6
+
+        speedup = timings["previous"] / timings["fast path"]
+        print(
+            f"{name:>14} x{args.rows}: previous {timings['previous']:8.1f} us/response | "
+            f"fast path {timings['fast path']:8.1f} us/response | {speedup:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
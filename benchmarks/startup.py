@@ -0,0 +1,113 @@
+"""
+Startup benchmark: import time per process type and API time-to-first-response.
+
+Every sample runs in a fresh interpreter, so nothing is already imported or cached
+(apart from the OS page cache). Reported per target:
+  - import_ms: wall time of the imports a process of that type does before working
+  - loaded: which heavy modules (fastapi, asyncpg, psycopg2) the imports pulled in
+
+The api-startup target also runs the lifespan (DB warmup) and serves GET / in-process.
+
+Usage:
+    python -m benchmarks.startup [--repeat 5] [--max-ms api=1500 --max-ms celery=900]
+
+With --max-ms the command exits non-zero when a target's median exceeds its limit, so
+it can guard against import-time regressions in CI.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ("fastapi", "asyncpg", "psycopg2")
+
+TARGETS = {
+    "api": "import app.server",
+    "celery": "import app.celery_worker, app.tasks",
+    "cli": "import app.cli",
+    "database": "import app.database, app.models",
+}
+
+SAMPLE = """
+import json, sys, time
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+API_STARTUP = """
+import asyncio, httpx
+from app.server import app
+
+async def first_response():
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            (await client.get("/")).raise_for_status()
+
+asyncio.run(first_response())
+"""
+
+
+def sample(code: str) -> dict:
+    script = SAMPLE.format(code=code, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+
+    if result.returncode:
+        raise RuntimeError(f"Benchmark subprocess failed:\n{result.stderr}")
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+
+def measure(code: str, repeat: int) -> dict:
+    samples = [sample(code) for _ in range(repeat)]
+    timings = [s["ms"] for s in samples]
+
+    return {
+        "median_ms": round(statistics.median(timings), 1),
+        "min_ms": round(min(timings), 1),
+        "max_ms": round(max(timings), 1),
+        "loaded": samples[-1]["loaded"],
+    }
+
+
+
+def parse_limits(values: list[str]) -> dict[str, float]:
+    limits = {}
+    for value in values:
+        target, _, ms = value.partition("=")
+        if target not in TARGETS and target != "api-startup":
+            raise argparse.ArgumentTypeError(f"Unknown target {target!r}")
+        limits[target] = float(ms)
+    return limits
+
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--max-ms", action="append", default=[], metavar="TARGET=MS", help="Fail if TARGET's median exceeds MS")
+    parser.add_argument("--skip-startup", action="store_true", help="Only time imports (no database needed)")
+    args = parser.parse_args(argv)
+    limits = parse_limits(args.max_ms)
+
+    results = {name: measure(code, args.repeat) for name, code in TARGETS.items()}
+    if not args.skip_startup:
+        results["api-startup"] = measure(API_STARTUP, args.repeat)
+
+    print(json.dumps({"repeat": args.repeat, "targets": results}, indent=2))
+
+    over = [
+        f"{target}: {results[target]['median_ms']}ms > {limit}ms"
+        for target, limit in limits.items()
+        if target in results and results[target]["median_ms"] > limit
+    ]
+    if over:
+        sys.exit("Startup budget exceeded: " + "; ".join(over))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from typing import Optional
+
+import httpx
+import pytest
+import uuid
+from sqlalchemy import text
+
+from app.database import get_async_engine, get_async_sessionmaker
+from app.utils.cache import book_cache, student_cache
+from app.utils.redis_cache import set_redis
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def fake_redis():
+    """An empty in-memory Redis behind the list cache (see app.utils.redis_cache.set_redis)."""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    set_redis(client)
+    yield client
+    set_redis(None)
+
+
+@pytest.fixture
+async def database():
+    """Skip unless DB_URL points at a reachable, migrated database; dispose the pool afterwards."""
+    try:
+        engine = get_async_engine()
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1 FROM issued_books LIMIT 1"))
+    except Exception as e:
+        pytest.skip(f"Database unavailable: {e}")
+
+    yield engine
+
+    # Pooled asyncpg connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(database, fake_redis):
+    book_cache.clear()
+    student_cache.clear()
+
+    from app.server import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+class Library:
+    """Books and students created by one test, with their loans removed afterwards."""
+
+    def __init__(self, sessionmaker):
+        self.sessionmaker = sessionmaker
+        self.tag = uuid.uuid4().int % 10**9
+        self.book_ids: list[int] = []
+        self.student_ids: list[int] = []
+
+    async def add_book(self, copies: int, title: str = "Test Book") -> int:
+        isbn = f"979{self.tag:09d}{len(self.book_ids)}"
+        async with self.sessionmaker() as db:
+            book_id = await db.scalar(
+                text(
+                    "INSERT INTO books (title, author, isbn, category, copies) "
+                    "VALUES (:title, 'Test Author', :isbn, 'Testing', :copies) RETURNING id"
+                ),
+                {"title": title, "isbn": isbn, "copies": copies},
+            )
+            await db.commit()
+        self.book_ids.append(book_id)
+        return book_id
+
+    async def add_student(self, name: str = "Test Student", roll_number: Optional[str] = None) -> str:
+        index = len(self.student_ids)
+        roll_number = roll_number or f"T{self.tag:09d}{index:02d}"
+        async with self.sessionmaker() as db:
+            student_id = await db.scalar(
+                text(
+                    "INSERT INTO students (name, roll_number, department, semester, phone, email) "
+                    "VALUES (:name, :roll, 'TEST', 1, :phone, :email) RETURNING id"
+                ),
+                {
+                    "name": name,
+                    "roll": roll_number,
+                    "phone": f"8{self.tag:09d}{index:02d}",
+                    "email": f"test{self.tag}.{index}@example.com",
+                },
+            )
+            await db.commit()
+        self.student_ids.append(student_id)
+        return roll_number
+
+    def new_isbn(self) -> str:
+        """An ISBN for a book the test creates through the API; adopt_books cleans it up."""
+        self.isbn_count = getattr(self, "isbn_count", 0) + 1
+        return f"978{self.tag:09d}{self.isbn_count}"
+
+    async def adopt_books(self, *isbns: str) -> None:
+        async with self.sessionmaker() as db:
+            rows = await db.scalars(text("SELECT id FROM books WHERE isbn = ANY(:isbns)"), {"isbns": list(isbns)})
+            self.book_ids.extend(rows)
+
+    async def adopt_students(self, *roll_numbers: str) -> None:
+        async with self.sessionmaker() as db:
+            rows = await db.scalars(
+                text("SELECT id FROM students WHERE roll_number = ANY(:rolls)"), {"rolls": list(roll_numbers)}
+            )
+            self.student_ids.extend(rows)
+
+    async def isbn(self, book_id: int) -> str:
+        async with self.sessionmaker() as db:
+            return await db.scalar(text("SELECT isbn FROM books WHERE id = :id"), {"id": book_id})
+
+    async def copies(self, book_id: int) -> int:
+        async with self.sessionmaker() as db:
+            return await db.scalar(text("SELECT copies FROM books WHERE id = :id"), {"id": book_id})
+
+    async def open_loans(self, book_id: int) -> int:
+        async with self.sessionmaker() as db:
+            return await db.scalar(
+                text("SELECT count(*) FROM issued_books WHERE book_id = :id AND returned_date IS NULL"),
+                {"id": book_id},
+            )
+
+    async def cleanup(self) -> None:
+        async with self.sessionmaker() as db:
+            params = {"books": self.book_ids, "students": self.student_ids}
+            await db.execute(
+                text("DELETE FROM issued_books WHERE book_id = ANY(:books) OR student_id = ANY(:students)"), params
+            )
+            await db.execute(text("DELETE FROM books WHERE id = ANY(:books)"), params)
+            await db.execute(text("DELETE FROM students WHERE id = ANY(:students)"), params)
+            await db.commit()
+
+
+@pytest.fixture
+async def library(database):
+    library = Library(get_async_sessionmaker())
+    yield library
+    await library.cleanup()
@@ -0,0 +1,38 @@
+import pytest
+
+from app.database.config import settings
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def import_csv(client, rows: list[str]) -> dict:
+    body = "\n".join(["title,author,isbn,category,copies", *rows]) + "\n"
+    response = await client.post("/books/bulk", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+@pytest.mark.parametrize("error_limit", [0, 1, 100])
+async def test_conflict_totals_do_not_depend_on_error_limit(client, library, monkeypatch, error_limit):
+    monkeypatch.setattr(settings, "BULK_IMPORT_ERROR_LIMIT", error_limit)
+
+    stored = await library.isbn(await library.add_book(copies=1))
+    fresh = library.new_isbn()
+
+    summary = await import_csv(client, [
+        f"Test Book,Test Author,{stored},Testing,2",      # merges into the stored book
+        f"Other Title,Test Author,{stored},Testing,1",    # conflicts with the stored book
+        f"New Book,New Author,{fresh},Testing,1",         # creates a book
+        f"Renamed Book,New Author,{fresh},Testing,1",     # conflicts with the row above
+        "Broken,Row,not-an-isbn,Testing,x",               # invalid
+    ])
+    await library.adopt_books(fresh)
+
+    assert summary["rows_received"] == 5
+    assert summary["rows_invalid"] == 1
+    assert summary["rows_conflicting"] == 2
+    assert summary["rows_applied"] == 2
+    assert (summary["books_created"], summary["books_updated"]) == (1, 1)
+    assert len(summary["errors"]) == min(error_limit, 3)
+    assert summary["errors_truncated"] == (error_limit < 3)
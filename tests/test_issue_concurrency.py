@@ -0,0 +1,47 @@
+"""
+Concurrent POST /books/{book_id} against a book with fewer copies than requests.
+
+The conditional copies UPDATE and uq_issued_books_open_loan must hand out exactly the
+available copies: no overselling, no negative stock, and a 400 for every extra request.
+Needs a migrated database in DB_URL.
+"""
+import asyncio
+
+import pytest
+
+
+pytestmark = pytest.mark.anyio
+
+ISSUERS = 10
+COPIES = 3
+
+
+async def test_concurrent_issues_never_oversell(client, library):
+    book_id = await library.add_book(copies=COPIES)
+    students = [await library.add_student() for _ in range(ISSUERS)]
+
+    responses = await asyncio.gather(*(
+        client.post(f"/books/{book_id}", json={"student_id": roll_number, "duration_days": 7})
+        for roll_number in students
+    ))
+    statuses = sorted(response.status_code for response in responses)
+
+    assert statuses == [201] * COPIES + [400] * (ISSUERS - COPIES)
+    assert await library.open_loans(book_id) == COPIES
+    assert await library.copies(book_id) == 0
+
+
+async def test_concurrent_duplicate_issue_opens_one_loan(client, library):
+    book_id = await library.add_book(copies=COPIES)
+    roll_number = await library.add_student()
+
+    responses = await asyncio.gather(*(
+        client.post(f"/books/{book_id}", json={"student_id": roll_number, "duration_days": 7})
+        for _ in range(ISSUERS)
+    ))
+    statuses = sorted(response.status_code for response in responses)
+
+    assert statuses == [201] + [400] * (ISSUERS - 1)
+    assert await library.open_loans(book_id) == 1
+    # Rejected duplicates roll back the copy they reserved
+    assert await library.copies(book_id) == COPIES - 1
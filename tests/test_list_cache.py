@@ -0,0 +1,123 @@
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.config import settings
+from app.utils.cache import PINNED_SESSION, REPLICA_SESSION
+from app.utils.redis_cache import bump_generation, cached_list, generation_key
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+@pytest.fixture(autouse=True)
+def list_cache_on(monkeypatch):
+    monkeypatch.setattr(settings, "LIST_CACHE_ENABLED", True)
+
+
+@pytest.fixture
+def db():
+    """An unbound session: cached_list only looks at its info flags."""
+    return AsyncSession()
+
+
+async def test_bump_generation_invalidates_cached_pages(fake_redis, db):
+    rows = [Item(id=1, name="first")]
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return list(rows), {"fetched_count": len(rows)}
+
+    params = {"page": 1, "limit": 10, "title": " first "}
+
+    first = await cached_list("items", params, Item, loader, db)
+    # Equivalent filters share the entry (values are stripped, empty ones dropped)
+    second = await cached_list("items", {**params, "title": "first", "author": ""}, Item, loader, db)
+
+    assert first == second == (rows, {"fetched_count": 1})
+    assert len(loads) == 1
+
+    rows.append(Item(id=2, name="second"))
+    await bump_generation("items")
+    assert await fake_redis.get(generation_key("items")) == "1"
+
+    items, meta = await cached_list("items", params, Item, loader, db)
+    assert len(loads) == 2
+    assert [item.id for item in items] == [1, 2]
+    assert meta == {"fetched_count": 2}
+
+
+async def test_bump_generation_leaves_other_namespaces_cached(fake_redis, db):
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return [], {}
+
+    await cached_list("students", {"page": 1}, Item, loader, db)
+    await bump_generation("books")
+    await cached_list("students", {"page": 1}, Item, loader, db)
+
+    assert len(loads) == 1
+
+
+async def test_replica_pages_are_never_stored(fake_redis, db):
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return [], {}
+
+    db.info[REPLICA_SESSION] = True
+    await cached_list("items", {"page": 1}, Item, loader, db)
+    await cached_list("items", {"page": 1}, Item, loader, db)
+
+    assert len(loads) == 2
+    assert await fake_redis.keys("*:list:*") == []
+
+
+async def test_pinned_reads_skip_cached_pages(fake_redis, db):
+    async def stale():
+        return [Item(id=1, name="stale")], {}
+
+    async def fresh():
+        return [Item(id=1, name="fresh")], {}
+
+    await cached_list("items", {"page": 1}, Item, stale, db)
+
+    db.info[PINNED_SESSION] = True
+    items, _ = await cached_list("items", {"page": 1}, Item, fresh, db)
+    assert [item.name for item in items] == ["fresh"]
+
+
+async def test_book_write_refreshes_cached_list(client, library, fake_redis):
+    title = f"Cached Book {library.tag}"
+    book_id = await library.add_book(copies=1, title=title)
+
+    async def list_page():
+        response = await client.get("/books", params={"title": title})
+        assert response.status_code == 200, response.text
+        return response.json()["data"], int(response.headers["X-SQL-Statements"])
+
+    books, statements = await list_page()
+    assert [book["copies"] for book in books] == [1]
+    assert statements > 0
+
+    # Served from Redis: no SQL at all
+    assert await list_page() == (books, 0)
+
+    generation = int(await fake_redis.get(generation_key("books")) or 0)
+    book = {**books[0], "copies": 4}
+    response = await client.put(f"/books/{book_id}", json={k: book[k] for k in ("title", "author", "isbn", "category", "copies")})
+    assert response.status_code == 200, response.text
+    assert int(await fake_redis.get(generation_key("books"))) == generation + 1
+
+    books, statements = await list_page()
+    assert [book["copies"] for book in books] == [4]
+    assert statements > 0
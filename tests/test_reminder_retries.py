@@ -0,0 +1,101 @@
+import smtplib
+from contextlib import contextmanager
+
+import pytest
+
+from app.tasks import remainder
+from app.tasks.remainder import MAX_MESSAGE_ATTEMPTS, send_due_soon_reminders_batch
+
+
+MESSAGES = [
+    {"to_email": f"student{i}@example.com", "subject": "Due soon", "body": "<p>Return it</p>"}
+    for i in range(3)
+]
+
+
+class Retried(Exception):
+    def __init__(self, args, countdown, exc):
+        self.messages, self.countdown, self.exc = args[0], countdown, exc
+
+
+@pytest.fixture(autouse=True)
+def capture_retry(monkeypatch):
+    def retry(args, countdown, exc):
+        raise Retried(args, countdown, exc)
+
+    monkeypatch.setattr(send_due_soon_reminders_batch, "retry", retry)
+
+
+def failing_session(exc):
+    @contextmanager
+    def session():
+        raise exc
+        yield
+
+    return session
+
+
+class FakeServer:
+    def __init__(self, refuse: dict[str, int]):
+        self.refuse = refuse
+        self.sent = []
+
+    def sendmail(self, sender, recipients, body):
+        code = self.refuse.get(recipients[0])
+        if code:
+            raise smtplib.SMTPRecipientsRefused({recipients[0]: (code, b"rejected")})
+        self.sent.append(recipients[0])
+
+
+def serving(server: FakeServer):
+    @contextmanager
+    def session():
+        yield server
+
+    return session
+
+
+@pytest.mark.parametrize("exc", [
+    smtplib.SMTPAuthenticationError(535, b"5.7.8 Authentication credentials invalid"),
+    smtplib.SMTPResponseException(554, b"STARTTLS refused"),
+    smtplib.SMTPConnectError(521, b"Service not available"),
+    ConnectionRefusedError(),
+])
+def test_session_failures_are_always_retried(monkeypatch, exc):
+    monkeypatch.setattr(remainder, "smtp_session", failing_session(exc))
+    messages = [{**MESSAGES[0], "attempts": MAX_MESSAGE_ATTEMPTS - 1}, *MESSAGES[1:]]
+
+    with pytest.raises(Retried) as retried:
+        send_due_soon_reminders_batch(messages)
+
+    # The whole batch comes back, without spending any message's attempts
+    assert retried.value.messages == messages
+    assert retried.value.exc is exc
+
+
+def test_session_retries_back_off(monkeypatch):
+    monkeypatch.setattr(remainder, "smtp_session", failing_session(ConnectionRefusedError()))
+
+    with pytest.raises(Retried) as first:
+        send_due_soon_reminders_batch(MESSAGES)
+
+    assert first.value.countdown == remainder.retry_countdown(0)
+    assert remainder.retry_countdown(1) == 2 * remainder.retry_countdown(0)
+    assert remainder.retry_countdown(20) == remainder.RETRY_MAX_COUNTDOWN
+
+
+def test_recipient_rejections_drop_permanent_and_retry_temporary(monkeypatch):
+    server = FakeServer(refuse={"student0@example.com": 550, "student1@example.com": 450})
+    monkeypatch.setattr(remainder, "smtp_session", serving(server))
+
+    with pytest.raises(Retried) as retried:
+        send_due_soon_reminders_batch(MESSAGES)
+
+    assert server.sent == ["student2@example.com"]
+    assert retried.value.messages == [{**MESSAGES[1], "attempts": 1}]
+
+
+def test_batch_without_failures_returns_counts(monkeypatch):
+    monkeypatch.setattr(remainder, "smtp_session", serving(FakeServer(refuse={})))
+
+    assert send_due_soon_reminders_batch(MESSAGES) == {"sent": 3, "dropped": 0}
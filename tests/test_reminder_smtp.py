@@ -0,0 +1,139 @@
+"""
+send_due_soon_reminders_batch against a real SMTP server on localhost (aiosmtpd), with the
+real smtp_session: one connection and one login per batch, per-recipient outcomes.
+"""
+import smtplib
+import socket
+
+import pytest
+
+from app.database.config import settings
+from app.tasks.remainder import send_due_soon_reminders_batch
+
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+from aiosmtpd.smtp import SMTP, AuthResult  # noqa: E402
+
+
+class Retried(Exception):
+    def __init__(self, args, countdown, exc):
+        self.messages, self.exc = args[0], exc
+
+
+class RecordingHandler:
+    """Accepts mail, except for recipients mapped to a reply in `refuse`."""
+
+    def __init__(self):
+        self.refuse: dict[str, str] = {}
+        self.delivered: list[str] = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refuse:
+            return self.refuse[address]
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+
+class CountingController(aiosmtpd_controller.Controller):
+    def __init__(self, handler, port: int):
+        self.connections = 0
+        self.logins = 0
+        self.password = "secret"
+        super().__init__(
+            handler, hostname="127.0.0.1", port=port,
+            authenticator=self.authenticate, auth_require_tls=False,
+        )
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        self.logins += 1
+        # handled=False: let aiosmtpd reply 535 itself on a wrong password
+        return AuthResult(success=auth_data.password.decode() == self.password, handled=False)
+
+    def factory(self):
+        controller = self
+
+        class CountingSMTP(SMTP):
+            def connection_made(self, transport):
+                controller.connections += 1
+                super().connection_made(transport)
+
+        return CountingSMTP(self.handler, **self.SMTP_kwargs)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    handler = RecordingHandler()
+    controller = CountingController(handler, free_port())
+    controller.start()
+    # start() connects once itself to check the server is up
+    controller.connections = 0
+
+    monkeypatch.setattr(settings, "SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_PORT", controller.port)
+    monkeypatch.setattr(settings, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(settings, "SMTP_TIMEOUT", 5)
+    monkeypatch.setattr(settings, "SMTP_USERNAME", "library")
+    monkeypatch.setattr(settings, "SMTP_PASSWORD", "secret")
+    monkeypatch.setattr(settings, "SMTP_FROM_EMAIL", "library@example.com")
+
+    def retry(args, countdown, exc):
+        raise Retried(args, countdown, exc)
+
+    monkeypatch.setattr(send_due_soon_reminders_batch, "retry", retry)
+
+    yield controller, handler
+    controller.stop()
+
+
+def reminders(count: int) -> list[dict]:
+    return [
+        {"to_email": f"student{i}@example.com", "subject": "Due soon", "body": "<p>Return it</p>"}
+        for i in range(count)
+    ]
+
+
+def test_batch_reuses_one_session(smtp_server):
+    controller, handler = smtp_server
+    handler.refuse["student2@example.com"] = "550 5.1.1 No such user"
+
+    result = send_due_soon_reminders_batch(reminders(5))
+
+    assert result == {"sent": 4, "dropped": 1}
+    assert (controller.connections, controller.logins) == (1, 1)
+    assert handler.delivered == [f"student{i}@example.com" for i in (0, 1, 3, 4)]
+
+
+def test_temporary_rejection_retries_only_that_message(smtp_server):
+    controller, handler = smtp_server
+    handler.refuse["student1@example.com"] = "450 4.2.1 Mailbox busy"
+    messages = reminders(3)
+
+    with pytest.raises(Retried) as retried:
+        send_due_soon_reminders_batch(messages)
+
+    assert (controller.connections, controller.logins) == (1, 1)
+    assert handler.delivered == ["student0@example.com", "student2@example.com"]
+    assert retried.value.messages == [{**messages[1], "attempts": 1}]
+
+
+def test_rejected_login_retries_the_whole_batch(smtp_server):
+    controller, handler = smtp_server
+    controller.password = "rotated"
+    messages = reminders(3)
+
+    with pytest.raises(Retried) as retried:
+        send_due_soon_reminders_batch(messages)
+
+    assert isinstance(retried.value.exc, smtplib.SMTPAuthenticationError)
+    assert retried.value.messages == messages
+    assert handler.delivered == []
@@ -0,0 +1,81 @@
+"""
+Read-your-writes with the caches in front of a lagging replica: replica reads never fill
+the list page or lookup caches, and reads pinned to the primary never consult them.
+"""
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import get_async_engine
+from app.database import replicas
+from app.database.config import settings
+from app.database.replicas import PRIMARY_PIN_COOKIE, ReplicaSet
+from app.schemas import BookOut
+from app.utils.cache import book_cache
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def lagging_replica(database, monkeypatch):
+    """
+    A "replica" frozen at the moment the fixture starts: every replica session runs inside
+    one REPEATABLE READ transaction, so writes committed afterwards stay invisible to it.
+    """
+    monkeypatch.setattr(settings, "LIST_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "DB_REPLICA_URLS", ["postgresql://lagging-replica"])
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 60)
+
+    async def freeze():
+        connection = await get_async_engine().connect()
+        await connection.execution_options(isolation_level="REPEATABLE READ")
+        await connection.begin()
+        await connection.execute(text("SELECT 1 FROM books LIMIT 1"))
+
+        replica_set = ReplicaSet([get_async_engine()], retry_seconds=30)
+        replica_set.sessionmakers = [
+            async_sessionmaker(bind=connection, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        ]
+        monkeypatch.setattr(replicas, "get_replica_set", lambda: replica_set)
+        connections.append(connection)
+
+    connections = []
+    yield freeze
+
+    for connection in connections:
+        await connection.rollback()
+        await connection.close()
+
+
+async def test_pinned_read_after_write_skips_cached_replica_result(client, library, fake_redis, lagging_replica):
+    title = f"Lagging Book {library.tag}"
+    book_id = await library.add_book(copies=1, title=title)
+    await lagging_replica()
+
+    [book] = (await client.get(f"/books/{book_id}")).json()["data"]
+    response = await client.put(
+        f"/books/{book_id}",
+        json={**{k: book[k] for k in ("title", "author", "isbn", "category")}, "copies": 4},
+    )
+    assert response.status_code == 200, response.text
+    assert PRIMARY_PIN_COOKIE in client.cookies
+
+    # Another client reads from the lagging replica right after the write...
+    async with httpx.AsyncClient(transport=client._transport, base_url="http://test") as other:
+        for _ in range(2):
+            lagging = await other.get("/books", params={"title": title})
+            assert [b["copies"] for b in lagging.json()["data"]] == [1]
+            assert (await other.get(f"/books/{book_id}")).json()["data"][0]["copies"] == 1
+
+    # ...and caches none of it, so nothing stale is waiting for the next request
+    assert await fake_redis.keys("*:list:books:*") == []
+
+    # Another worker's in-process cache still holds the book from before the write
+    book_cache.set(("id", book_id), BookOut.model_validate(book))
+
+    # The writer is pinned to the primary and sees its own write
+    books = (await client.get("/books", params={"title": title})).json()["data"]
+    assert [b["copies"] for b in books] == [4]
+    assert (await client.get(f"/books/{book_id}")).json()["data"][0]["copies"] == 4
@@ -0,0 +1,45 @@
+from fastapi.routing import APIRoute
+
+from app.database import get_async_db
+from app.database.replicas import get_read_db
+from app.server import app
+
+
+# Routes allowed to read from a replica; every other route must use the primary
+REPLICA_ROUTES = {
+    "GET /books",
+    "GET /books/overdue-books",
+    "GET /books/{book_id}",
+    "GET /issues",
+    "GET /students",
+    "GET /students/{identifier}",
+}
+
+
+def route_sessions() -> dict[str, set]:
+    sessions = {}
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        calls = {dependency.call for dependency in route.dependant.dependencies}
+        for method in route.methods:
+            sessions[f"{method} {route.path}"] = calls & {get_async_db, get_read_db}
+    return sessions
+
+
+def test_replica_routes_use_read_db():
+    sessions = route_sessions()
+    for route in REPLICA_ROUTES:
+        assert sessions[route] == {get_read_db}, route
+
+
+def test_other_routes_use_primary():
+    for route, dependencies in route_sessions().items():
+        if route not in REPLICA_ROUTES:
+            assert get_read_db not in dependencies, route
+
+
+def test_writes_never_use_read_db():
+    for route, dependencies in route_sessions().items():
+        if not route.startswith(("GET ", "HEAD ")):
+            assert dependencies <= {get_async_db}, route
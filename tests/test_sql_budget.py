@@ -0,0 +1,53 @@
+"""
+Statement budgets with enforcement on, for the most expensive valid path through each
+route: a student identifier that misses its likely column and resolves on the fallback
+(a roll-number-shaped name), see STUDENT_LOOKUP_ORDER.
+"""
+import pytest
+
+from app.database.config import settings
+from app.utils.cache import student_cache
+from app.utils.sql_budget import route_budget
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def enforce_budgets(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_BUDGET_ENFORCE", True)
+
+
+async def within_budget(client, route: str, method: str, url: str, json=None, expected: int = 200):
+    # A cached identifier would skip the lookups this test is about
+    student_cache.clear()
+
+    response = await client.request(method, url, json=json)
+    assert response.status_code == expected, response.text
+    assert int(response.headers["X-SQL-Statements"]) <= route_budget(route)
+    return response
+
+
+async def test_fallback_identifier_stays_within_budgets(client, library):
+    book_id = await library.add_book(copies=5)
+    out_of_stock = await library.add_book(copies=0)
+    name = f"N{library.tag:09d}"
+    await library.add_student(name=name)
+
+    issue = {"student_id": name, "duration_days": 7}
+    await within_budget(client, "POST /books/{book_id}", "POST", f"/books/{book_id}", issue, 201)
+    await within_budget(client, "POST /books/{book_id}", "POST", f"/books/{out_of_stock}", issue, 400)
+    await within_budget(client, "GET /students/{identifier}", "GET", f"/students/{name}")
+    await within_budget(client, "GET /students/{identifier}/books", "GET", f"/students/{name}/books", expected=201)
+    await within_budget(client, "GET /students/{identifier}/history", "GET", f"/students/{name}/history?count=exact")
+    await within_budget(client, "GET /issues", "GET", f"/issues?student={name}&book={book_id}&count=exact")
+    await within_budget(
+        client, "PATCH /students/{identifier}/books/{issued_book_id}", "PATCH", f"/students/{name}/books/{book_id}", expected=201
+    )
+
+    checkout = {"student_id": name, "book_ids": [str(book_id)], "duration_days": 7}
+    await within_budget(client, "POST /books/checkout", "POST", "/books/checkout", checkout, 201)
+    await within_budget(client, "POST /books/return", "POST", "/books/return", {"student_id": name, "book_ids": [str(book_id)]})
+
+    assert await library.open_loans(book_id) == 0
+    assert await library.copies(book_id) == 5
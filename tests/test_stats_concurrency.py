@@ -0,0 +1,90 @@
+"""
+Concurrent checkouts of different books in one category, with the /stats triggers.
+
+The triggers only append to the insert-only delta tables, so loans of different books
+never queue on a shared category_stats / loan_due_stats row, and /stats (summary plus
+pending deltas) stays exact before and after fold_stats_deltas.
+Needs a migrated database in DB_URL.
+"""
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.database import get_async_sessionmaker, get_sessionmaker
+from app.services.stats import fold_stats_deltas, reconcile_stats
+
+
+pytestmark = pytest.mark.anyio
+
+ISSUERS = 10
+# Category of the books created by the library fixture
+CATEGORY = "Testing"
+
+
+async def category_stats(client) -> dict:
+    response = await client.get("/stats")
+    assert response.status_code == 200, response.text
+    categories = {c["category"]: c for c in response.json()["data"]["categories"]}
+    return categories.get(CATEGORY, {"books": 0, "copies_available": 0, "active_loans": 0, "total_loans": 0})
+
+
+async def checkout(db, book_id: int, student_id: int) -> None:
+    """The statements of a checkout, as far as the triggers are concerned."""
+    await db.execute(text("UPDATE books SET copies = copies - 1 WHERE id = :id"), {"id": book_id})
+    await db.execute(
+        text(
+            "INSERT INTO issued_books (book_id, student_id, issue_date, due_date) "
+            "VALUES (:book, :student, :today, :due)"
+        ),
+        {"book": book_id, "student": student_id, "today": date.today(), "due": date.today() + timedelta(days=7)},
+    )
+
+
+async def test_open_checkout_does_not_block_other_books(client, library):
+    books = [await library.add_book(copies=1) for _ in range(2)]
+    for _ in books:
+        await library.add_student()
+
+    sessionmaker = get_async_sessionmaker()
+    async with sessionmaker() as first, sessionmaker() as second:
+        # Same category and due date, left uncommitted
+        await checkout(first, books[0], library.student_ids[0])
+
+        # Would wait on the first transaction's summary row lock if the triggers upserted
+        await second.execute(text("SET LOCAL lock_timeout = '2s'"))
+        await checkout(second, books[1], library.student_ids[1])
+
+        await second.commit()
+        await first.commit()
+
+
+async def test_concurrent_checkouts_keep_stats_exact(client, library):
+    books = [await library.add_book(copies=1) for _ in range(ISSUERS)]
+    students = [await library.add_student() for _ in range(ISSUERS)]
+    before = await category_stats(client)
+
+    responses = await asyncio.gather(*(
+        client.post(f"/books/{book_id}", json={"student_id": roll_number, "duration_days": 7})
+        for book_id, roll_number in zip(books, students)
+    ))
+
+    assert [response.status_code for response in responses] == [201] * ISSUERS
+
+    after = await category_stats(client)
+    assert after == {
+        **before,
+        "copies_available": before["copies_available"] - ISSUERS,
+        "active_loans": before["active_loans"] + ISSUERS,
+        "total_loans": before["total_loans"] + ISSUERS,
+    }
+
+    with get_sessionmaker()() as db:
+        fold_stats_deltas(db)
+        assert db.scalar(text("SELECT count(*) FROM category_stats_deltas")) == 0
+
+    assert await category_stats(client) == after
+
+    with get_sessionmaker()() as db:
+        assert CATEGORY not in reconcile_stats(db)["categories"]
@@ -0,0 +1,49 @@
+import pytest
+
+from app.database.config import settings
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_enroll_errors_follow_their_own_limit(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_ERROR_LIMIT", 0)
+    monkeypatch.setattr(settings, "BULK_ENROLL_ERROR_LIMIT", 2)
+
+    # Invalid rows only, so nothing is written
+    response = await client.post("/students/bulk", json=[{"name": "x"}, {"roll_number": 1}, {}])
+    assert response.status_code == 200, response.text
+
+    summary = response.json()["data"]
+    assert summary["rows_invalid"] == 3
+    assert [error["row"] for error in summary["errors"]] == [1, 2]
+    assert summary["errors_truncated"] is True
+
+
+@pytest.mark.parametrize("field, value", [
+    ("semester", 9),
+    ("semester", 0),
+    ("phone", "12345-67890"),
+    ("email", "jöhn@example.com"),
+    ("department", "D" * 51),
+])
+async def test_rows_breaking_table_checks_are_rejected_per_row(client, library, field, value):
+    def student(index: int) -> dict:
+        return {
+            "name": f"Enrolled Student {index}",
+            "roll_number": f"E{library.tag:09d}{index}",
+            "department": "CS",
+            "semester": 3,
+            "phone": f"7{library.tag:09d}{index}",
+            "email": f"enrolled{library.tag}.{index}@example.com",
+        }
+
+    rows = [student(1), {**student(2), field: value}, student(3)]
+    response = await client.post("/students/bulk", json=rows)
+    await library.adopt_students(*(row["roll_number"] for row in rows))
+
+    assert response.status_code == 200, response.text
+    summary = response.json()["data"]
+    assert (summary["rows_inserted"], summary["rows_invalid"]) == (2, 1)
+    assert [error["row"] for error in summary["errors"]] == [2]
+    assert summary["errors"][0]["error"].startswith(field)